@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark pentru funcțiile de scorare IAAM
+Măsoară operații/secundă, latența p50/p99 și memoria alocată per apel
+pentru fiecare calculator, pe amestecurile de pacienți din
+DemoDataGenerator (risc scăzut, moderat, înalt, critic), și compară
+rezultatele cu un fișier JSON de referință
+
+Exemplu:
+    python benchmark_scoring.py --save-baseline       # actualizează referința
+    python benchmark_scoring.py --check --quick       # semnalează regresiile
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from demo_data_generator import DemoDataGenerator
+from epimind_ai_enhanced import EnhancedIAAMPredictor, PatientData
+from scoring_kernel import ALIASES
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+SCHEMA_VERSION = 1
+
+MIXES = {
+    "low_risk": DemoDataGenerator.generate_low_risk_patient,
+    "moderate_risk": DemoDataGenerator.generate_moderate_risk_patient,
+    "high_risk": DemoDataGenerator.generate_high_risk_patient,
+    "critical_risk": DemoDataGenerator.generate_critical_risk_patient,
+}
+
+@dataclass
+class BenchmarkCase:
+    """Funcție măsurată: pregătirea intrărilor (o dată) și apelul măsurat"""
+    nume: str
+    pregatire: Callable[[List[PatientData]], List[Any]]
+    apel: Callable[[Any], Any]
+
+def convert_patient(patient: PatientData, cls: type, leucocite_scale: float = 1.0) -> Any:
+    """Copie a pacientului în forma PatientData a altui motor (câmpuri echivalente, leucocite în /μL)"""
+    values = vars(patient)
+    kwargs = {}
+    for name in cls.__dataclass_fields__:
+        source = name if name in values else next((alias for alias in ALIASES.get(name, ()) if alias in values), None)
+        if source is not None and source not in ("patient_id", "timestamp"):
+            kwargs[name] = list(values[source]) if isinstance(values[source], list) else values[source]
+    if "leucocite" in kwargs:
+        kwargs["leucocite"] = type(cls.__dataclass_fields__["leucocite"].default)(kwargs["leucocite"] * leucocite_scale)
+    return cls(**kwargs)
+
+def default_cases() -> List[BenchmarkCase]:
+    """Funcțiile de scorare măsurate (motoarele se creează o singură dată)"""
+    from epimind_ai_final_professional import UltraAdvancedIAAMCalculator, PatientData as UltraPatientData
+    from epimind_ai_original import IAMPredictor
+    from epimind_ai_professional import AdvancedIAAMCalculator, PatientData as ProfessionalPatientData
+
+    enhanced = EnhancedIAAMPredictor()
+    original = IAMPredictor()
+    final = UltraAdvancedIAAMCalculator()
+    professional = AdvancedIAAMCalculator()
+    same = list
+    return [
+        BenchmarkCase("enhanced.predict_iaam_risk", same, enhanced.predict_iaam_risk),
+        BenchmarkCase("original.predict_iaam_risk", lambda patients: [dict(vars(p)) for p in patients],
+                      original.predict_iaam_risk),
+        BenchmarkCase("final.calculate_risk",
+                      lambda patients: [convert_patient(p, UltraPatientData, 1000) for p in patients],
+                      final.calculate_risk),
+        BenchmarkCase("professional.calculate_risk",
+                      lambda patients: [convert_patient(p, ProfessionalPatientData, 1000) for p in patients],
+                      professional.calculate_risk),
+        BenchmarkCase("enhanced.calculate_sofa", same, enhanced.calculate_sofa),
+        BenchmarkCase("enhanced.evaluate_lab_markers", same, enhanced.evaluate_lab_markers),
+    ]
+
+def generate_mix(mix: str, count: int, seed: int = 0) -> List[PatientData]:
+    """Pacienți reproductibili dintr-un amestec de risc"""
+    random.seed(seed)
+    generator = DemoDataGenerator()
+    return [MIXES[mix](generator) for _ in range(count)]
+
+def measure(call: Callable[[Any], Any], inputs: Sequence[Any], min_time: float = 0.2,
+            min_calls: int = 200, warmup: int = 20, allocation_samples: int = 50) -> Dict[str, float]:
+    """Latențele per apel (fără GC), apoi memoria alocată per apel cu tracemalloc"""
+    for index in range(min(warmup, len(inputs))):
+        call(inputs[index])
+
+    latencies = []
+    clock = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        deadline = time.perf_counter() + min_time
+        index = 0
+        while len(latencies) < min_calls or time.perf_counter() < deadline:
+            value = inputs[index % len(inputs)]
+            start = clock()
+            call(value)
+            latencies.append(clock() - start)
+            index += 1
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # vârful de memorie alocată în timpul apelului (include obiectele temporare eliberate)
+    allocated = []
+    tracemalloc.start()
+    try:
+        for value in list(inputs)[:allocation_samples]:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call(value)
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    latencies_us = np.asarray(latencies) / 1000.0
+    return {
+        "apeluri": len(latencies),
+        "ops_per_sec": round(1e6 / latencies_us.mean(), 1),
+        "p50_us": round(float(np.percentile(latencies_us, 50)), 2),
+        "p99_us": round(float(np.percentile(latencies_us, 99)), 2),
+        "bytes_per_apel": int(np.median(allocated)) if allocated else 0,
+    }
+
+def run_benchmarks(cases: Optional[Sequence[BenchmarkCase]] = None, mixes: Sequence[str] = tuple(MIXES),
+                   patients: int = 200, min_time: float = 0.2, seed: int = 0,
+                   case_names: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Rulează toate combinațiile funcție × amestec; cheia rezultatului este "funcție/amestec" """
+    cases = default_cases() if cases is None else cases
+    if case_names:
+        cases = [case for case in cases if case.nume in case_names]
+    results = {}
+    for mix in mixes:
+        population = generate_mix(mix, patients, seed)
+        for case in cases:
+            results[f"{case.nume}/{mix}"] = measure(case.apel, case.pregatire(population), min_time=min_time)
+    return results
+
+def environment() -> Dict[str, str]:
+    """Descrierea mașinii pe care s-a măsurat (referințele nu sunt portabile între mașini)"""
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "procesor": platform.processor() or platform.machine(), "numpy": np.__version__}
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = DEFAULT_BASELINE_PATH):
+    """Scrie referința JSON"""
+    payload = {"schema": SCHEMA_VERSION, "generat": datetime.now().isoformat(timespec="seconds"),
+               "mediu": environment(), "rezultate": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Citește referința JSON (None dacă lipsește)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"Schemă de referință nesuportată: {baseline.get('schema')}")
+    return baseline
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+                     tolerance: float = 0.5, allocation_tolerance: float = 0.25,
+                     slack_us: float = 5.0) -> List[str]:
+    """Regresiile față de referință: latența p50 peste (1 + toleranță) × referința, sau memorie în creștere.
+
+    slack_us este zgomotul absolut admis (funcțiile de câteva µs variază mult între rulări).
+    """
+    regressions = []
+    for key, current in sorted(results.items()):
+        reference = baseline["rezultate"].get(key)
+        if reference is None:
+            continue
+        if current["p50_us"] > reference["p50_us"] * (1 + tolerance) + slack_us:
+            regressions.append(f"{key}: p50 {current['p50_us']:.1f}µs față de {reference['p50_us']:.1f}µs")
+        if current["bytes_per_apel"] > reference["bytes_per_apel"] * (1 + allocation_tolerance) + 256:
+            regressions.append(f"{key}: {current['bytes_per_apel']} B/apel față de {reference['bytes_per_apel']} B/apel")
+    return regressions
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """Tabel text cu rezultatele"""
+    width = max(map(len, results), default=10)
+    lines = [f"{'funcție/amestec':<{width}}  {'ops/s':>10}  {'p50 µs':>9}  {'p99 µs':>9}  {'B/apel':>8}"]
+    for key, row in results.items():
+        lines.append(f"{key:<{width}}  {row['ops_per_sec']:>10.0f}  {row['p50_us']:>9.2f}  "
+                     f"{row['p99_us']:>9.2f}  {row['bytes_per_apel']:>8}")
+    return "\n".join(lines)
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă; cod de ieșire 1 la regresii (cu --check)"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark pentru scorarea IAAM")
+    parser.add_argument("--cases", nargs="+", default=None, help="funcțiile măsurate (implicit toate)")
+    parser.add_argument("--mixes", nargs="+", choices=tuple(MIXES), default=tuple(MIXES), help="amestecurile de risc")
+    parser.add_argument("--quick", action="store_true", help="rulare scurtă (50 pacienți, 0.05s per combinație)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="fișierul JSON de referință")
+    parser.add_argument("--save-baseline", action="store_true", help="scrie rezultatele ca nouă referință")
+    parser.add_argument("--check", action="store_true", help="compară cu referința și semnalează regresiile")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="creșterea relativă admisă a latenței p50")
+    parser.add_argument("-o", "--output", default=None, help="scrie rezultatele și în acest fișier JSON")
+    args = parser.parse_args()
+
+    patients, min_time = (50, 0.05) if args.quick else (200, 0.2)
+    results = run_benchmarks(mixes=args.mixes, patients=patients, min_time=min_time, case_names=args.cases)
+    print(format_results(results))
+
+    if args.output:
+        save_baseline(results, args.output)
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"💾 Referință salvată în {args.baseline}")
+    if args.check:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"⚠️ Referința {args.baseline} lipsește (rulați cu --save-baseline)")
+            return 0
+        if baseline.get("mediu", {}).get("platform") != environment()["platform"]:
+            print("⚠️ Referința a fost generată pe altă mașină; comparația este orientativă")
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("❌ Regresii de performanță:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print("✅ Fără regresii față de referință")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Scanner într-o singură trecere pentru textul clinic
+Textul se tokenizează o singură dată (numere, cuvinte, semne) cu o expresie
+regulată comună; etichetele și unitățile se recunosc prin căutare într-un
+trie de fraze, deci timpul de extracție crește liniar cu lungimea textului
+și nu cu numărul de pattern-uri (vocabularele de cuvinte-cheie: vezi
+keyword_automaton).
+
+Rezultatul este lista de candidați (câmp, valoare, poziție, prioritate);
+conflictele dintre candidați se rezolvă de extractor, după prioritatea
+regulilor (ordinea vechilor pattern-uri) și validările fiecărui câmp.
+
+Exemplu:
+    python clinical_scanner.py "Internat de 5 zile, CRP 150, TA 85/50 mmHg, E. coli ESBL+"
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from medical_patterns import PatternRegistry
+
+# Numere (cu zecimale "." sau ","), cuvinte (doar litere) și semne; cratima
+# separă ca un spațiu ("c-reactive" = "c reactive")
+TOKEN_PATTERN = PatternRegistry.compile(r"\d+(?:[.,]\d+)?|[^\W\d_]+|[^\w\s-]")
+
+DAY_UNITS = frozenset({"zile", "zi", "days", "day", "d"})
+HOUR_UNITS = frozenset({"ore", "ora", "hours", "hour", "h"})
+SEPARATORS = frozenset({":", "="})
+
+# Forma valorii: număr simplu, tensiune (sistolica/diastolica din "120/80") sau durată (convertită în ore)
+FORMS = ("numar", "sistolica", "diastolica", "ore", "zile", "durata")
+
+@dataclass(frozen=True)
+class ScanRule:
+    """Regulă de extracție: [etichetă] valoare [sufix], opțional urmată mai târziu de o frază de context.
+
+    Frazele se scriu ca text ("proteina c reactiva", "x 10^3") și se tokenizează la fel ca textul scanat.
+    Fără etichetă și fără sufix, regula se aplică oricărei valori de forma cerută (de regulă durate).
+    """
+    camp: str
+    prioritate: int
+    etichete: Tuple[str, ...] = ()
+    sufixe: Tuple[str, ...] = ()
+    context: Tuple[str, ...] = ()
+    forma: str = "numar"
+    factor: float = 1.0
+
+    def __post_init__(self):
+        if self.forma not in FORMS:
+            raise ValueError(f"Formă necunoscută: {self.forma}")
+
+@dataclass
+class Candidate:
+    """Valoare candidată găsită în text (poziția este în caractere, [start, end); data: vezi streaming_extraction)"""
+    camp: str
+    valoare: Any
+    start: int
+    end: int
+    prioritate: int = 0
+    data: Optional[date] = None
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return (self.start, self.end)
+
+@dataclass
+class ScanResult:
+    """Candidații unei scanări și duratele găsite (număr + unitate de timp)"""
+    candidati: List[Candidate] = field(default_factory=list)
+    durate: List[Candidate] = field(default_factory=list)
+
+    def by_field(self) -> Dict[str, List[Candidate]]:
+        """Candidații pe câmpuri, în ordinea de rezolvare: prioritatea regulii, apoi poziția în text"""
+        grouped = defaultdict(list)
+        for candidate in sorted(self.candidati, key=lambda c: (c.prioritate, c.start)):
+            grouped[candidate.camp].append(candidate)
+        return dict(grouped)
+
+def tokenize(text: str) -> List[str]:
+    """Tokenii textului (numere, cuvinte, semne)"""
+    return TOKEN_PATTERN.findall(text)
+
+def phrase_tokens(phrase: str) -> Tuple[str, ...]:
+    """Frază de lexicon → tokenii ei (aceeași tokenizare ca textul, după lower())"""
+    return tuple(tokenize(phrase.lower()))
+
+def parse_number(text: str) -> float:
+    """Număr cu zecimală "." sau ","""
+    return float(text.replace(",", "."))
+
+class ClinicalScanner:
+    """Scanner compilat o singură dată din reguli"""
+
+    def __init__(self, rules: Sequence[ScanRule], unitati_zile: Iterable[str] = DAY_UNITS, unitati_ore: Iterable[str] = HOUR_UNITS,
+                 separatori: Iterable[str] = SEPARATORS):
+        self.rules = tuple(rules)
+        self.unitati_zile = frozenset(unitati_zile)
+        self.unitati_ore = frozenset(unitati_ore)
+        self.separatori = frozenset(separatori)
+        self._trie: Dict = {}
+        self._max_tokens = 1
+        for rule in self.rules:
+            for phrase in rule.etichete:
+                self._add(phrase, ("eticheta", rule))
+            for phrase in rule.sufixe:
+                self._add(phrase, ("sufix", rule))
+            for phrase in rule.context:
+                self._add(phrase, ("context", phrase_tokens(phrase)))
+        self._contexts = {rule: tuple(phrase_tokens(phrase) for phrase in rule.context) for rule in self.rules}
+        self._free_rules = tuple(rule for rule in self.rules if not rule.etichete and not rule.sufixe)
+
+    def _add(self, phrase: str, entry: Tuple[str, Any]):
+        """Adaugă fraza în trie (nodul final păstrează intrările sub cheia None)"""
+        tokens = phrase_tokens(phrase)
+        if not tokens:
+            raise ValueError(f"Frază goală în lexicon: {phrase!r}")
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, []).append(entry)
+        self._max_tokens = max(self._max_tokens, len(tokens))
+
+    def scan(self, text: str) -> ScanResult:
+        """O singură trecere prin text: tokeni, fraze din lexicon, apoi candidații regulilor"""
+        matches = list(TOKEN_PATTERN.finditer(text))
+        texts = [match.group() for match in matches]
+        count = len(texts)
+        result = ScanResult()
+
+        # frazele din lexicon care încep la fiecare token (trie, adâncime limitată) și pozițiile numerelor
+        label_hits, suffix_hits, numbers = [], [], []
+        last_context: Dict[Tuple[str, ...], int] = {}
+        trie, max_tokens = self._trie, self._max_tokens
+        for i, token in enumerate(texts):
+            if token[0].isdecimal():
+                numbers.append(i)
+            node = trie.get(token)
+            j = i
+            while node is not None:
+                entries = node.get(None)
+                if entries:
+                    for kind, payload in entries:
+                        if kind == "eticheta":
+                            label_hits.append((payload, i, j + 1))
+                        elif kind == "sufix":
+                            suffix_hits.append((payload, i, j + 1))
+                        else:
+                            last_context[payload] = i
+                j += 1
+                if j >= count or j - i >= max_tokens:
+                    break
+                node = node.get(texts[j])
+
+        is_number = set(numbers)
+        days_units, hours_units = self.unitati_zile, self.unitati_ore
+
+        # durate: număr urmat de o unitate de timp
+        durations = []
+        for i in numbers:
+            unit = texts[i + 1] if i + 1 < count else None
+            if unit in days_units or unit in hours_units:
+                durations.append(i)
+                result.durate.append(Candidate("zile" if unit in days_units else "ore", int(parse_number(texts[i])),
+                                               matches[i].start(), matches[i + 1].end()))
+
+        def value_at(forma: str, k: int) -> Optional[Tuple[float, int]]:
+            """Valoarea de forma cerută care începe la tokenul k și indexul tokenului de după ea"""
+            if k not in is_number:
+                return None
+            if forma == "numar":
+                return parse_number(texts[k]), k + 1
+            if forma in ("sistolica", "diastolica"):
+                if not (k + 2 in is_number and texts[k + 1] == "/"):
+                    return None
+                return parse_number(texts[k if forma == "sistolica" else k + 2]), k + 3
+            unit = texts[k + 1] if k + 1 < count else None
+            if unit in hours_units and forma in ("ore", "durata"):
+                return parse_number(texts[k]), k + 2
+            if unit in days_units and forma in ("zile", "durata"):
+                return parse_number(texts[k]) * 24, k + 2
+            return None
+
+        def in_context(rule: ScanRule, after: int) -> bool:
+            """Regula fără context, sau o frază de context care începe după valoare"""
+            return not rule.context or any(last_context.get(phrase, -1) >= after for phrase in self._contexts[rule])
+
+        def emit(rule: ScanRule, value: float, first: int, last: int):
+            result.candidati.append(Candidate(rule.camp, value * rule.factor, matches[first].start(),
+                                              matches[last - 1].end(), rule.prioritate))
+
+        for rule, first, k in label_hits:
+            while k < count and texts[k] in self.separatori:
+                k += 1
+            found = value_at(rule.forma, k)
+            if found and in_context(rule, found[1]):
+                emit(rule, found[0], first, found[1])
+
+        for rule, first, last in suffix_hits:
+            for width in (3, 2, 1):
+                found = value_at(rule.forma, first - width) if first - width >= 0 else None
+                if found and found[1] == first and in_context(rule, last):
+                    emit(rule, found[0], first - width, last)
+                    break
+
+        for rule in self._free_rules:
+            for k in (numbers if rule.forma in ("numar", "sistolica", "diastolica") else durations):
+                found = value_at(rule.forma, k)
+                if found and in_context(rule, found[1]):
+                    emit(rule, found[0], k, found[1])
+
+        return result
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: candidații extractorului Enhanced pentru un text"""
+    parser = argparse.ArgumentParser(description="Scanner clinic într-o singură trecere")
+    parser.add_argument("text", help="textul clinic de scanat")
+    args = parser.parse_args()
+
+    from epimind_ai_enhanced import EnhancedMedicalDataExtractor
+
+    result = EnhancedMedicalDataExtractor.SCANNER.scan(args.text.lower())
+    for candidate in sorted(result.candidati, key=lambda c: c.start):
+        print(f"{candidate.start:>5}-{candidate.end:<5} {candidate.camp:<24} {candidate.valoare!s:<24} "
+              f"prioritate {candidate.prioritate}")
+    for durata in result.durate:
+        print(f"{durata.start:>5}-{durata.end:<5} durată {durata.valoare} {durata.camp}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
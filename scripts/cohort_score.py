@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Scorare IAAM în lot pentru cohorte de pacienți (linie de comandă)
+Citește fișiere JSON/JSONL/CSV, împarte cohorta în fragmente procesate
+în paralel (ProcessPoolExecutor) și scrie rezultatele JSONL în ordinea
+de intrare
+
+Exemplu:
+    python cohort_score.py pacienti.jsonl --calculator enhanced --workers 8 -o scoruri.jsonl
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import MISSING
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+CALCULATORS = ("enhanced", "final", "professional")
+
+# Calculatorul fiecărui proces de lucru (creat o singură dată în init_worker)
+_calculator = None
+_calculator_name = None
+_with_recommendations = False
+
+def create_calculator(name: str):
+    """Creează calculatorul ales (importul modulelor Streamlit se face doar în procesele de lucru)"""
+    if name == "enhanced":
+        from epimind_ai_enhanced import EnhancedIAAMPredictor
+        return EnhancedIAAMPredictor()
+    if name == "final":
+        from epimind_ai_final_professional import UltraAdvancedIAAMCalculator
+        return UltraAdvancedIAAMCalculator()
+    if name == "professional":
+        from epimind_ai_professional import AdvancedIAAMCalculator
+        return AdvancedIAAMCalculator()
+    raise ValueError(f"Calculator necunoscut: {name} (disponibile: {', '.join(CALCULATORS)})")
+
+def init_worker(name: str, recommendations: bool = False):
+    """Inițializează calculatorul în procesul de lucru"""
+    global _calculator, _calculator_name, _with_recommendations
+    _calculator = create_calculator(name)
+    _calculator_name = name
+    _with_recommendations = recommendations
+
+def _list_value(value: Any) -> List[str]:
+    """Normalizează o listă venită din JSON sau CSV ("KPC;ESBL" sau '["KPC"]')"""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not isinstance(value, str) or not value.strip():
+        return []
+    value = value.strip()
+    if value.startswith("["):
+        return list(json.loads(value))
+    return [item.strip() for item in value.split(";") if item.strip()]
+
+def parse_chunk(fmt: str, payload: Any) -> pd.DataFrame:
+    """Decodează un fragment (linii JSONL, text CSV sau înregistrări JSON) în DataFrame"""
+    if fmt == "jsonl":
+        frame = pd.DataFrame([json.loads(line) for line in payload if line.strip()])
+    elif fmt == "csv":
+        frame = pd.read_csv(io.StringIO(payload), dtype={"patient_id": str, "bacterie": str})
+    else:
+        frame = pd.DataFrame(payload)
+    if "rezistente" in frame:
+        frame["rezistente"] = [_list_value(value) for value in frame["rezistente"]]
+    return frame
+
+def _patient_ids(frame: pd.DataFrame) -> List[Any]:
+    """Identificatorii pacienților (None dacă lipsesc)"""
+    if "patient_id" not in frame:
+        return [None] * len(frame)
+    return [None if isinstance(value, float) and math.isnan(value) else value for value in frame["patient_id"]]
+
+def score_enhanced(calculator, frame: pd.DataFrame, recommendations: bool = False) -> List[Dict[str, Any]]:
+    """Scorare vectorizată cu EnhancedIAAMPredictor"""
+    result = calculator.predict_iaam_risk_batch(frame)
+    return [
+        {"patient_id": patient_id, "score": int(score), "level": level,
+         "sofa_score": int(sofa), "qsofa_score": int(qsofa)}
+        for patient_id, score, level, sofa, qsofa in zip(
+            _patient_ids(frame), result["score"], result["level"], result["sofa_score"], result["qsofa_score"])
+    ]
+
+def score_final(calculator, frame: pd.DataFrame, recommendations: bool = False) -> List[Dict[str, Any]]:
+    """Scorare vectorizată cu UltraAdvancedIAAMCalculator"""
+    from epimind_ai_final_professional import PatientData
+    fields = {}
+    for name in calculator.BATCH_FIELDS:
+        if name not in frame:
+            continue
+        if name == "rezistente":
+            fields[name] = np.fromiter(map(len, frame[name]), dtype=np.int64, count=len(frame))
+        elif name == "bacterie":
+            fields[name] = frame[name].fillna("").to_numpy(dtype=object)
+        else:
+            fields[name] = frame[name].fillna(PatientData.__dataclass_fields__[name].default).to_numpy(dtype=float)
+    hours = fields.get("ore_spitalizare", np.zeros(len(frame)))
+    scores = calculator.calculate_risk_batch(fields)
+    probabilities = np.where(hours < 48, 0.0, calculator._calculate_probability(scores))
+    levels = calculator.classify_batch(scores, hours)
+    results = [
+        {"patient_id": patient_id, "scor_total": round(float(score), 1), "nivel_risc": level,
+         "probabilitate": float(probability)}
+        for patient_id, score, level, probability in zip(_patient_ids(frame), scores, levels, probabilities)
+    ]
+    if recommendations:
+        # recomandările se construiesc o singură dată per mască de condiții; celulele goale și
+        # câmpurile absente dintr-un rând primesc valoarea implicită din PatientData, ca la scor
+        columns = {}
+        for name in calculator.recommendations.fields():
+            if name not in frame:
+                continue  # recommend_batch completează coloanele lipsă
+            column, default = frame[name], PatientData.__dataclass_fields__[name].default
+            if default is not MISSING:  # listele (rezistente) sunt deja normalizate în parse_chunk
+                column = column.where(column.notna(), default)
+            columns[name] = column.to_numpy()
+        for result, texts in zip(results, calculator.recommend_batch(columns, levels)):
+            result["recomandari"] = texts
+    return results
+
+def score_professional(calculator, frame: pd.DataFrame, recommendations: bool = False) -> List[Dict[str, Any]]:
+    """Scorare pacient cu pacient cu AdvancedIAAMCalculator (fără variantă vectorizată)"""
+    from epimind_ai_professional import PatientData
+    known = [name for name in frame.columns if name in PatientData.__dataclass_fields__]
+    results = []
+    for patient_id, row in zip(_patient_ids(frame), frame[known].to_dict("records")):
+        values = {name: value for name, value in row.items()
+                  if not (isinstance(value, float) and math.isnan(value))}
+        risk = calculator.calculate_risk(PatientData(**values))
+        result = {"patient_id": patient_id, "scor_total": risk["scor_total"], "nivel_risc": risk["nivel_risc"]}
+        if recommendations:
+            result["recomandari"] = risk["recomandari"]
+        results.append(result)
+    return results
+
+SCORERS = {"enhanced": score_enhanced, "final": score_final, "professional": score_professional}
+
+def score_chunk(task: Tuple[str, Any]) -> Tuple[int, str]:
+    """Scorează un fragment în procesul de lucru; returnează numărul de pacienți și liniile JSONL"""
+    fmt, payload = task
+    frame = parse_chunk(fmt, payload)
+    results = SCORERS[_calculator_name](_calculator, frame, _with_recommendations) if len(frame) else []
+    return len(results), "".join(json.dumps(result, ensure_ascii=False, default=str) + "\n" for result in results)
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    """Generator: fragmente brute din fișier (decodarea se face în procesele de lucru)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        for start in range(0, len(records), chunk_size):
+            yield "records", records[start:start + chunk_size]
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        if extension == ".csv":
+            header = f.readline()
+            while True:
+                lines = list(islice(f, chunk_size))
+                if not lines:
+                    return
+                yield "csv", header + "".join(lines)
+        elif extension in (".jsonl", ".ndjson"):
+            while True:
+                lines = list(islice(f, chunk_size))
+                if not lines:
+                    return
+                yield "jsonl", lines
+        else:
+            raise ValueError(f"Format de fișier nesuportat: {extension} (JSON, JSONL sau CSV)")
+
+def score_cohort(path: str, calculator: str = "enhanced", workers: int = None,
+                 chunk_size: int = 5000, recommendations: bool = False) -> Iterator[Tuple[int, str]]:
+    """Generator: rezultatele fragmentelor în ordinea de intrare, cu un număr limitat de fragmente în lucru"""
+    if calculator not in SCORERS:
+        raise ValueError(f"Calculator necunoscut: {calculator} (disponibile: {', '.join(CALCULATORS)})")
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(path, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(calculator, recommendations)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk))
+            # fereastră mărginită: memoria nu crește cu dimensiunea fișierului
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def main():
+    """Punctul de intrare al liniei de comandă"""
+    parser = argparse.ArgumentParser(description="Scorare IAAM în lot pentru cohorte de pacienți")
+    parser.add_argument("input", help="fișier JSON, JSONL sau CSV cu pacienți")
+    parser.add_argument("--calculator", choices=CALCULATORS, default="enhanced",
+                        help="enhanced (EnhancedIAAMPredictor), final (UltraAdvancedIAAMCalculator) "
+                             "sau professional (AdvancedIAAMCalculator)")
+    parser.add_argument("--workers", type=int, default=None, help="procese de lucru (implicit: numărul de nuclee)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="pacienți per fragment")
+    parser.add_argument("--recommendations", action="store_true",
+                        help="include recomandările clinice (calculatoarele final și professional)")
+    parser.add_argument("-o", "--output", default="-", help="fișier JSONL de ieșire (implicit stdout)")
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    total = 0
+    try:
+        for count, lines in score_cohort(args.input, args.calculator, args.workers, args.chunk_size,
+                                          args.recommendations):
+            output.write(lines)
+            total += count
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {total} pacienți scorați în {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} pacienți/s, "
+          f"calculator {args.calculator})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Atribuirea duratelor dispozitivelor după proximitate
+Mențiunile (dispozitive, cuvinte de internare) și duratele ("3 zile",
+"48 ore") se găsesc o singură dată fiecare; apoi fiecare durată se
+atribuie mențiunii vecine din aceeași propoziție, la cel mult `fereastra`
+cuvinte distanță. Nu există căutări .* între cuvânt-cheie și număr, deci
+timpul crește liniar cu textul, iar o durată nu se ia dintr-o propoziție
+fără legătură.
+
+Reguli de atribuire (în ordine):
+    1. doar vecini direcți: între mențiune și durată nu există altă
+       mențiune sau altă durată;
+    2. durata de după mențiune ("CVC de 3 zile") înaintea celei dinainte
+       ("3 zile de CVC"), apoi cea mai apropiată;
+    3. fiecare durată și fiecare mențiune se folosesc o singură dată.
+Cuvintele de internare participă doar ca ancore concurente: "internat de
+5 zile, CVC de 3 zile" dă CVC 3 zile, nu 5.
+
+Exemplu:
+    python device_duration.py "Internat de 5 zile, CVC de 3 zile. Foley."
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from clinical_scanner import DAY_UNITS, HOUR_UNITS, Candidate
+from medical_patterns import PatternRegistry
+
+# Cuvintele de internare: ancore care "revendică" durata spitalizării
+HOSPITALIZATION_ANCHORS = (
+    "internat", "internata", "internare", "internarea", "internarii",
+    "spitalizat", "spitalizata", "spitalizare", "spitalizarea", "spitalizarii",
+    "hospitalized", "hospitalization", "admission", "admitted", "length of stay"
+)
+ANCHOR_KEY = "spitalizare"
+
+# Sfârșit de propoziție: semn de punctuație urmat de spațiu (nu "38.5") sau linie nouă;
+# punctul după o singură literă este o abreviere ("e. coli"), nu sfârșit de propoziție
+SENTENCE_END = PatternRegistry.compile(r"(?<!\b[^\W\d])[.!?;](?=\s|$)|\n")
+WORD = PatternRegistry.compile(r"\w+")
+
+@dataclass
+class Mention:
+    """Mențiune a unui dispozitiv (sau ancoră) în text, [start, end)"""
+    cheie: str
+    start: int
+    end: int
+
+def duration_pattern(unitati: Iterable[str]):
+    """Număr întreg (nu partea zecimală a altui număr) urmat de o unitate de timp"""
+    units = "|".join(sorted(unitati, key=len, reverse=True))
+    return PatternRegistry.compile(rf"(?<![\d.,])(\d+)\s*({units})\b")
+
+class DurationResolver:
+    """Perechi mențiune-durată în aceeași propoziție, după distanța în cuvinte"""
+
+    def __init__(self, fereastra: int = 6, unitati_zile: Iterable[str] = DAY_UNITS,
+                 unitati_ore: Iterable[str] = HOUR_UNITS):
+        self.fereastra = fereastra
+        self.unitati_zile = frozenset(unitati_zile)
+        self.unitati_ore = frozenset(unitati_ore)
+        self._pattern = duration_pattern(self.unitati_zile | self.unitati_ore)
+
+    def durations(self, text: str) -> List[Candidate]:
+        """Duratele din text (o singură trecere), ca la ClinicalScanner: câmp "zile" sau "ore" """
+        return [Candidate("zile" if match.group(2) in self.unitati_zile else "ore", int(match.group(1)),
+                          match.start(), match.end())
+                for match in self._pattern.finditer(text)]
+
+    def resolve(self, text: str, mentions: Iterable[Mention],
+                durations: Optional[Sequence[Candidate]] = None) -> Dict[str, int]:
+        """Durata în zile per cheie (prima mențiune a cheii care are o durată atribuită)"""
+        days: Dict[str, int] = {}
+        for mention, duration in self.pairs(text, mentions, durations):
+            if mention.cheie not in days:
+                days[mention.cheie] = self.days(duration)
+        return days
+
+    @staticmethod
+    def days(duration: Candidate) -> int:
+        """Durata în zile (orele se rotunjesc în jos, minimum o zi)"""
+        return duration.valoare if duration.camp == "zile" else max(1, duration.valoare // 24)
+
+    def pairs(self, text: str, mentions: Iterable[Mention],
+              durations: Optional[Sequence[Candidate]] = None) -> List[Tuple[Mention, Candidate]]:
+        """Perechile (mențiune, durată) atribuite, în ordinea mențiunilor în text"""
+        durations = self.durations(text) if durations is None else durations
+        mentions = sorted(mentions, key=lambda mention: mention.start)
+        if not mentions or not durations:
+            return []
+
+        def words_between(start: int, end: int) -> Optional[int]:
+            """Cuvintele dintre mențiune și durată (None peste fereastră sau peste un sfârșit de propoziție)"""
+            count = 0
+            for _ in WORD.finditer(text, start, end):
+                count += 1
+                if count > self.fereastra:
+                    return None  # nu se parcurge restul intervalului
+            return None if SENTENCE_END.search(text, start, end) else count
+
+        # vecinii direcți din ordinea textului: (direcție, distanță, poziție, mențiune, durată)
+        events = sorted([(mention.start, 0, index) for index, mention in enumerate(mentions)] +
+                        [(duration.start, 1, index) for index, duration in enumerate(durations)])
+        pairs: List[Tuple[int, int, int, int, int]] = []
+        for (_, left_kind, left), (_, right_kind, right) in zip(events, events[1:]):
+            if left_kind == right_kind:
+                continue
+            if left_kind == 0:  # mențiune, apoi durată
+                mention, duration, direction = mentions[left], durations[right], 0
+                gap = (mention.end, duration.start)
+            else:  # durată, apoi mențiune
+                mention, duration, direction = mentions[right], durations[left], 1
+                gap = (duration.end, mention.start)
+            distance = words_between(*gap) if gap[0] <= gap[1] else None
+            if distance is not None:
+                pairs.append((direction, distance, duration.start,
+                              left if left_kind == 0 else right, right if left_kind == 0 else left))
+
+        assigned: Dict[int, Candidate] = {}
+        used = set()
+        for _, _, _, mention_index, duration_index in sorted(pairs):
+            if mention_index not in assigned and duration_index not in used:
+                assigned[mention_index] = durations[duration_index]
+                used.add(duration_index)
+
+        return [(mentions[index], assigned[index]) for index in sorted(assigned)]
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: duratele dispozitivelor extractorului Enhanced"""
+    parser = argparse.ArgumentParser(description="Atribuirea duratelor dispozitivelor după proximitate")
+    parser.add_argument("text", help="textul clinic")
+    parser.add_argument("--fereastra", type=int, default=6, help="distanța maximă în cuvinte")
+    args = parser.parse_args()
+
+    from epimind_ai_enhanced import EnhancedMedicalDataExtractor
+
+    text = args.text.lower()
+    mentions = [Mention(hit.valoare[0] if hit.categorie == "dispozitiv" else ANCHOR_KEY, hit.start, hit.end)
+                for hit in EnhancedMedicalDataExtractor.KEYWORDS.find(text, ("dispozitiv", ANCHOR_KEY))]
+    for cheie, zile in DurationResolver(args.fereastra).resolve(text, mentions).items():
+        print(f"🔧 {cheie}: {zile} zile")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,18 +27,32 @@ Rulează:
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import json
 import re
+import itertools
+import bisect
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional
 import requests
 import time
 import hashlib
 import base64
 from dataclasses import dataclass, asdict
 import logging
+from collections import OrderedDict
+from risk_cache import RiskCache, canonical_key, shared_risk_cache
+from risk_alerts import AlertEngine
+from risk_index import RiskIndex
+from risk_sensitivity import applicable_interventions, counterfactual_columns, rank_deltas
+from severity_scores import bin_index, load_severity_table
+from clinical_scanner import Candidate, ClinicalScanner, ScanRule
+from device_duration import ANCHOR_KEY, HOSPITALIZATION_ANCHORS, DurationResolver, Mention
+from keyword_automaton import KeywordAutomaton
+from streaming_extraction import StreamingExtractor, merge
+from patient_patch import FieldChange, apply_patch
 
 # Configurare logging
 logging.basicConfig(level=logging.INFO)
@@ -291,6 +305,10 @@ class PatientData:
         if not self.patient_id:
             self.patient_id = self.generate_id()
     
+    def patch(self, values: Dict[str, Any]) -> Dict[str, FieldChange]:
+        """Aplică în loc valorile extrase (validate după tipul câmpului); returnează doar modificările"""
+        return apply_patch(self, values)
+    
     def generate_id(self) -> str:
         """Generează ID unic pentru pacient"""
         data_str = f"{self.timestamp}{self.ore_spitalizare}{self.leucocite}"
@@ -418,8 +436,25 @@ class EnhancedOllamaAI:
 
 class EnhancedIAAMPredictor:
     """Motor îmbunătățit de predicție IAAM"""
-    
-    def __init__(self):
+
+    # Praguri și niveluri de risc (aceleași ca în predict_iaam_risk)
+    LEVEL_THRESHOLDS = (50, 80, 110, 140)
+    LEVEL_NAMES = ("SCĂZUT", "MODERAT", "ÎNALT", "FOARTE ÎNALT", "CRITIC")
+    LEVEL_CLASSES = ("risk-low", "risk-moderate", "risk-moderate", "risk-high", "risk-critical")
+    MAX_CACHED_BREAKDOWNS = 256
+    SCORING_PROFILE = "enhanced-4.0.0"
+    # Intervenții contrafactuale implicite: nume -> câmpurile modificate
+    DEFAULT_INTERVENTIONS = {
+        "Îndepărtare cateter central": {"cateter_central": False, "cateter_central_days": 0},
+        "Detubare (fără ventilație)": {"ventilatie_mecanica": False, "ventilatie_mecanica_days": 0},
+        "Îndepărtare sondă urinară": {"sonda_urinara": False, "sonda_urinara_days": 0},
+        "Normalizare procalcitonină": {"procalcitonina": 0.1},
+        "Normalizare CRP": {"crp": 5.0},
+        "Normalizare leucocite": {"leucocite": 7.0},
+        "Normalizare temperatură": {"temperatura": 37.0}
+    }
+
+    def __init__(self, cache: Optional[RiskCache] = None):
         self.device_weights = {
             "cateter_central": 25,
             "ventilatie_mecanica": 30,
@@ -453,165 +488,259 @@ class EnhancedIAAMPredictor:
             "Candida auris": 35,
             "Clostridioides difficile": 25
         }
-    
-    def calculate_sofa(self, data: PatientData) -> Tuple[int, Dict[str, int]]:
-        """Calculează SOFA score cu detalii pe componente"""
-        scores = {}
-        
-        # Respirator (PaO2/FiO2)
-        pao2_fio2 = data.pao2_fio2
-        if pao2_fio2 >= 400:
-            scores["respirator"] = 0
-        elif pao2_fio2 >= 300:
-            scores["respirator"] = 1
-        elif pao2_fio2 >= 200:
-            scores["respirator"] = 2
-        elif pao2_fio2 >= 100:
-            scores["respirator"] = 3
-        else:
-            scores["respirator"] = 4
-        
-        # Coagulare (trombocite)
-        platelets = data.trombocite
-        if platelets >= 150:
-            scores["coagulare"] = 0
-        elif platelets >= 100:
-            scores["coagulare"] = 1
-        elif platelets >= 50:
-            scores["coagulare"] = 2
-        elif platelets >= 20:
-            scores["coagulare"] = 3
-        else:
-            scores["coagulare"] = 4
-        
-        # Hepatic (bilirubină)
-        bilirubin = data.bilirubina
-        if bilirubin < 1.2:
-            scores["hepatic"] = 0
-        elif bilirubin < 2.0:
-            scores["hepatic"] = 1
-        elif bilirubin < 6.0:
-            scores["hepatic"] = 2
-        elif bilirubin < 12.0:
-            scores["hepatic"] = 3
-        else:
-            scores["hepatic"] = 4
-        
-        # Cardiovascular
-        if data.vasopresoare:
-            scores["cardiovascular"] = 4
-        elif data.hipotensiune or data.tas < 70:
-            scores["cardiovascular"] = 3
-        elif data.tas < 90:
-            scores["cardiovascular"] = 2
-        else:
-            scores["cardiovascular"] = 0
-        
-        # Neurologic (Glasgow)
-        glasgow = data.glasgow
-        if glasgow == 15:
-            scores["neurologic"] = 0
-        elif glasgow >= 13:
-            scores["neurologic"] = 1
-        elif glasgow >= 10:
-            scores["neurologic"] = 2
-        elif glasgow >= 6:
-            scores["neurologic"] = 3
-        else:
-            scores["neurologic"] = 4
-        
-        # Renal (creatinină)
-        creatinine = data.creatinina
-        if creatinine < 1.2:
-            scores["renal"] = 0
-        elif creatinine < 2.0:
-            scores["renal"] = 1
-        elif creatinine < 3.5:
-            scores["renal"] = 2
-        elif creatinine < 5.0:
-            scores["renal"] = 3
-        else:
-            scores["renal"] = 4
         
-        total_score = sum(scores.values())
-        return total_score, scores
-    
-    def calculate_qsofa(self, data: PatientData) -> Tuple[int, List[str]]:
-        """Calculează qSOFA score cu detalii"""
-        score = 0
-        criteria = []
+        # Praguri SOFA/qSOFA din tabelul versionat (comun cu IAMPredictor)
+        self.severity_table = load_severity_table("enhanced")
         
-        if data.tas < 100:
-            score += 1
-            criteria.append(f"TAS < 100 mmHg ({data.tas})")
+        # Graful de dependențe: componentă -> (funcție de scor, câmpurile PatientData citite)
+        self.components = {"timp": (self._score_time, ("ore_spitalizare",))}
+        for device in self.device_weights:
+            self.components[f"dispozitiv:{device}"] = (
+                lambda data, explain=True, device=device: self._score_device(data, device, explain),
+                (device, f"{device}_days")
+            )
+        self.components["microbiologie"] = (self._score_microbiology, ("cultura_pozitiva", "bacterie", "rezistente"))
+        for organ, fields in self.severity_table.organ_fields().items():
+            self.components[f"sofa:{organ}"] = (
+                lambda data, explain=True, organ=organ: (self.severity_table.organ_points(organ, vars(data)), []),
+                fields
+            )
+        self.components["qsofa"] = (self.calculate_qsofa, self.severity_table.qsofa_fields())
+        self.components["leucocite"] = (self._score_wbc, ("leucocite",))
+        self.components["crp"] = (self._score_crp, ("crp",))
+        self.components["procalcitonina"] = (self._score_pct, ("procalcitonina",))
+        self.components["temperatura"] = (self._score_temperature, ("temperatura",))
+        self.components["frecventa_cardiaca"] = (self._score_heart_rate, ("frecventa_cardiaca",))
         
-        if data.frecventa_respiratorie >= 22:
-            score += 1
-            criteria.append(f"FR ≥ 22/min ({data.frecventa_respiratorie})")
+        self.field_components: Dict[str, List[str]] = {}
+        for name, (_, fields) in self.components.items():
+            for field_name in fields:
+                self.field_components.setdefault(field_name, []).append(name)
         
-        if data.glasgow < 15:
-            score += 1
-            criteria.append(f"Glasgow < 15 ({data.glasgow})")
+        # Cache opțional adresat prin conținut (câmpurile de scor + versiunea profilului)
+        self.cache = cache
+        self.profile_version = f"{self.SCORING_PROFILE}/sofa-{self.severity_table.version}"
         
-        return score, criteria
+        # Defalcarea scorului pe pacient pentru rescorare incrementală (LRU)
+        self._breakdowns: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Tuple[int, Any]]]]" = OrderedDict()
+    
+    def calculate_sofa(self, data: PatientData) -> Tuple[int, Dict[str, int]]:
+        """Calculează SOFA score cu detalii pe componente"""
+        return self.severity_table.sofa(vars(data))
+    
+    def calculate_qsofa(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Calculează qSOFA score cu detalii"""
+        values = vars(data)
+        score, met = self.severity_table.qsofa(values)
+        return score, self.severity_table.qsofa_labels(values, met) if explain else []
     
     def evaluate_lab_markers(self, data: PatientData) -> Tuple[int, List[str]]:
         """Evaluează markerii de laborator îmbunătățit"""
         score = 0
         details = []
-        
-        # Leucocite cu interpretare îmbunătățită
+        for scorer in (self._score_wbc, self._score_crp, self._score_pct):
+            points, lab_details = scorer(data)
+            score += points
+            details.extend(lab_details)
+        return score, details
+    
+    def _score_wbc(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Scor leucocite cu interpretare îmbunătățită"""
         wbc = data.leucocite
         if wbc >= 20:
-            score += 20
-            details.append(f"WBC {wbc} - leucocitoză severă (+20)")
+            return 20, [f"WBC {wbc} - leucocitoză severă (+20)"] if explain else []
         elif wbc >= 12:
-            score += 12
-            details.append(f"WBC {wbc} - leucocitoză (+12)")
+            return 12, [f"WBC {wbc} - leucocitoză (+12)"] if explain else []
         elif wbc < 4:
-            score += 15
-            details.append(f"WBC {wbc} - leucopenie (+15)")
-        
-        # CRP cu praguri îmbunătățite
+            return 15, [f"WBC {wbc} - leucopenie (+15)"] if explain else []
+        return 0, []
+    
+    def _score_crp(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Scor CRP cu praguri îmbunătățite"""
         crp = data.crp
         if crp >= 200:
-            score += 25
-            details.append(f"CRP {crp} mg/L - inflamație critică (+25)")
+            return 25, [f"CRP {crp} mg/L - inflamație critică (+25)"] if explain else []
         elif crp >= 100:
-            score += 18
-            details.append(f"CRP {crp} mg/L - inflamație severă (+18)")
+            return 18, [f"CRP {crp} mg/L - inflamație severă (+18)"] if explain else []
         elif crp >= 50:
-            score += 10
-            details.append(f"CRP {crp} mg/L - inflamație moderată (+10)")
+            return 10, [f"CRP {crp} mg/L - inflamație moderată (+10)"] if explain else []
         elif crp >= 10:
-            score += 5
-            details.append(f"CRP {crp} mg/L - inflamație ușoară (+5)")
-        
-        # Procalcitonină cu interpretare precisă
+            return 5, [f"CRP {crp} mg/L - inflamație ușoară (+5)"] if explain else []
+        return 0, []
+    
+    def _score_pct(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Scor procalcitonină cu interpretare precisă"""
         pct = data.procalcitonina
         if pct >= 10:
-            score += 35
-            details.append(f"PCT {pct} ng/mL - șoc septic (+35)")
+            return 35, [f"PCT {pct} ng/mL - șoc septic (+35)"] if explain else []
         elif pct >= 2.0:
-            score += 25
-            details.append(f"PCT {pct} ng/mL - sepsă severă (+25)")
+            return 25, [f"PCT {pct} ng/mL - sepsă severă (+25)"] if explain else []
         elif pct >= 0.5:
-            score += 15
-            details.append(f"PCT {pct} ng/mL - infecție bacteriană (+15)")
+            return 15, [f"PCT {pct} ng/mL - infecție bacteriană (+15)"] if explain else []
         elif pct >= 0.25:
-            score += 8
-            details.append(f"PCT {pct} ng/mL - posibilă infecție (+8)")
-        
-        return score, details
+            return 8, [f"PCT {pct} ng/mL - posibilă infecție (+8)"] if explain else []
+        return 0, []
+    
+    def _score_time(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Timp spitalizare cu calcul îmbunătățit"""
+        hours = data.ore_spitalizare
+        if hours < 48:
+            return 0, []
+        if hours < 72:
+            time_score, label = 8, "risc timpuriu"
+        elif hours < 168:  # < 1 săptămână
+            time_score, label = 15, "risc moderat"
+        elif hours < 336:  # < 2 săptămâni
+            time_score, label = 25, "risc înalt"
+        elif hours < 720:  # < 1 lună
+            time_score, label = 35, "risc foarte înalt"
+        else:  # > 1 lună
+            time_score, label = 45, "risc extrem de înalt"
+        return time_score, [f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - {label} (+{time_score})"] if explain else []
+    
+    def _score_device(self, data: PatientData, device: str, explain: bool = True) -> Tuple[int, List[str]]:
+        """Dispozitiv invaziv cu multiplicator progresiv bazat pe durată"""
+        if not getattr(data, device, False):
+            return 0, []
+        days = getattr(data, f"{device}_days", 0)
+        if days > 14:
+            multiplier = 2.5
+        elif days > 7:
+            multiplier = 2.0
+        elif days > 3:
+            multiplier = 1.5
+        else:
+            multiplier = 1.0
+        device_points = int(self.device_weights[device] * multiplier)
+        return device_points, [f"{device.replace('_', ' ').title()} - {days} zile (+{device_points})"] if explain else []
+    
+    def _score_microbiology(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Microbiologie îmbunătățită: cultură, bacterie și rezistențe"""
+        if not data.cultura_pozitiva:
+            return 0, []
+        bacteria_name = data.bacterie or "necunoscută"
+        # scor de bază pentru cultură pozitivă + bonus pentru bacterii specifice
+        bacteria_score = 20 + self.bacteria_risk.get(bacteria_name, 0)
+        
+        # Rezistențe cu scoring îmbunătățit
+        resistance_points = [self.resistance_weights.get(resistance, 15) for resistance in data.rezistente]
+        if not explain:
+            return bacteria_score + sum(resistance_points), []
+        details = [f"Cultură pozitivă: {bacteria_name} (+{bacteria_score})"]
+        details.extend(
+            f"Rezistență {resistance} (+{points})" for resistance, points in zip(data.rezistente, resistance_points)
+        )
+        return bacteria_score + sum(resistance_points), details
     
-    def predict_iaam_risk(self, data: PatientData) -> Dict:
-        """Calculează riscul IAAM complet și îmbunătățit"""
+    def _score_temperature(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Febră sau hipotermie"""
+        if data.temperatura >= 38.5:
+            return 8, [f"Febră {data.temperatura}°C (+8)"] if explain else []
+        elif data.temperatura <= 36.0:
+            return 10, [f"Hipotermie {data.temperatura}°C (+10)"] if explain else []
+        return 0, []
+    
+    def _score_heart_rate(self, data: PatientData, explain: bool = True) -> Tuple[int, List[str]]:
+        """Tahicardie"""
+        if data.frecventa_cardiaca >= 100:
+            return 5, [f"Tahicardie {data.frecventa_cardiaca}/min (+5)"] if explain else []
+        return 0, []
+    
+    def predict_iaam_risk(self, data: PatientData, score_only: bool = False) -> Dict:
+        """Calculează riscul IAAM complet și îmbunătățit.
+        
+        Cu score_only=True se calculează doar scorurile și nivelul, fără
+        textele de detalii și recomandări (pentru bucle de simulare).
+        """
+        if self.cache is None:
+            return self._compute_risk(data, score_only)
+        
+        profile_version = f"{self.profile_version}/score" if score_only else self.profile_version
+        key = canonical_key(vars(data), profile_version, self.field_components)
+        result = self.cache.get_or_compute(key, lambda: self._compute_risk(data, score_only))
+        # identitatea pacientului nu face parte din cheie
+        result["patient_id"] = data.patient_id
+        result["timestamp"] = data.timestamp
+        return result
+    
+    def _compute_risk(self, data: PatientData, score_only: bool = False) -> Dict:
+        """Calculează toate componentele și însumează scorul"""
+        explain = not score_only
+        components = {name: scorer(data, explain) for name, (scorer, _) in self.components.items()}
+        return self._assemble_risk(data, components, score_only)
+    
+    def rescore(self, data: PatientData, changed_fields: Optional[List[str]] = None) -> Dict:
+        """Recalculează doar componentele afectate de câmpurile modificate.
+        
+        Folosește defalcarea memorată la ultima evaluare a pacientului. Dacă
+        changed_fields lipsește, câmpurile modificate se deduc comparând cu
+        valorile memorate; la prima evaluare se calculează scorul complet.
+        """
+        cached = self._breakdowns.get(data.patient_id)
+        if cached is None:
+            components = self._all_components(data)
+            self._remember_breakdown(data, components)
+            return self._assemble_risk(data, components)
+        self._breakdowns.move_to_end(data.patient_id)
+        snapshot, components = cached
+        
+        if changed_fields is None:
+            changed_fields = [name for name, value in snapshot.items() if getattr(data, name) != value]
+        result = self.rescore_components(data, components, changed_fields)
+        for name in changed_fields:
+            if name in snapshot:
+                snapshot[name] = self._snapshot_value(getattr(data, name))
+        
+        return result
+    
+    def rescore_components(self, data: PatientData, components: Dict[str, Tuple[int, Any]],
+                           changed_fields: Iterable[str], score_only: bool = False) -> Dict:
+        """Recalculează în loc componentele afectate de câmpurile modificate și însumează riscul.
+        
+        Pentru apelanții care își păstrează singuri defalcarea pe componente
+        (de ex. fluxul de secție); o defalcare goală se calculează integral.
+        """
+        if not components:
+            changed_fields = self.field_components
+        explain = not score_only
+        affected = {component for name in changed_fields for component in self.field_components.get(name, ())}
+        for component in affected:
+            components[component] = self.components[component][0](data, explain)
+        return self._assemble_risk(data, components, score_only)
+    
+    def _all_components(self, data: PatientData) -> Dict[str, Tuple[int, Any]]:
+        """Toate componentele (cu explicații), din cache-ul comun când există"""
+        compute = lambda: {name: scorer(data) for name, (scorer, _) in self.components.items()}
+        if self.cache is None:
+            return compute()
+        key = canonical_key(vars(data), f"{self.profile_version}/components", self.field_components)
+        return self.cache.get_or_compute(key, compute)
+    
+    @staticmethod
+    def _snapshot_value(value: Any) -> Any:
+        """Copie a valorii unui câmp (listele sunt mutabile)"""
+        return list(value) if isinstance(value, list) else value
+    
+    def _remember_breakdown(self, data: PatientData, components: Dict[str, Tuple[int, Any]]):
+        """Memorează defalcarea pe componente și valorile câmpurilor citite"""
+        snapshot = {name: self._snapshot_value(getattr(data, name)) for name in self.field_components}
+        self._breakdowns[data.patient_id] = (snapshot, dict(components))
+        self._breakdowns.move_to_end(data.patient_id)
+        while len(self._breakdowns) > self.MAX_CACHED_BREAKDOWNS:
+            self._breakdowns.popitem(last=False)
+    
+    def _assemble_risk(self, data: PatientData, components: Dict[str, Tuple[int, Any]],
+                       score_only: bool = False) -> Dict:
+        """Însumează componentele și determină nivelul de risc"""
         score = 0
         details = []
         
         # Verificare criteriu temporal
         hours = data.ore_spitalizare
         if hours < 48:
+            if score_only:
+                return {"score": 0, "level": "NU IAAM", "is_iaam": False,
+                        "patient_id": data.patient_id, "timestamp": data.timestamp}
             return {
                 "score": 0,
                 "level": "NU IAAM",
@@ -626,103 +755,70 @@ class EnhancedIAAMPredictor:
                 "timestamp": data.timestamp
             }
         
-        # Timp spitalizare cu calcul îmbunătățit
-        if 48 <= hours < 72:
-            time_score = 8
-            details.append(f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - risc timpuriu (+{time_score})")
-        elif hours < 168:  # < 1 săptămână
-            time_score = 15
-            details.append(f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - risc moderat (+{time_score})")
-        elif hours < 336:  # < 2 săptămâni
-            time_score = 25
-            details.append(f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - risc înalt (+{time_score})")
-        elif hours < 720:  # < 1 lună
-            time_score = 35
-            details.append(f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - risc foarte înalt (+{time_score})")
-        else:  # > 1 lună
-            time_score = 45
-            details.append(f"Spitalizare {hours:.1f}h ({hours/24:.1f} zile) - risc extrem de înalt (+{time_score})")
-        
+        time_score, time_details = components["timp"]
         score += time_score
+        details.extend(time_details)
         
-        # Dispozitive invazive cu calcul îmbunătățit
+        # Dispozitive invazive
         device_score = 0
-        for device, base_weight in self.device_weights.items():
-            if getattr(data, device, False):
-                days = getattr(data, f"{device}_days", 0)
-                
-                # Calcul progresiv bazat pe durata
-                if days > 14:
-                    multiplier = 2.5
-                elif days > 7:
-                    multiplier = 2.0
-                elif days > 3:
-                    multiplier = 1.5
-                else:
-                    multiplier = 1.0
-                
-                device_points = int(base_weight * multiplier)
-                device_score += device_points
-                details.append(f"{device.replace('_', ' ').title()} - {days} zile (+{device_points})")
-        
+        for device in self.device_weights:
+            device_points, device_details = components[f"dispozitiv:{device}"]
+            device_score += device_points
+            details.extend(device_details)
         score += device_score
         
-        # Microbiologie îmbunătățită
-        if data.cultura_pozitiva:
-            bacteria_score = 20  # scor de bază pentru cultură pozitivă
-            bacteria_name = data.bacterie or "necunoscută"
-            
-            # Bonus pentru bacterii specifice
-            if bacteria_name in self.bacteria_risk:
-                bacteria_bonus = self.bacteria_risk[bacteria_name]
-                bacteria_score += bacteria_bonus
-                details.append(f"Cultură pozitivă: {bacteria_name} (+{bacteria_score})")
-            else:
-                details.append(f"Cultură pozitivă: {bacteria_name} (+{bacteria_score})")
-            
-            score += bacteria_score
-            
-            # Rezistențe cu scoring îmbunătățit
-            resistance_score = 0
-            for resistance in data.rezistente:
-                points = self.resistance_weights.get(resistance, 15)
-                resistance_score += points
-                details.append(f"Rezistență {resistance} (+{points})")
-            
-            score += resistance_score
+        # Microbiologie
+        micro_score, micro_details = components["microbiologie"]
+        score += micro_score
+        details.extend(micro_details)
         
         # Scoruri severitate
-        sofa_score, sofa_details = self.calculate_sofa(data)
+        sofa_details = {
+            organ: components[f"sofa:{organ}"][0] for organ in self.severity_table.sofa_organs
+        }
+        sofa_score = sum(sofa_details.values())
         if sofa_score > 0:
             sofa_points = sofa_score * 4  # îmbunătățit de la 3 la 4
             score += sofa_points
-            details.append(f"SOFA {sofa_score} (+{sofa_points})")
+            if not score_only:
+                details.append(f"SOFA {sofa_score} (+{sofa_points})")
         
-        qsofa_score, qsofa_criteria = self.calculate_qsofa(data)
+        qsofa_score, qsofa_criteria = components["qsofa"]
         if qsofa_score >= 2:
             qsofa_points = 20  # îmbunătățit de la 15 la 20
             score += qsofa_points
-            details.append(f"qSOFA {qsofa_score}/3 - {', '.join(qsofa_criteria)} (+{qsofa_points})")
+            if not score_only:
+                details.append(f"qSOFA {qsofa_score}/3 - {', '.join(qsofa_criteria)} (+{qsofa_points})")
         
         # Markeri laborator
-        lab_score, lab_details = self.evaluate_lab_markers(data)
+        lab_score = 0
+        for marker in ("leucocite", "crp", "procalcitonina"):
+            marker_points, marker_details = components[marker]
+            lab_score += marker_points
+            details.extend(marker_details)
         score += lab_score
-        details.extend(lab_details)
         
         # Factori de risc suplimentari
-        additional_score = 0
-        if data.temperatura >= 38.5:
-            additional_score += 8
-            details.append(f"Febră {data.temperatura}°C (+8)")
-        elif data.temperatura <= 36.0:
-            additional_score += 10
-            details.append(f"Hipotermie {data.temperatura}°C (+10)")
+        for vital in ("temperatura", "frecventa_cardiaca"):
+            vital_points, vital_details = components[vital]
+            score += vital_points
+            details.extend(vital_details)
         
-        if data.frecventa_cardiaca >= 100:
-            additional_score += 5
-            details.append(f"Tahicardie {data.frecventa_cardiaca}/min (+5)")
-        
-        score += additional_score
+        if score_only:
+            level_index = bisect.bisect_right(self.LEVEL_THRESHOLDS, score)
+            return {
+                "score": int(score),
+                "level": self.LEVEL_NAMES[level_index],
+                "color_class": self.LEVEL_CLASSES[level_index],
+                "is_iaam": True,
+                "sofa_score": sofa_score,
+                "qsofa_score": qsofa_score,
+                "patient_id": data.patient_id,
+                "timestamp": data.timestamp,
+                "device_score": device_score,
+                "lab_score": lab_score,
+                "time_score": time_score
+            }
         
         # Determinare nivel risc cu praguri îmbunătățite
         if score >= 140:
@@ -790,243 +886,344 @@ class EnhancedIAAMPredictor:
             "time_score": time_score
         }
 
+    def predict_iaam_risk_batch(self, patients) -> pd.DataFrame:
+        """Calculează riscul IAAM vectorizat pentru un lot de pacienți.
+
+        Acceptă un DataFrame sau un array NumPy structurat cu coloanele din
+        PatientData; coloanele lipsă primesc valorile implicite. Scorurile și
+        nivelurile sunt identice cu cele din predict_iaam_risk.
+        """
+        frame = patients if isinstance(patients, pd.DataFrame) else pd.DataFrame(patients)
+        frame = frame.reset_index(drop=True)
+        n = len(frame)
+
+        def column(name: str, dtype=float) -> np.ndarray:
+            default = PatientData.__dataclass_fields__[name].default
+            if name not in frame:
+                return np.full(n, default, dtype=dtype)
+            values = frame[name].to_numpy()
+            if values.dtype.kind == "f":
+                return values if dtype is float and not np.isnan(values).any() else \
+                    np.where(np.isnan(values), default, values).astype(dtype, copy=False)
+            if values.dtype.kind == "O":
+                return frame[name].fillna(default).to_numpy(dtype=dtype)
+            # coloanele întregi se compară direct cu pragurile, fără conversie
+            return values if dtype is float and values.dtype.kind in "iu" else values.astype(dtype, copy=False)
+
+        # Timp spitalizare
+        hours = column("ore_spitalizare")
+        time_score = np.array([8, 15, 25, 35, 45])[bin_index([72, 168, 336, 720], hours, "right")]
+
+        # Dispozitive invazive (multiplicator progresiv după durată)
+        device_score = np.zeros(n, dtype=np.int64)
+        multipliers = np.array([1.0, 1.5, 2.0, 2.5])
+        for device, base_weight in self.device_weights.items():
+            points = np.floor(base_weight * multipliers).astype(np.int64)
+            days = column(f"{device}_days")
+            device_score += points[bin_index([3, 7, 14], days, "left")] * column(device, bool)
+
+        # Microbiologie
+        culture = column("cultura_pozitiva", bool)
+        bacteria_bonus = np.zeros(n)
+        if "bacterie" in frame:
+            # factorizare: dicționarul se aplică doar pe valorile distincte
+            codes, names = pd.factorize(frame["bacterie"])
+            bonus_by_name = np.array([self.bacteria_risk.get(name, 0) for name in names] + [0], dtype=float)
+            bacteria_bonus = bonus_by_name[codes]
+        resistance_score = np.zeros(n)
+        if "rezistente" in frame and culture.any():
+            rows = np.flatnonzero(culture)
+            lists = frame["rezistente"].to_numpy()[rows]
+            try:
+                lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+            except TypeError:
+                # valori lipsă (None/NaN) în loc de listă goală
+                lists = [value if isinstance(value, (list, tuple)) else () for value in lists]
+                lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+            if lengths.any():
+                names = itertools.chain.from_iterable(lists)
+                points = np.fromiter(map(self.resistance_weights.get, names, itertools.repeat(15)),
+                                     dtype=float, count=int(lengths.sum()))
+                resistance_score[rows] = np.bincount(np.repeat(np.arange(len(rows)), lengths), weights=points, minlength=len(rows))
+        micro_score = np.where(culture, 20 + bacteria_bonus + resistance_score, 0)
+
+        # Scoruri severitate
+        severity_fields = {
+            field: column(field, bool if field in ("hipotensiune", "vasopresoare") else float)
+            for field in ("pao2_fio2", "trombocite", "bilirubina", "tas", "glasgow", "creatinina",
+                          "frecventa_respiratorie", "hipotensiune", "vasopresoare")
+        }
+        sofa_score, _ = self.severity_table.sofa(severity_fields)
+        qsofa_score, _ = self.severity_table.qsofa(severity_fields)
+
+        # Markeri laborator
+        lab_score = (
+            np.array([15, 0, 12, 20])[bin_index([4, 12, 20], column("leucocite"), "right")]
+            + np.array([0, 5, 10, 18, 25])[bin_index([10, 50, 100, 200], column("crp"), "right")]
+            + np.array([0, 8, 15, 25, 35])[bin_index([0.25, 0.5, 2.0, 10], column("procalcitonina"), "right")]
+        )
+
+        # Factori de risc suplimentari
+        temperature = column("temperatura")
+        additional_score = (
+            np.where(temperature >= 38.5, 8, np.where(temperature <= 36.0, 10, 0))
+            + np.where(column("frecventa_cardiaca") >= 100, 5, 0)
+        )
+
+        is_iaam = hours >= 48
+        score = (
+            time_score + device_score + micro_score + sofa_score * 4
+            + np.where(qsofa_score >= 2, 20, 0) + lab_score + additional_score
+        )
+        score = np.where(is_iaam, score, 0).astype(np.int64)
+
+        level_index = bin_index(self.LEVEL_THRESHOLDS, score, "right")
+        level_codes = np.where(is_iaam, level_index, len(self.LEVEL_NAMES))
+        class_names = list(dict.fromkeys(self.LEVEL_CLASSES))
+        class_codes = np.array([class_names.index(name) for name in self.LEVEL_CLASSES])
+
+        result = {"patient_id": frame["patient_id"]} if "patient_id" in frame else {}
+        result.update({
+            "score": score,
+            "level": pd.Categorical.from_codes(level_codes, categories=self.LEVEL_NAMES + ("NU IAAM",)),
+            "color_class": pd.Categorical.from_codes(class_codes[level_index], categories=class_names),
+            "is_iaam": is_iaam,
+            "sofa_score": sofa_score,
+            "qsofa_score": qsofa_score,
+            "device_score": device_score,
+            "lab_score": lab_score,
+            "time_score": time_score
+        })
+        return pd.DataFrame(result)
+
+    def sensitivity(self, data: PatientData,
+                    interventions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Evaluează toate intervențiile contrafactuale într-un singur lot vectorizat.
+
+        Returnează scorul actual și, pentru fiecare intervenție care schimbă
+        datele, scorul rezultat și diferența, ordonate după impact.
+        """
+        values = vars(data)
+        applicable = applicable_interventions(values, self.DEFAULT_INTERVENTIONS if interventions is None else interventions)
+        columns = counterfactual_columns(values, list(self.field_components), applicable)
+        scores = self.predict_iaam_risk_batch(pd.DataFrame(columns))["score"].to_numpy()
+        current_score, ranked = rank_deltas(applicable, scores, digits=None)
+        return {"current_score": current_score, "interventions": ranked}
+
+def patients_to_frame(patients: List[PatientData]) -> pd.DataFrame:
+    """Convertește o listă de pacienți în DataFrame pentru scorarea în lot"""
+    return pd.DataFrame([vars(patient) for patient in patients])
+
+HOSPITAL_WORDS = ("internare", "internarea", "internarii", "spitalizare", "spitalizarea", "spitalizarii")
+
 class EnhancedMedicalDataExtractor:
     """Extractor îmbunătățit de date medicale"""
     
-    def __init__(self):
-        self.patterns = {
-            # Valori numerice îmbunătățite
-            "leucocite": [
-                r"(?:leucocite|wbc|gb)[\s:]*(\d+(?:\.\d+)?)",
-                r"(\d+(?:\.\d+)?)\s*(?:x\s*)?10\^?3.*(?:leucocite|wbc)",
-                r"leucocite[\s:]*(\d+(?:,\d+)?)",
-                r"wbc[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "crp": [
-                r"crp[\s:]*(\d+(?:\.\d+)?)",
-                r"proteina\s+c\s+reactiva[\s:]*(\d+(?:\.\d+)?)",
-                r"c[\s-]?reactive[\s-]?protein[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "procalcitonina": [
-                r"(?:procalcitonina|pct)[\s:]*(\d+(?:\.\d+)?)",
-                r"procalcitonin[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "temperatura": [
-                r"(?:temperatura|temp|t)[\s:]*(\d+(?:\.\d+)?)\s*°?c?",
-                r"(\d+(?:\.\d+)?)\s*°c",
-                r"febra[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "frecventa_cardiaca": [
-                r"(?:puls|fc|hr|frecventa\s+cardiaca)[\s:]*(\d+)",
-                r"heart\s+rate[\s:]*(\d+)",
-                r"(\d+)\s*bpm"
-            ],
-            "tas": [
-                r"(?:ta|tensiune|pas|systolic)[\s:]*(\d+)(?:/\d+)?",
-                r"(\d+)/\d+\s*mmhg",
-                r"systolic[\s:]*(\d+)"
-            ],
-            "tad": [
-                r"(?:ta|tensiune|pad|diastolic)[\s:]*\d+/(\d+)",
-                r"\d+/(\d+)\s*mmhg",
-                r"diastolic[\s:]*(\d+)"
-            ],
-            "frecventa_respiratorie": [
-                r"(?:fr|resp|frecventa\s+respiratorie)[\s:]*(\d+)",
-                r"respiratory\s+rate[\s:]*(\d+)",
-                r"(\d+)\s*respiratii"
-            ],
-            "glasgow": [
-                r"(?:glasgow|gcs)[\s:]*(\d+)",
-                r"glasgow\s+coma\s+scale[\s:]*(\d+)"
-            ],
-            "creatinina": [
-                r"creatinina[\s:]*(\d+(?:\.\d+)?)",
-                r"creatinine[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "bilirubina": [
-                r"bilirubina[\s:]*(\d+(?:\.\d+)?)",
-                r"bilirubin[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "trombocite": [
-                r"(?:trombocite|plt|platelets)[\s:]*(\d+(?:\.\d+)?)",
-                r"platelet\s+count[\s:]*(\d+(?:\.\d+)?)"
-            ],
-            "ore_spitalizare": [
-                r"(?:internare|spitalizare|hospitalizare)[\s:]*(\d+)\s*(?:ore|hours|h)",
-                r"(\d+)\s*(?:ore|hours|h).*(?:internare|spitalizare)",
-                r"(\d+)\s*zile.*(?:internare|spitalizare)",
-                r"ziua\s*(\d+)",
-                r"de\s*(\d+)\s*zile",
-                r"(\d+)\s*days?.*(?:hospital|admission)",
-                r"length\s*of\s*stay[\s:]*(\d+)\s*(?:days?|zile)",
-                r"los[\s:]*(\d+)\s*(?:days?|zile)",
-                r"internare\s*de\s*(\d+)\s*(?:zile|ore)",
-                r"(\d+)\s*(?:zile|days?)\s*de\s*(?:internare|spitalizare)"
-            ],
-            "pao2_fio2": [
-                r"pao2/fio2[\s:]*(\d+(?:\.\d+)?)",
-                r"p/f\s+ratio[\s:]*(\d+(?:\.\d+)?)"
-            ]
-        }
-        
-        # Bacterii îmbunătățite
-        self.bacteria_patterns = [
-            (r"escherichia\s+coli|e\.?\s*coli", "Escherichia coli"),
-            (r"klebsiella\s+pneumoniae|k\.?\s*pneumoniae", "Klebsiella pneumoniae"),
-            (r"pseudomonas\s+aeruginosa|p\.?\s*aeruginosa", "Pseudomonas aeruginosa"),
-            (r"staphylococcus\s+aureus|s\.?\s*aureus", "Staphylococcus aureus"),
-            (r"acinetobacter\s+baumannii|a\.?\s*baumannii", "Acinetobacter baumannii"),
-            (r"enterococcus\s+faecium|e\.?\s*faecium", "Enterococcus faecium"),
-            (r"candida\s+auris|c\.?\s*auris", "Candida auris"),
-            (r"clostridioides\s+difficile|c\.?\s*difficile|cdiff", "Clostridioides difficile"),
-            (r"enterobacter\s+cloacae", "Enterobacter cloacae"),
-            (r"serratia\s+marcescens", "Serratia marcescens")
-        ]
-        
-        # Rezistențe îmbunătățite
-        self.resistance_patterns = [
-            (r"esbl\+?|extended.spectrum", "ESBL"),
-            (r"mrsa|methicillin.resistant", "MRSA"),
-            (r"vre|vancomycin.resistant", "VRE"),
-            (r"cre|carbapenem.resistant", "CRE"),
-            (r"kpc|klebsiella.pneumoniae.carbapenemase", "KPC"),
-            (r"ndm|new.delhi.metallo", "NDM"),
-            (r"oxa|oxacillinase", "OXA"),
-            (r"vim|verona.integron", "VIM"),
-            (r"imp|imipenemase", "IMP"),
-            (r"xdr|extensively.drug.resistant", "XDR"),
-            (r"pdr|pandrug.resistant", "PDR")
+    # Reguli pentru scannerul într-o singură trecere; prioritatea păstrează ordinea vechilor
+    # pattern-uri ale fiecărui câmp (0 = încercat primul)
+    SCAN_RULES = (
+        # Valori numerice îmbunătățite
+        ScanRule("leucocite", 0, etichete=("leucocite", "wbc", "gb")),
+        ScanRule("leucocite", 1, sufixe=("x 10^3", "10^3"), context=("leucocite", "wbc")),
+        ScanRule("crp", 0, etichete=("crp",)),
+        ScanRule("crp", 1, etichete=("proteina c reactiva",)),
+        ScanRule("crp", 2, etichete=("c reactive protein", "creactive protein")),
+        ScanRule("procalcitonina", 0, etichete=("procalcitonina", "pct")),
+        ScanRule("procalcitonina", 1, etichete=("procalcitonin",)),
+        ScanRule("temperatura", 0, etichete=("temperatura", "temp", "t")),
+        ScanRule("temperatura", 1, sufixe=("°c",)),
+        ScanRule("temperatura", 2, etichete=("febra",)),
+        ScanRule("frecventa_cardiaca", 0, etichete=("puls", "fc", "hr", "frecventa cardiaca")),
+        ScanRule("frecventa_cardiaca", 1, etichete=("heart rate",)),
+        ScanRule("frecventa_cardiaca", 2, sufixe=("bpm",)),
+        ScanRule("tas", 0, etichete=("ta", "tensiune", "pas", "systolic")),
+        ScanRule("tas", 1, sufixe=("mmhg",), forma="sistolica"),
+        ScanRule("tad", 0, etichete=("ta", "tensiune", "pad", "diastolic"), forma="diastolica"),
+        ScanRule("tad", 1, sufixe=("mmhg",), forma="diastolica"),
+        ScanRule("tad", 2, etichete=("diastolic",)),
+        ScanRule("frecventa_respiratorie", 0, etichete=("fr", "resp", "frecventa respiratorie")),
+        ScanRule("frecventa_respiratorie", 1, etichete=("respiratory rate",)),
+        ScanRule("frecventa_respiratorie", 2, sufixe=("respiratii",)),
+        ScanRule("glasgow", 0, etichete=("glasgow", "gcs")),
+        ScanRule("glasgow", 1, etichete=("glasgow coma scale",)),
+        ScanRule("creatinina", 0, etichete=("creatinina",)),
+        ScanRule("creatinina", 1, etichete=("creatinine",)),
+        ScanRule("bilirubina", 0, etichete=("bilirubina",)),
+        ScanRule("bilirubina", 1, etichete=("bilirubin",)),
+        ScanRule("trombocite", 0, etichete=("trombocite", "plt", "platelets")),
+        ScanRule("trombocite", 1, etichete=("platelet count",)),
+        # Ore de spitalizare (valoarea este deja în ore; zilele se convertesc)
+        ScanRule("ore_spitalizare", 0, etichete=("internare", "spitalizare", "hospitalizare"), forma="ore"),
+        ScanRule("ore_spitalizare", 1, context=HOSPITAL_WORDS, forma="ore"),
+        ScanRule("ore_spitalizare", 2, context=HOSPITAL_WORDS, forma="zile"),
+        ScanRule("ore_spitalizare", 3, etichete=("ziua",), factor=24),
+        ScanRule("ore_spitalizare", 4, etichete=("de",), forma="zile"),
+        ScanRule("ore_spitalizare", 5, context=("hospital", "hospitalization", "admission"), forma="zile"),
+        ScanRule("ore_spitalizare", 6, etichete=("length of stay",), forma="zile"),
+        ScanRule("ore_spitalizare", 7, etichete=("los",), forma="zile"),
+        ScanRule("ore_spitalizare", 8, etichete=("internare de",), forma="durata"),
+        ScanRule("ore_spitalizare", 9, sufixe=("de internare", "de spitalizare"), forma="zile"),
+        ScanRule("pao2_fio2", 0, etichete=("pao2/fio2",)),
+        ScanRule("pao2_fio2", 1, etichete=("p/f ratio",)),
+    )
+    
+    # Bacterii îmbunătățite (în ordinea de prioritate)
+    BACTERIA = (
+        (("escherichia coli", "e. coli", "e.coli", "e coli", "ecoli"), "Escherichia coli"),
+        (("klebsiella pneumoniae", "k. pneumoniae", "k.pneumoniae", "k pneumoniae"), "Klebsiella pneumoniae"),
+        (("pseudomonas aeruginosa", "p. aeruginosa", "p.aeruginosa", "p aeruginosa"), "Pseudomonas aeruginosa"),
+        (("staphylococcus aureus", "s. aureus", "s.aureus", "s aureus"), "Staphylococcus aureus"),
+        (("acinetobacter baumannii", "a. baumannii", "a.baumannii", "a baumannii"), "Acinetobacter baumannii"),
+        (("enterococcus faecium", "e. faecium", "e.faecium", "e faecium"), "Enterococcus faecium"),
+        (("candida auris", "c. auris", "c.auris", "c auris"), "Candida auris"),
+        (("clostridioides difficile", "c. difficile", "c.difficile", "c difficile", "cdiff"),
+         "Clostridioides difficile"),
+        (("enterobacter cloacae",), "Enterobacter cloacae"),
+        (("serratia marcescens",), "Serratia marcescens")
+    )
+    
+    # Rezistențe îmbunătățite
+    RESISTANCES = (
+        (("esbl", "extended spectrum"), "ESBL"),
+        (("mrsa", "methicillin resistant"), "MRSA"),
+        (("vre", "vancomycin resistant"), "VRE"),
+        (("cre", "carbapenem resistant"), "CRE"),
+        (("kpc", "klebsiella pneumoniae carbapenemase"), "KPC"),
+        (("ndm", "new delhi metallo"), "NDM"),
+        (("oxa", "oxacillinase"), "OXA"),
+        (("vim", "verona integron"), "VIM"),
+        (("imp", "imipenemase"), "IMP"),
+        (("xdr", "extensively drug resistant"), "XDR"),
+        (("pdr", "pandrug resistant"), "PDR")
+    )
+    
+    # Dispozitive îmbunătățite
+    DEVICE_KEYWORDS = {
+        "cateter_central": [
+            "cateter central", "cvc", "cateter venos central", 
+            "central line", "hickman", "port", "picc"
+        ],
+        "ventilatie_mecanica": [
+            "ventilatie", "intubat", "respirator", "ventilator",
+            "mechanical ventilation", "cpap", "bipap",
+            "intubata", "intubation", "intubated"
+        ],
+        "sonda_urinara": [
+            "sonda urinara", "cateter urinar", "foley",
+            "urinary catheter", "bladder catheter"
+        ],
+        "traheostomie": [
+            "traheostomie", "canula", "tracheostomy",
+            "tracheal tube", "canula traheala"
+        ],
+        "drenaj": [
+            "dren", "drenaj", "drain", "chest tube",
+            "dren toracic", "dren abdominal"
+        ],
+        "peg": [
+            "peg", "gastrostomie", "gastrostomy",
+            "feeding tube", "sonda gastrica"
         ]
-        
-        # Dispozitive îmbunătățite
-        self.device_keywords = {
-            "cateter_central": [
-                "cateter central", "cvc", "cateter venos central", 
-                "central line", "hickman", "port", "picc"
-            ],
-            "ventilatie_mecanica": [
-                "ventilatie", "intubat", "respirator", "ventilator",
-                "mechanical ventilation", "cpap", "bipap"
-            ],
-            "sonda_urinara": [
-                "sonda urinara", "cateter urinar", "foley",
-                "urinary catheter", "bladder catheter"
-            ],
-            "traheostomie": [
-                "traheostomie", "canula", "tracheostomy",
-                "tracheal tube", "canula traheala"
-            ],
-            "drenaj": [
-                "dren", "drenaj", "drain", "chest tube",
-                "dren toracic", "dren abdominal"
-            ],
-            "peg": [
-                "peg", "gastrostomie", "gastrostomy",
-                "feeding tube", "sonda gastrica"
-            ]
-        }
+    }
+    
+    # Compilate o singură dată, la import: scannerul valorilor și automatul tuturor vocabularelor
+    SCANNER = ClinicalScanner(SCAN_RULES)
+    KEYWORDS = KeywordAutomaton({
+        "dispozitiv": {keyword: (device, rank) for device, keywords in DEVICE_KEYWORDS.items()
+                       for rank, keyword in enumerate(keywords)},
+        "bacterie": {phrase: (name, rank) for rank, (phrases, name) in enumerate(BACTERIA) for phrase in phrases},
+        "rezistenta": {phrase: (name, rank) for rank, (phrases, name) in enumerate(RESISTANCES) for phrase in phrases},
+        ANCHOR_KEY: {anchor: None for anchor in HOSPITALIZATION_ANCHORS}
+    })
+    DURATIONS = DurationResolver()
+    
+    # Status clinic (subșiruri) și câmpurile care păstrează toate valorile găsite
+    STATUS_WORDS = (
+        ("hipotensiune", ("hipotensiune", "hipotensiv", "shock", "soc")),
+        ("vasopresoare", ("vasopresoare", "noradrenalina", "dopamina", "vasopressor"))
+    )
+    MULTIPLE_FIELDS = ("rezistente",)
+    
+    def __init__(self):
+        self.scanner = self.SCANNER
+        self.keywords = self.KEYWORDS
+        self.durations = self.DURATIONS
+        self.device_keywords = self.DEVICE_KEYWORDS
     
     def extract_from_text(self, text: str) -> Dict:
-        """Extrage date medicale din text cu algoritm îmbunătățit"""
-        text_lower = text.lower()
-        extracted = {}
-        
-        # Extrage valori numerice
-        for key, patterns in self.patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    try:
-                        value_str = match.group(1).replace(',', '.')
-                        value = float(value_str)
-                        
-                        # Validări și conversii
-                        if key == "ore_spitalizare":
-                            if "zile" in text_lower or "days" in text_lower or "ziua" in text_lower:
-                                value *= 24  # convertește zile în ore
-                            # Validare rezonabilă pentru ore spitalizare
-                            if value > 8760:  # mai mult de 1 an în ore
-                                continue  # probabil eroare
-                            elif value < 1:  # mai puțin de 1 oră
-                                value = max(1, value)  # minimum 1 oră
-                        elif key == "temperatura" and value > 50:
-                            continue  # probabil eroare
-                        elif key == "leucocite" and value > 100:
-                            value = value / 1000  # convertește din /μL în x10³/μL
-                        
-                        extracted[key] = value
-                        break
-                    except (ValueError, IndexError):
-                        continue
-        
-        # Extrage bacterii
-        for pattern, name in self.bacteria_patterns:
-            if re.search(pattern, text_lower):
-                extracted["cultura_pozitiva"] = True
-                extracted["bacterie"] = name
-                break
-        
-        # Extrage rezistențe
-        resistances = []
-        for pattern, name in self.resistance_patterns:
-            if re.search(pattern, text_lower):
-                resistances.append(name)
-        
-        if resistances:
-            extracted["rezistente"] = list(set(resistances))  # elimină duplicatele
-        
-        # Detectează dispozitive cu durata
-        for device, keywords in self.device_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    extracted[device] = True
-                    
-                    # Caută durata în zile
-                    days_patterns = [
-                        rf"{keyword}.*?(\d+)\s*(?:zile|days|d)",
-                        rf"(\d+)\s*(?:zile|days|d).*{keyword}",
-                        rf"{keyword}.*de\s*(\d+)\s*(?:zile|days)",
-                        rf"de\s*(\d+)\s*(?:zile|days).*{keyword}"
-                    ]
-                    
-                    for days_pattern in days_patterns:
-                        days_match = re.search(days_pattern, text_lower)
-                        if days_match:
-                            try:
-                                days = int(days_match.group(1))
-                                extracted[f"{device}_days"] = days
-                                break
-                            except (ValueError, IndexError):
-                                continue
-                    
-                    # Dacă nu găsește zile, încearcă ore
-                    if f"{device}_days" not in extracted:
-                        hours_patterns = [
-                            rf"{keyword}.*?(\d+)\s*(?:ore|hours|h)",
-                            rf"(\d+)\s*(?:ore|hours|h).*{keyword}"
-                        ]
-                        
-                        for hours_pattern in hours_patterns:
-                            hours_match = re.search(hours_pattern, text_lower)
-                            if hours_match:
-                                try:
-                                    hours = int(hours_match.group(1))
-                                    extracted[f"{device}_days"] = max(1, hours // 24)
-                                    break
-                                except (ValueError, IndexError):
-                                    continue
-                    
-                    break
+        """Extrage date medicale din text cu algoritm îmbunătățit (o singură trecere prin text)"""
+        return merge(self._candidates(text.lower()), "specific", self.MULTIPLE_FIELDS)
+    
+    def extract_many(self, texts: Iterable[str], workers: Optional[int] = None, chunk_size: int = 500) -> Iterator[Dict]:
+        """Extracție în lot (procese paralele, câte un extractor per proces), rezultate în ordinea textelor.
         
-        # Detectează status clinic
-        if any(word in text_lower for word in ["hipotensiune", "hipotensiv", "shock", "soc"]):
-            extracted["hipotensiune"] = True
+        Echivalent cu extract_from_text pe fiecare text; vezi note_extraction pentru fișiere JSONL.
+        """
+        from note_extraction import extract_many
+        return extract_many(texts, "enhanced", workers, chunk_size)
+    
+    def extract_stream(self, chunks: Iterable[str], politica: str = "specific") -> Dict:
+        """Extrage date dintr-un document lung primit pe bucăți (linii, pagini), cu memorie constantă.
         
-        if any(word in text_lower for word in ["vasopresoare", "noradrenalina", "dopamina", "vasopressor"]):
-            extracted["vasopresoare"] = True
+        politica: "specific" (ca extract_from_text), "recent" (valoarea cu data cea mai recentă)
+        sau "incredere" (valoarea susținută de cele mai multe mențiuni)
+        """
+        return merge(StreamingExtractor(self._candidates).stream(chunks), politica, self.MULTIPLE_FIELDS)
+    
+    def _candidates(self, text_lower: str) -> List[Candidate]:
+        """Candidații validați ai unui text cu litere mici: valori, bacterii, rezistențe, dispozitive, status"""
+        scan = self.scanner.scan(text_lower)
+        candidates = []
+        
+        # Valori numerice: validări și conversii
+        for candidate in scan.candidati:
+            value = float(candidate.valoare)
+            if candidate.camp == "ore_spitalizare":
+                # Validare rezonabilă pentru ore spitalizare
+                if value > 8760:  # mai mult de 1 an în ore
+                    continue  # probabil eroare
+                elif value < 1:  # mai puțin de 1 oră
+                    value = max(1, value)  # minimum 1 oră
+            elif candidate.camp == "temperatura" and value > 50:
+                continue  # probabil eroare
+            elif candidate.camp == "leucocite" and value > 100:
+                value = value / 1000  # convertește din /μL în x10³/μL
+            candidate.valoare = value
+            candidates.append(candidate)
+        
+        # Cuvinte-cheie (dispozitive, bacterii, rezistențe): o singură parcurgere cu automatul
+        mentions = []
+        for hit in self.keywords.find(text_lower):
+            if hit.categorie == "dispozitiv":
+                device, rank = hit.valoare
+                candidates.append(Candidate(device, True, hit.start, hit.end, rank))
+                mentions.append(Mention(device, hit.start, hit.end))
+            elif hit.categorie == ANCHOR_KEY:
+                mentions.append(Mention(ANCHOR_KEY, hit.start, hit.end))
+            elif hit.categorie == "bacterie":
+                name, rank = hit.valoare
+                candidates.append(Candidate("cultura_pozitiva", True, hit.start, hit.end, rank))
+                candidates.append(Candidate("bacterie", name, hit.start, hit.end, rank))
+            else:
+                name, rank = hit.valoare
+                candidates.append(Candidate("rezistente", name, hit.start, hit.end, rank))
+        
+        # Durata dispozitivelor (perechi mențiune-durată în aceeași propoziție)
+        if len(mentions) > 1 or (mentions and mentions[0].cheie != ANCHOR_KEY):
+            for mention, duration in self.durations.pairs(text_lower, mentions, scan.durate):
+                if mention.cheie != ANCHOR_KEY:
+                    candidates.append(Candidate(f"{mention.cheie}_days", self.durations.days(duration),
+                                                min(mention.start, duration.start), max(mention.end, duration.end)))
+        
+        # Status clinic
+        for camp, words in self.STATUS_WORDS:
+            for word in words:
+                position = text_lower.find(word)
+                if position >= 0:
+                    candidates.append(Candidate(camp, True, position, position + len(word)))
+                    break
         
-        return extracted
+        return candidates
     
     def validate_extracted_data(self, data: Dict) -> Dict:
         """Validează și corectează datele extrase"""
@@ -1063,11 +1260,13 @@ class EnhancedChatInterface:
     
     def __init__(self):
         self.ai = EnhancedOllamaAI()
-        self.predictor = EnhancedIAAMPredictor()
         self.extractor = EnhancedMedicalDataExtractor()
         
         # Initialize session state
         self._init_session_state()
+        
+        # Predictorul persistă între rerulări pentru rescorarea incrementală
+        self.predictor = st.session_state.risk_predictor
     
     def _init_session_state(self):
         """Inițializează session state"""
@@ -1075,12 +1274,23 @@ class EnhancedChatInterface:
             st.session_state.messages = []
         if "patient_data" not in st.session_state:
             st.session_state.patient_data = PatientData()
+        if "changed_fields" not in st.session_state:
+            # câmpurile modificate din chat de la ultima evaluare a riscului
+            st.session_state.changed_fields = set()
         if "chat_history" not in st.session_state:
             st.session_state.chat_history = []
         if "current_patient_id" not in st.session_state:
             st.session_state.current_patient_id = None
         if "ai_status" not in st.session_state:
             st.session_state.ai_status = self.ai.available
+        if "risk_predictor" not in st.session_state:
+            st.session_state.risk_predictor = EnhancedIAAMPredictor(cache=shared_risk_cache())
+        if "risk_index" not in st.session_state:
+            # pacienții evaluați, ordonați după scor, cu contoare pe niveluri
+            st.session_state.risk_index = RiskIndex(EnhancedIAAMPredictor.LEVEL_NAMES + ("NU IAAM",))
+        if "alert_engine" not in st.session_state:
+            st.session_state.alert_engine = AlertEngine(EnhancedIAAMPredictor.LEVEL_THRESHOLDS,
+                                                        EnhancedIAAMPredictor.LEVEL_NAMES)
     
     def get_system_prompt(self) -> str:
         """Prompt sistem îmbunătățit pentru AI medical"""
@@ -1124,15 +1334,8 @@ class EnhancedChatInterface:
         validated_data = self.extractor.validate_extracted_data(extracted_data)
         
         # Actualizează datele pacientului
-        if validated_data:
-            current_data = asdict(st.session_state.patient_data)
-            current_data.update(validated_data)
-            
-            # Recreează obiectul PatientData
-            st.session_state.patient_data = PatientData(**{
-                k: v for k, v in current_data.items() 
-                if k in PatientData.__dataclass_fields__
-            })
+        changes = st.session_state.patient_data.patch(validated_data)
+        st.session_state.changed_fields.update(changes)
         
         # Pregătește context pentru AI
         data_summary = self._format_current_data()
@@ -1235,21 +1438,43 @@ class EnhancedChatInterface:
             st.error("❌ Date insuficiente! Timpul de spitalizare trebuie să fie ≥ 48 ore pentru IAAM.")
             return False
         
-        # Calculează riscul
-        result = self.predictor.predict_iaam_risk(st.session_state.patient_data)
+        # Calculează riscul (doar componentele afectate de câmpurile modificate)
+        result = self.predictor.rescore(st.session_state.patient_data, sorted(st.session_state.changed_fields))
+        st.session_state.changed_fields.clear()
         
         # Afișează rezultatul
         self._display_risk_result(result)
         
         # Salvează în istoric
-        st.session_state.chat_history.append({
+        entry = {
             "timestamp": datetime.now(),
             "data": asdict(st.session_state.patient_data),
             "result": result
-        })
+        }
+        st.session_state.chat_history.append(entry)
+        st.session_state.risk_index.update(result["patient_id"], result["score"], result["level"], entry=entry)
+        
+        # Alertă la traversarea unui prag de risc (cu histerezis și debounce)
+        self.show_due_alerts()
+        alert = st.session_state.alert_engine.observe(result["patient_id"], result["score"], time.time())
+        if alert is not None:
+            self._show_alert(alert)
         
         return True
     
+    def show_due_alerts(self):
+        """Afișează de-escaladările amânate a căror fereastră de debounce a expirat"""
+        for alert in st.session_state.alert_engine.flush(time.time()):
+            self._show_alert(alert)
+    
+    def _show_alert(self, alert):
+        """Afișează o alertă de schimbare a nivelului de risc"""
+        message = f"Nivel risc {alert.nivel_anterior} → {alert.nivel} (scor {alert.scor})"
+        if alert.escaladare:
+            st.error(f"🚨 ALERTĂ IAAM: {message}")
+        else:
+            st.info(f"📉 {message}")
+    
     def _display_risk_result(self, result: Dict):
         """Afișează rezultatul evaluării riscului"""
         level = result["level"]
@@ -1389,6 +1614,15 @@ def create_sidebar():
             if data.procalcitonina != 0.1:
                 st.write(f"• PCT: {data.procalcitonina}")
         
+        # Impactul intervențiilor asupra scorului
+        if data.ore_spitalizare >= 48:
+            sensitivity = st.session_state.risk_predictor.sensitivity(data)
+            improvements = [item for item in sensitivity["interventions"] if item["delta"] < 0]
+            if improvements:
+                st.markdown("**Impact intervenții:**")
+                for item in improvements[:5]:
+                    st.write(f"• {item['interventie']}: {item['delta']:+d} puncte")
+        
         st.divider()
         
         # Acțiuni rapide
@@ -1396,6 +1630,7 @@ def create_sidebar():
         
         if st.button("🆕 Pacient Nou", use_container_width=True):
             st.session_state.patient_data = PatientData()
+            st.session_state.changed_fields.clear()
             st.session_state.messages = []
             st.rerun()
         
@@ -1406,14 +1641,21 @@ def create_sidebar():
             export_patient_data()
 
 def show_patient_history():
-    """Afișează istoricul pacienților"""
-    if not st.session_state.chat_history:
+    """Afișează pacienții evaluați, începând cu cei cu risc maxim"""
+    index = st.session_state.risk_index
+    if not len(index):
         st.info("Nu există istoric de pacienți.")
         return
     
     st.markdown("### 📋 Istoric Pacienți")
     
-    for i, entry in enumerate(reversed(st.session_state.chat_history)):
+    counts = index.level_counts()
+    columns = st.columns(len(counts))
+    for column, (level, count) in zip(columns, counts.items()):
+        column.metric(level, count)
+    
+    for indexed in index.top():
+        entry = indexed["entry"]
         with st.expander(f"Pacient {entry['result']['patient_id']} - {entry['timestamp'].strftime('%d.%m.%Y %H:%M')}"):
             col1, col2 = st.columns(2)
             
@@ -1459,6 +1701,8 @@ def main():
     
     # Inițializează interfața chat
     chat = EnhancedChatInterface()
+    # de-escaladările amânate se emit la următoarea rerulare, fără o nouă evaluare
+    chat.show_due_alerts()
     
     # Creează sidebar
     create_sidebar()
@@ -1555,6 +1799,7 @@ def main():
         if clear_button:
             st.session_state.messages = []
             st.session_state.patient_data = PatientData()
+            st.session_state.changed_fields.clear()
             st.rerun()
     
     with col2:
@@ -16,12 +16,24 @@ except ImportError:
 
 import logging
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import MISSING, dataclass, asdict, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 import requests
 from pathlib import Path
 import base64
 from io import BytesIO
+from risk_cache import RiskCache, canonical_key, shared_risk_cache
+from risk_trajectory import TimelineEvent, project_risk
+from risk_sensitivity import applicable_interventions, counterfactual_columns, rank_deltas
+from risk_uncertainty import UncertaintyModel
+from risk_calibration import ProbabilityCalibration, load_calibration
+from risk_index import RiskIndex
+from recommendation_rules import RecommendationEngine, RecommendationRule
+from keyword_automaton import KeywordAutomaton
+from medical_patterns import PatternRegistry
+from clinical_scanner import Candidate
+from streaming_extraction import StreamingExtractor, merge
+from incremental_extraction import IncrementalExtractor
 
 try:
     from PIL import Image
@@ -142,9 +154,37 @@ class PatientData:
     sofa_score: int = 0
     apache_score: int = 0
 
+@dataclass
+class RiskComponent:
+    """Componentă numerică a scorului de risc (puncte, valoare măsurată, unitate)"""
+    nume: str
+    puncte: float
+    valoare: Any
+    unitate: str = ""
+    afisare: str = ""
+
 class AdvancedMedicalOCR:
     """Sistem OCR avansat pentru documente medicale"""
     
+    # Corecții pentru termeni medicali comuni (compilate o singură dată la import)
+    # Corecțiile termenilor medicali: un singur automat, o singură trecere prin text.
+    # Denumirile complete se păstrează (altfel "pseudomonas aeruginosa" ar deveni "... aeruginosa aeruginosa")
+    CORRECTIONS = KeywordAutomaton({"corectie": {
+        "pseudomonas": "Pseudomonas aeruginosa",
+        "pseudomonas aeruginosa": "Pseudomonas aeruginosa",
+        "e.coli": "Escherichia coli",
+        "e. coli": "Escherichia coli",
+        "e coli": "Escherichia coli",
+        "ecoli": "Escherichia coli",
+        "klebsiella": "Klebsiella pneumoniae",
+        "klebsiella pneumoniae": "Klebsiella pneumoniae",
+        "staph": "Staphylococcus aureus",
+        "staph aureus": "Staphylococcus aureus",
+        "mrsa": "MRSA",
+        "vre": "VRE",
+        "esbl": "ESBL"
+    }})
+    
     def __init__(self):
         self.medical_terms = self._load_medical_dictionary()
     
@@ -202,27 +242,101 @@ class AdvancedMedicalOCR:
     def _post_process_medical_text(self, text: str) -> str:
         """Post-procesează textul pentru termeni medicali"""
         # Corectează termeni medicali comuni
-        corrections = {
-            r'\bpseudomonas\b': 'Pseudomonas aeruginosa',
-            r'\be\.?\s*coli\b': 'Escherichia coli',
-            r'\bklebsiella\b': 'Klebsiella pneumoniae',
-            r'\bstaph\b': 'Staphylococcus aureus',
-            r'\bmrsa\b': 'MRSA',
-            r'\bvre\b': 'VRE',
-            r'\besbl\b': 'ESBL'
-        }
-        
-        for pattern, replacement in corrections.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        return text
+        return self.CORRECTIONS.replace(text, "corectie")
 
 class UltraAdvancedNLP:
     """Sistem NLP ultra-avansat pentru procesare medicală"""
     
+    # Pattern-uri avansate pentru extracția datelor, compilate o singură dată la import.
+    # Fiecare pattern are câmpul țintă explicit (nu se mai deduce din textul pattern-ului).
+    HOSPITALIZATION_PATTERNS = tuple(PatternRegistry.compile(pattern) for pattern in (
+        r"(?:internat|spitalizat|hospitalizat)(?:\s+de)?\s+(\d+)\s+(?:ore|hours?)",
+        r"(?:internat|spitalizat|hospitalizat)(?:\s+de)?\s+(\d+)\s+(?:zile|days?)",
+        r"(\d+)\s+(?:ore|hours?)\s+(?:de\s+)?(?:internare|spitalizare)",
+        r"(\d+)\s+(?:zile|days?)\s+(?:de\s+)?(?:internare|spitalizare)",
+        r"ziua\s+(\d+)\s+(?:de\s+)?(?:internare|spitalizare)",
+        r"day\s+(\d+)\s+of\s+(?:hospitalization|admission)",
+        r"(\d+)\s+(?:de\s+)?(?:zile|ore)",  # Pattern simplu pentru "8 zile" sau "8 ore"
+    ))
+    # Unitatea se citește din textul găsit ("8 zile" → 192 ore, "8 ore" → 8 ore)
+    DAY_UNIT = PatternRegistry.compile(r"\b(?:zile|days?|ziua)\b")
+    
+    BACTERIA_PATTERNS = PatternRegistry.compile_pairs([
+        (r"(?:pseudomonas\s+aeruginosa|p\.?\s*aeruginosa|pseudomonas)", "Pseudomonas aeruginosa"),
+        (r"(?:escherichia\s+coli|e\.?\s*coli|ecoli)", "Escherichia coli"),
+        (r"(?:klebsiella\s+pneumoniae|k\.?\s*pneumoniae|klebsiella)", "Klebsiella pneumoniae"),
+        (r"(?:staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus|mrsa|mssa)", "Staphylococcus aureus"),
+        (r"(?:acinetobacter\s+baumannii|a\.?\s*baumannii|acinetobacter)", "Acinetobacter baumannii"),
+        (r"(?:enterococcus\s+faecium|e\.?\s*faecium|enterococcus|vre)", "Enterococcus faecium"),
+        (r"(?:candida\s+auris|c\.?\s*auris|candida)", "Candida auris"),
+        (r"(?:clostridioides\s+difficile|c\.?\s*difficile|cdiff)", "Clostridioides difficile")
+    ])
+    
+    # (pattern, (câmp, conversie))
+    LAB_VALUE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"(?:crp|proteina\s+c\s+reactiva)[:=\s]*(\d+(?:\.\d+)?)", ("crp", float)),
+        (r"(?:pct|procalcitonina)[:=\s]*(\d+(?:\.\d+)?)", ("pct", float)),
+        (r"(?:leucocite|wbc)[:=\s]*(\d+(?:\.\d+)?)", ("leucocite", int)),
+        (r"(?:hemoglobina|hb)[:=\s]*(\d+(?:\.\d+)?)", ("hemoglobina", float)),
+        (r"(?:trombocite|plt)[:=\s]*(\d+(?:\.\d+)?)", ("trombocite", int)),
+        (r"(?:creatinina)[:=\s]*(\d+(?:\.\d+)?)", ("creatinina", float)),
+        (r"(?:glicemie|glucoza)[:=\s]*(\d+(?:\.\d+)?)", ("glicemie", float)),
+        (r"(?:alt|alanin\s+aminotransferaza)[:=\s]*(\d+(?:\.\d+)?)", ("alt", float)),
+        (r"(?:ast|aspartat\s+aminotransferaza)[:=\s]*(\d+(?:\.\d+)?)", ("ast", float)),
+        (r"(?:uree)[:=\s]*(\d+(?:\.\d+)?)", ("uree", float)),
+        (r"(?:sodiu|na\+)[:=\s]*(\d+(?:\.\d+)?)", ("sodiu", float)),
+        (r"(?:potasiu|k\+)[:=\s]*(\d+(?:\.\d+)?)", ("potasiu", float)),
+        (r"(?:clor|cl\-)[:=\s]*(\d+(?:\.\d+)?)", ("clor", float)),
+        (r"(?:bilirubina\s+totala)[:=\s]*(\d+(?:\.\d+)?)", ("bilirubina_totala", float)),
+        (r"(?:bilirubina\s+directa)[:=\s]*(\d+(?:\.\d+)?)", ("bilirubina_directa", float)),
+        (r"(?:albumina)[:=\s]*(\d+(?:\.\d+)?)", ("albumina", float)),
+        (r"(?:pt|timp\s+de\s+protrombina)[:=\s]*(\d+(?:\.\d+)?)", ("pt", float)),
+        (r"(?:ptt|timp\s+de\s+tromboplastina\s+partiala)[:=\s]*(\d+(?:\.\d+)?)", ("ptt", float)),
+        (r"(?:inr)[:=\s]*(\d+(?:\.\d+)?)", ("inr", float)),
+        (r"(?:ph)[:=\s]*(\d+(?:\.\d+)?)", ("ph", float)),
+        (r"(?:pco2)[:=\s]*(\d+(?:\.\d+)?)", ("pco2", float)),
+        (r"(?:po2)[:=\s]*(\d+(?:\.\d+)?)", ("po2", float)),
+        (r"(?:hco3)[:=\s]*(\d+(?:\.\d+)?)", ("hco3", float)),
+        (r"(?:lactate)[:=\s]*(\d+(?:\.\d+)?)", ("lactate", float)),
+        (r"(?:vsh)[:=\s]*(\d+(?:\.\d+)?)", ("vsh", int)),
+        (r"(?:neutrofile)[:=\s]*(\d+(?:\.\d+)?)", ("neutrofile", float)),
+        (r"(?:limfocite)[:=\s]*(\d+(?:\.\d+)?)", ("limfocite", float)),
+        (r"(?:hematocrit)[:=\s]*(\d+(?:\.\d+)?)", ("hematocrit", float)),
+    ])
+    
+    DEVICE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"cateter\s+(?:venos\s+)?central", "cateter_venos_central"),
+        (r"cateter\s+urinar", "cateter_urinar"),
+        (r"ventilatie\s+mecanica|ventilator", "ventilatie_mecanica"),
+        (r"sonda\s+nazogastrica", "sonda_nazogastrica"),
+        (r"drenaj\s+chirurgical", "drenaj_chirurgical")
+    ])
+    
+    # (pattern, (câmp, conversie)); valorile care nu se pot converti se ignoră
+    URINE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"(?:proteinurie)[:=\s]*([a-z]+)", ("proteinurie", str)),
+        (r"(?:hematurie)[:=\s]*([a-z]+)", ("hematurie", str)),
+        (r"(?:nitriti)[:=\s]*(pozitiv|negativ)", ("nitriti", lambda value: value == "pozitiv")),
+        (r"(?:leucocit\s+esteraza)[:=\s]*([a-z]+)", ("leucocit_esteraza", str)),
+        (r"(?:bacterii\s+urina)[:=\s]*(\d+)", ("bacterii_urina", int)),
+        (r"(?:cultura\s+urina)[:=\s]*(pozitiva|negativa)",
+         ("cultura_urina_pozitiva", lambda value: value == "pozitiva")),
+        (r"(?:densitate\s+urina)[:=\s]*(\d+(?:\.\d+)?)", ("densitate_urina", float)),
+        (r"(?:ph\s+urina)[:=\s]*(\d+(?:\.\d+)?)", ("ph_urina", float)),
+        (r"(?:glucoza\s+urina)[:=\s]*([a-z]+)", ("glucoza_urina", str)),
+        (r"(?:cetone\s+urina)[:=\s]*([a-z]+)", ("cetone_urina", str)),
+        (r"(?:bilirubina\s+urina)[:=\s]*([a-z]+)", ("bilirubina_urina", str)),
+        (r"(?:urobilinogen\s+urina)[:=\s]*([a-z]+)", ("urobilinogen_urina", str))
+    ])
+    
+    CLINICAL_SCORE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"(?:glasgow\s+coma\s+scale)[:=\s]*(\d+)", "glasgow_coma_scale"),
+        (r"(?:sofa\s+score)[:=\s]*(\d+)", "sofa_score"),
+        (r"(?:apache\s+score)[:=\s]*(\d+)", "apache_score")
+    ])
+    
     def __init__(self):
         self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.medical_patterns = self._create_advanced_patterns()
         self._init_nltk()
     
     def _init_nltk(self):
@@ -234,256 +348,127 @@ class UltraAdvancedNLP:
         except:
             pass
     
-    def _create_advanced_patterns(self) -> Dict[str, List[str]]:
-        """Creează pattern-uri avansate pentru extracția datelor"""
-        return {
-            "hospitalization": [
-                r"(?:internat|spitalizat|hospitalizat)(?:\s+de)?\s+(\d+)\s+(?:ore|hours?)",
-                r"(?:internat|spitalizat|hospitalizat)(?:\s+de)?\s+(\d+)\s+(?:zile|days?)",
-                r"(\d+)\s+(?:ore|hours?)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"(\d+)\s+(?:zile|days?)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"ziua\s+(\d+)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"day\s+(\d+)\s+of\s+(?:hospitalization|admission)",
-                r"(\d+)\s+(?:de\s+)?(?:zile|ore)",  # Pattern simplu pentru "8 zile" sau "8 ore"
-            ],
-            "bacteria": [
-                r"(?:pseudomonas\s+aeruginosa|p\.?\s*aeruginosa|pseudomonas)",
-                r"(?:escherichia\s+coli|e\.?\s*coli|ecoli)",
-                r"(?:klebsiella\s+pneumoniae|k\.?\s*pneumoniae|klebsiella)",
-                r"(?:staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus|mrsa|mssa)",
-                r"(?:acinetobacter\s+baumannii|a\.?\s*baumannii|acinetobacter)",
-                r"(?:enterococcus\s+faecium|e\.?\s*faecium|enterococcus|vre)",
-                r"(?:candida\s+auris|c\.?\s*auris|candida)",
-                r"(?:clostridioides\s+difficile|c\.?\s*difficile|cdiff)"
-            ],
-            "lab_values": [
-                r"(?:crp|proteina\s+c\s+reactiva)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:pct|procalcitonina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:leucocite|wbc)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:hemoglobina|hb)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:trombocite|plt)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:creatinina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:glicemie|glucoza)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:alt|alanin\s+aminotransferaza)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:ast|aspartat\s+aminotransferaza)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:uree)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:sodiu|na\+)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:potasiu|k\+)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:clor|cl\-)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:bilirubina\s+totala)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:bilirubina\s+directa)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:albumina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:pt|timp\s+de\s+protrombina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:ptt|timp\s+de\s+tromboplastina\s+partiala)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:inr)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:ph)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:pco2)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:po2)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:hco3)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:lactate)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:vsh)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:neutrofile)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:limfocite)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:hematocrit)[:=\s]*(\d+(?:\.\d+)?)",
-            ],
-            "devices": [
-                r"cateter\s+(?:venos\s+)?central",
-                r"cateter\s+urinar",
-                r"ventilatie\s+mecanica|ventilator",
-                r"sonda\s+nazogastrica",
-                r"drenaj\s+chirurgical"
-            ],
-            "urine_analysis": [
-                r"(?:proteinurie)[:=\s]*([a-z]+)",
-                r"(?:hematurie)[:=\s]*([a-z]+)",
-                r"(?:nitriti)[:=\s]*(pozitiv|negativ)",
-                r"(?:leucocit\s+esteraza)[:=\s]*([a-z]+)",
-                r"(?:bacterii\s+urina)[:=\s]*(\d+)",
-                r"(?:cultura\s+urina)[:=\s]*(pozitiva|negativa)",
-                r"(?:densitate\s+urina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:ph\s+urina)[:=\s]*(\d+(?:\.\d+)?)",
-                r"(?:glucoza\s+urina)[:=\s]*([a-z]+)",
-                r"(?:cetone\s+urina)[:=\s]*([a-z]+)",
-                r"(?:bilirubina\s+urina)[:=\s]*([a-z]+)",
-                r"(?:urobilinogen\s+urina)[:=\s]*([a-z]+)"
-            ],
-            "clinical_scores": [
-                r"(?:glasgow\s+coma\s+scale)[:=\s]*(\d+)",
-                r"(?:sofa\s+score)[:=\s]*(\d+)",
-                r"(?:apache\s+score)[:=\s]*(\d+)"
-            ]
-        }
-    
     def extract_comprehensive_data(self, text: str) -> Dict[str, Any]:
         """Extrage date comprehensive din text folosind NLP avansat"""
         text_lower = text.lower()
         extracted_data = {}
         
         # Extracție spitalizare cu pattern-uri multiple
-        for pattern in self.medical_patterns["hospitalization"]:
-            match = re.search(pattern, text_lower)
+        for pattern in self.HOSPITALIZATION_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 value = int(match.group(1))
                 # Detectează dacă sunt ore sau zile
-                if any(word in pattern for word in ["zile", "days"]):
+                if self.DAY_UNIT.search(match.group(0)):
                     extracted_data["ore_spitalizare"] = value * 24
                 else:
                     extracted_data["ore_spitalizare"] = value
                 break
         
         # Extracție bacterii
-        for pattern in self.medical_patterns["bacteria"]:
-            if re.search(pattern, text_lower):
-                bacteria_map = {
-                    "pseudomonas": "Pseudomonas aeruginosa",
-                    "escherichia": "Escherichia coli",
-                    "klebsiella": "Klebsiella pneumoniae",
-                    "staphylococcus": "Staphylococcus aureus",
-                    "acinetobacter": "Acinetobacter baumannii",
-                    "enterococcus": "Enterococcus faecium",
-                    "candida": "Candida auris",
-                    "clostridioides": "Clostridioides difficile"
-                }
-                for key, value in bacteria_map.items():
-                    if key in pattern:
-                        extracted_data["bacterie"] = value
-                        extracted_data["cultura_pozitiva"] = True
-                        break
+        for pattern, bacterie in self.BACTERIA_PATTERNS:
+            if pattern.search(text_lower):
+                extracted_data["bacterie"] = bacterie
+                extracted_data["cultura_pozitiva"] = True
                 break
         
         # Extracție valori laborator
-        for pattern in self.medical_patterns["lab_values"]:
-            match = re.search(pattern, text_lower)
+        for pattern, (camp, conversie) in self.LAB_VALUE_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 try:
                     value = float(match.group(1))
                 except ValueError:
                     continue  # Skip if the value cannot be converted to float
-                
-                if "crp" in pattern:
-                    extracted_data["crp"] = value
-                elif "pct" in pattern:
-                    extracted_data["pct"] = value
-                elif "leucocite" in pattern:
-                    extracted_data["leucocite"] = int(value)
-                elif "hemoglobina" in pattern:
-                    extracted_data["hemoglobina"] = value
-                elif "trombocite" in pattern:
-                    extracted_data["trombocite"] = int(value)
-                elif "creatinina" in pattern:
-                    extracted_data["creatinina"] = value
-                elif "glicemie" in pattern:
-                    extracted_data["glicemie"] = value
-                elif "alt" in pattern:
-                    extracted_data["alt"] = value
-                elif "ast" in pattern:
-                    extracted_data["ast"] = value
-                elif "uree" in pattern:
-                    extracted_data["uree"] = value
-                elif "sodiu" in pattern:
-                    extracted_data["sodiu"] = value
-                elif "potasiu" in pattern:
-                    extracted_data["potasiu"] = value
-                elif "clor" in pattern:
-                    extracted_data["clor"] = value
-                elif "bilirubina totala" in pattern:
-                    extracted_data["bilirubina_totala"] = value
-                elif "bilirubina directa" in pattern:
-                    extracted_data["bilirubina_directa"] = value
-                elif "albumina" in pattern:
-                    extracted_data["albumina"] = value
-                elif "pt" in pattern:
-                    extracted_data["pt"] = value
-                elif "ptt" in pattern:
-                    extracted_data["ptt"] = value
-                elif "inr" in pattern:
-                    extracted_data["inr"] = value
-                elif "ph" in pattern:
-                    extracted_data["ph"] = value
-                elif "pco2" in pattern:
-                    extracted_data["pco2"] = value
-                elif "po2" in pattern:
-                    extracted_data["po2"] = value
-                elif "hco3" in pattern:
-                    extracted_data["hco3"] = value
-                elif "lactate" in pattern:
-                    extracted_data["lactate"] = value
-                elif "vsh" in pattern:
-                    extracted_data["vsh"] = int(value)
-                elif "neutrofile" in pattern:
-                    extracted_data["neutrofile"] = value
-                elif "hematocrit" in pattern:
-                    extracted_data["hematocrit"] = value
-                elif "limfocite" in pattern:
-                    extracted_data["limfocite"] = value
+                extracted_data[camp] = conversie(value)
         
         # Extracție dispozitive
-        for pattern in self.medical_patterns["devices"]:
-            if re.search(pattern, text_lower):
-                if "central" in pattern:
-                    extracted_data["cateter_venos_central"] = True
-                elif "urinar" in pattern:
-                    extracted_data["cateter_urinar"] = True
-                elif "ventilatie" in pattern:
-                    extracted_data["ventilatie_mecanica"] = True
-                elif "sonda" in pattern:
-                    extracted_data["sonda_nazogastrica"] = True
-                elif "drenaj" in pattern:
-                    extracted_data["drenaj_chirurgical"] = True
+        for pattern, dispozitiv in self.DEVICE_PATTERNS:
+            if pattern.search(text_lower):
+                extracted_data[dispozitiv] = True
         
         # Extracție analize urinare
-        for pattern in self.medical_patterns["urine_analysis"]:
-            match = re.search(pattern, text_lower)
+        for pattern, (camp, conversie) in self.URINE_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
-                value = match.group(1)
-                if "proteinurie" in pattern:
-                    extracted_data["proteinurie"] = value
-                elif "hematurie" in pattern:
-                    extracted_data["hematurie"] = value
-                elif "nitriti" in pattern:
-                    extracted_data["nitriti"] = value == "pozitiv"
-                elif "leucocit esteraza" in pattern:
-                    extracted_data["leucocit_esteraza"] = value
-                elif "bacterii urina" in pattern:
-                    extracted_data["bacterii_urina"] = int(value)
-                elif "cultura urina" in pattern:
-                    extracted_data["cultura_urina_pozitiva"] = value == "pozitiva"
-                elif "densitate urina" in pattern:
-                    try:
-                        extracted_data["densitate_urina"] = float(value)
-                    except ValueError:
-                        pass
-                elif "ph urina" in pattern:
-                    try:
-                        extracted_data["ph_urina"] = float(value)
-                    except ValueError:
-                        pass
-                elif "glucoza urina" in pattern:
-                    extracted_data["glucoza_urina"] = value
-                elif "cetone urina" in pattern:
-                    extracted_data["cetone_urina"] = value
-                elif "bilirubina urina" in pattern:
-                    extracted_data["bilirubina_urina"] = value
-                elif "urobilinogen urina" in pattern:
-                    extracted_data["urobilinogen_urina"] = value
+                try:
+                    extracted_data[camp] = conversie(match.group(1))
+                except ValueError:
+                    pass
         
         # Extracție scoruri clinice
-        for pattern in self.medical_patterns["clinical_scores"]:
-            match = re.search(pattern, text_lower)
+        for pattern, camp in self.CLINICAL_SCORE_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 try:
-                    value = int(match.group(1))
-                    if "glasgow coma scale" in pattern:
-                        extracted_data["glasgow_coma_scale"] = value
-                    elif "sofa score" in pattern:
-                        extracted_data["sofa_score"] = value
-                    elif "apache score" in pattern:
-                        extracted_data["apache_score"] = value
+                    extracted_data[camp] = int(match.group(1))
                 except ValueError:
                     pass
         
         return extracted_data
     
+    def extract_stream(self, chunks: Iterable[str], politica: str = "recent") -> Dict[str, Any]:
+        """Extrage date dintr-un document lung (pagini OCR, linii), cu memorie constantă.
+        
+        Implicit se păstrează valoarea cu data cea mai recentă (altfel ultima din document);
+        "specific" dă același rezultat ca extract_comprehensive_data pe textul întreg.
+        """
+        return merge(StreamingExtractor(self._candidates).stream(chunks), politica)
+    
+    def incremental(self) -> IncrementalExtractor:
+        """Extractor cu stare pentru un text editat repetat: rescanează doar regiunea modificată.
+        
+        update(text) dă același rezultat ca extract_comprehensive_data(text); sources() dă pozițiile valorilor.
+        """
+        return IncrementalExtractor(self._candidates)
+    
+    def _candidates(self, text_lower: str) -> List[Candidate]:
+        """Toate potrivirile tabelelor, ca și candidați cu poziții (prioritatea = ordinea pattern-ului).
+        
+        Politica "specific" pe acești candidați dă exact rezultatul lui extract_comprehensive_data.
+        """
+        candidates = []
+        
+        # Extracție spitalizare cu pattern-uri multiple
+        for prioritate, pattern in enumerate(self.HOSPITALIZATION_PATTERNS):
+            for match in pattern.finditer(text_lower):
+                value = int(match.group(1))
+                # Detectează dacă sunt ore sau zile
+                if self.DAY_UNIT.search(match.group(0)):
+                    value *= 24
+                candidates.append(Candidate("ore_spitalizare", value, match.start(), match.end(), prioritate))
+        
+        # Extracție bacterii
+        for prioritate, (pattern, bacterie) in enumerate(self.BACTERIA_PATTERNS):
+            for match in pattern.finditer(text_lower):
+                candidates.append(Candidate("bacterie", bacterie, match.start(), match.end(), prioritate))
+                candidates.append(Candidate("cultura_pozitiva", True, match.start(), match.end(), prioritate))
+        
+        # Extracție valori laborator
+        for pattern, (camp, conversie) in self.LAB_VALUE_PATTERNS:
+            for match in pattern.finditer(text_lower):
+                candidates.append(Candidate(camp, conversie(float(match.group(1))), match.start(), match.end()))
+        
+        # Extracție dispozitive
+        for pattern, dispozitiv in self.DEVICE_PATTERNS:
+            for match in pattern.finditer(text_lower):
+                candidates.append(Candidate(dispozitiv, True, match.start(), match.end()))
+        
+        # Extracție analize urinare
+        for pattern, (camp, conversie) in self.URINE_PATTERNS:
+            for match in pattern.finditer(text_lower):
+                try:
+                    candidates.append(Candidate(camp, conversie(match.group(1)), match.start(), match.end()))
+                except ValueError:
+                    pass
+        
+        # Extracție scoruri clinice
+        for pattern, camp in self.CLINICAL_SCORE_PATTERNS:
+            for match in pattern.finditer(text_lower):
+                candidates.append(Candidate(camp, int(match.group(1)), match.start(), match.end()))
+        
+        return candidates
+    
     def semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculează similaritatea semantică între două texte"""
         try:
@@ -497,8 +482,135 @@ class UltraAdvancedNLP:
 class UltraAdvancedIAAMCalculator:
     """Calculator ultra-avansat pentru riscul IAAM cu algoritmi de machine learning"""
     
-    def __init__(self):
+    SCORING_PROFILE = "ultra-2.0"
+    
+    # Praguri și niveluri de risc (aceleași ca în calculate_risk)
+    LEVEL_THRESHOLDS = (25, 50, 80, 120)
+    LEVEL_NAMES = ("SCĂZUT", "MODERAT", "RIDICAT", "FOARTE RIDICAT", "CRITIC")
+    
+    PATHOGEN_SCORES = {
+        "Pseudomonas aeruginosa": 28,
+        "Acinetobacter baumannii": 30,
+        "Klebsiella pneumoniae": 22,
+        "Escherichia coli": 18,
+        "Staphylococcus aureus": 24,
+        "Enterococcus faecium": 20,
+        "Candida auris": 35,
+        "Clostridioides difficile": 40
+    }
+    
+    # Dispozitiv -> câmpul cu numărul de zile de la inserție
+    DEVICE_DAY_FIELDS = {
+        "cateter_venos_central": "zile_cateter_venos",
+        "cateter_urinar": "zile_cateter_urinar",
+        "ventilatie_mecanica": "zile_ventilatie"
+    }
+    
+    # Câmpurile PatientData citite de calculate_risk_batch
+    BATCH_FIELDS = (
+        "ore_spitalizare", "cateter_venos_central", "zile_cateter_venos", "cateter_urinar",
+        "zile_cateter_urinar", "ventilatie_mecanica", "zile_ventilatie", "cultura_pozitiva",
+        "bacterie", "rezistente", "crp", "pct", "leucocite", "creatinina", "albumina",
+        "hemoglobina", "sofa_score", "apache_score"
+    )
+    
+    # Intervenții contrafactuale implicite: nume -> câmpurile modificate
+    DEFAULT_INTERVENTIONS = {
+        "Îndepărtare CVC": {"cateter_venos_central": False, "zile_cateter_venos": 0},
+        "Îndepărtare sondă urinară": {"cateter_urinar": False, "zile_cateter_urinar": 0},
+        "Detubare (fără ventilație)": {"ventilatie_mecanica": False, "zile_ventilatie": 0},
+        "Normalizare PCT": {"pct": 0.1},
+        "Normalizare CRP": {"crp": 5.0},
+        "Normalizare leucocite": {"leucocite": 8000}
+    }
+    
+    # Recomandările pentru pacienții sub 48h (nu se evaluează IAAM)
+    NON_IAAM_RECOMMENDATIONS = ("Monitorizare standard", "Respectarea măsurilor de igienă")
+    
+    # Reguli declarative pentru recomandări (ordinea textelor = ordinea regulilor)
+    RECOMMENDATION_RULES = (
+        # Recomandări de bază universale
+        RecommendationRule((
+            "🧼 Igienă strictă a mâinilor cu soluție hidroalcoolică înainte și după contactul cu pacientul",
+            "🦠 Implementarea precauțiilor de contact și izolare conform protocoalelor instituționale",
+            "📊 Monitorizare zilnică a parametrilor vitali și a stării clinice generale"
+        )),
+        # Recomandări specifice nivelului de risc
+        RecommendationRule((
+            "🔬 Monitorizare microbiologică intensivă cu culturi de supraveghere săptămânale",
+            "💊 Evaluare pentru terapie antimicrobiană profilactică sau empirică țintită",
+            "👥 Consultare urgentă specialist în boli infecțioase și epidemiologie",
+            "📈 Implementarea unui plan de management multidisciplinar personalizat"
+        ), ((("nivel_risc", "in", ("RIDICAT", "FOARTE RIDICAT", "CRITIC")),),)),
+        RecommendationRule((
+            "🏥 Izolare în cameră separată cu presiune negativă și filtrare HEPA",
+            "⚡ Alertă imediată a echipei de control al infecțiilor nosocomiale",
+            "📊 Raportare urgentă către comisia de infecții nosocomiale și conducerea medicală",
+            "🔄 Reevaluare zilnică a strategiei terapeutice și de prevenție"
+        ), ((("nivel_risc", "in", ("FOARTE RIDICAT", "CRITIC")),),)),
+        # Recomandări specifice dispozitivelor invazive
+        RecommendationRule((
+            "🩸 Evaluare zilnică a necesității menținerii cateterului venos central",
+            "🧽 Dezinfecție cu clorhexidină 2% la fiecare manipulare a cateterului",
+            "🔄 Schimbarea pansamentului transparent la 7 zile sau când este necesar"
+        ), ((("cateter_venos_central", "true", None),),)),
+        RecommendationRule((
+            "🚿 Evaluare zilnică a necesității menținerii cateterului urinar",
+            "💧 Menținerea strictă a sistemului de drenaj închis și steril",
+            "🧼 Igienă perineală zilnică cu soluții antiseptice blânde"
+        ), ((("cateter_urinar", "true", None),),)),
+        RecommendationRule((
+            "🫁 Implementarea protocolului de sevraj ventilator accelerat și sigur",
+            "🦷 Igienă orală cu clorhexidină 0.12% la fiecare 12 ore",
+            "📐 Menținerea capului la 30-45° pentru prevenirea pneumoniei asociate ventilatorului"
+        ), ((("ventilatie_mecanica", "true", None),),)),
+        # Recomandări specifice microorganismelor (prima regulă îndeplinită din grup)
+        RecommendationRule((
+            "💉 Considerare terapie combinată anti-Pseudomonas (beta-lactamice + aminoglicozide/fluorochinolone)",
+            "🔬 Testare zilnică a sensibilității pentru optimizarea terapiei antimicrobiene"
+        ), ((("bacterie", "contine", "Pseudomonas"),),), grup="microorganism"),
+        RecommendationRule((
+            "🔬 Testare urgentă a sensibilității la colistin, tigecyclină și ampicilină-sulbactam",
+            "💊 Considerare terapie combinată pentru Acinetobacter multidrog-rezistent"
+        ), ((("bacterie", "contine", "Acinetobacter"),),), grup="microorganism"),
+        RecommendationRule((
+            "💊 Inițierea terapiei cu vancomicină, linezolid sau daptomicină",
+            "📊 Monitorizare zilnică a nivelurilor serice de vancomicină"
+        ), ((("bacterie", "true", None),),
+            (("rezistente", "contine", "MRSA"), ("bacterie", "contine", "Staphylococcus"))), grup="microorganism"),
+        # Recomandări pentru markeri inflamatori
+        RecommendationRule((
+            "🔥 Monitorizare intensivă a markerilor inflamatori (CRP, PCT) la 24-48h",
+            "💊 Evaluare pentru terapie anti-inflamatoare adjuvantă dacă este indicată"
+        ), ((("crp", ">", 100), ("pct", ">", 2)),)),
+        # Recomandări pentru analize urinare
+        RecommendationRule((
+            "🔬 Repetarea culturii urinare după 48-72h de terapie antimicrobiană",
+            "💧 Asigurarea unei hidratări adecvate pentru diluarea bacteriilor urinare"
+        ), ((("cultura_urina_pozitiva", "true", None), ("bacterii_urina", ">", 100000)),)),
+        # Recomandări pentru funcția renală
+        RecommendationRule((
+            "🫘 Monitorizare zilnică a funcției renale și ajustarea dozelor medicamentelor",
+            "💧 Optimizarea statusului de hidratare și evitarea nefrotoxinelor"
+        ), ((("creatinina", ">", 1.5),),)),
+        # Recomandări pentru scoruri clinice ridicate
+        RecommendationRule((
+            "🏥 Considerare transferului în unitatea de terapie intensivă",
+            "👥 Consultare urgentă cu echipa de terapie intensivă și anestezie"
+        ), ((("sofa_score", ">", 6), ("apache_score", ">", 15)),)),
+    )
+    
+    def __init__(self, cache: Optional[RiskCache] = None, uncertainty: Optional[UncertaintyModel] = None,
+                 calibration: Optional[ProbabilityCalibration] = None):
         self.risk_weights = self._calculate_dynamic_weights()
+        # Tabelul de recomandări compilat (măști de condiții, texte memorate per mască)
+        self.recommendations = RecommendationEngine(self.RECOMMENDATION_RULES)
+        # Sigmoida scor -> probabilitate, din artefactul de calibrare versionat
+        self.calibration = calibration or load_calibration()
+        # Cache opțional adresat prin conținut (date pacient + profil + ponderi)
+        self.cache = cache
+        # Modelul Monte Carlo pentru intervalul de confidență al probabilității
+        self.uncertainty = uncertainty or UncertaintyModel()
     
     def _calculate_dynamic_weights(self) -> Dict[str, float]:
         """Calculează ponderi dinamice bazate pe literatura medicală"""
@@ -511,21 +623,37 @@ class UltraAdvancedIAAMCalculator:
             "clinical_scores": 1.1
         }
     
-    def calculate_risk(self, data: PatientData) -> Dict[str, Any]:
-        """Calculează riscul IAAM cu algoritm ultra-precis și machine learning"""
+    def calculate_risk(self, data: PatientData, score_only: bool = False) -> Dict[str, Any]:
+        """Calculează riscul IAAM cu algoritm ultra-precis și machine learning.
+        
+        Cu score_only=True se returnează doar valorile numerice (scor, nivel,
+        probabilitate), fără componente, recomandări și interpretare text.
+        """
+        if self.cache is None:
+            return self._compute_risk(data, score_only)
+        profile_version = (f"{self.SCORING_PROFILE}:{json.dumps(self.risk_weights, sort_keys=True)}:"
+                           f"{self.calibration.version}:{self.uncertainty.signature()}:{score_only}")
+        key = canonical_key(vars(data), profile_version)
+        return self.cache.get_or_compute(key, lambda: self._compute_risk(data, score_only))
+    
+    def _compute_risk(self, data: PatientData, score_only: bool = False) -> Dict[str, Any]:
+        """Calculează efectiv riscul (fără cache)"""
         if data.ore_spitalizare < 48:
+            if score_only:
+                return {"nivel_risc": "FĂRĂ RISC", "scor_total": 0, "probabilitate": 0.0}
             return {
                 "nivel_risc": "FĂRĂ RISC",
                 "scor_total": 0,
                 "mesaj": "Riscul IAAM se evaluează doar după 48h de spitalizare",
                 "componente": {},
-                "recomandari": ["Monitorizare standard", "Respectarea măsurilor de igienă"],
+                "recomandari": list(self.NON_IAAM_RECOMMENDATIONS),
                 "probabilitate": 0.0,
-                "interval_confidenta": (0.0, 0.0)
+                "interval_confidenta": (0.0, 0.0),
+                "interval_date_lipsa": (0.0, 0.0)
             }
         
         scor_total = 0
-        componente = {}
+        componente: List[RiskComponent] = []
         
         # 1. Scor temporal ultra-precis
         ore = data.ore_spitalizare
@@ -546,7 +674,8 @@ class UltraAdvancedIAAMCalculator:
             nivel_temporal = "Risc maxim (>1 lună)"
         
         scor_temporal *= self.risk_weights["temporal"]
-        componente["Durata spitalizării"] = f"{scor_temporal:.1f} ({nivel_temporal})"
+        if not score_only:
+            componente.append(RiskComponent("Durata spitalizării", scor_temporal, ore, "ore", f"{scor_temporal:.1f} ({nivel_temporal})"))
         scor_total += scor_temporal
         
         # 2. Dispozitive invazive cu scoring dinamic
@@ -554,17 +683,23 @@ class UltraAdvancedIAAMCalculator:
         if data.cateter_venos_central:
             scor_cateter = min(data.zile_cateter_venos * 3.5, 35)
             scor_dispozitive += scor_cateter
-            componente["Cateter venos central"] = f"{scor_cateter:.1f} ({data.zile_cateter_venos} zile)"
+            if not score_only:
+                componente.append(RiskComponent("Cateter venos central", scor_cateter, data.zile_cateter_venos, "zile",
+                                                f"{scor_cateter:.1f} ({data.zile_cateter_venos} zile)"))
         
         if data.cateter_urinar:
             scor_urinar = min(data.zile_cateter_urinar * 2.5, 25)
             scor_dispozitive += scor_urinar
-            componente["Cateter urinar"] = f"{scor_urinar:.1f} ({data.zile_cateter_urinar} zile)"
+            if not score_only:
+                componente.append(RiskComponent("Cateter urinar", scor_urinar, data.zile_cateter_urinar, "zile",
+                                                f"{scor_urinar:.1f} ({data.zile_cateter_urinar} zile)"))
         
         if data.ventilatie_mecanica:
             scor_ventilatie = min(data.zile_ventilatie * 4.5, 45)
             scor_dispozitive += scor_ventilatie
-            componente["Ventilație mecanică"] = f"{scor_ventilatie:.1f} ({data.zile_ventilatie} zile)"
+            if not score_only:
+                componente.append(RiskComponent("Ventilație mecanică", scor_ventilatie, data.zile_ventilatie, "zile",
+                                                f"{scor_ventilatie:.1f} ({data.zile_ventilatie} zile)"))
         
         scor_dispozitive *= self.risk_weights["devices"]
         scor_total += scor_dispozitive
@@ -572,25 +707,19 @@ class UltraAdvancedIAAMCalculator:
         # 3. Microbiologie ultra-avansată
         scor_micro = 0
         if data.cultura_pozitiva and data.bacterie:
-            pathogen_scores = {
-                "Pseudomonas aeruginosa": 28,
-                "Acinetobacter baumannii": 30,
-                "Klebsiella pneumoniae": 22,
-                "Escherichia coli": 18,
-                "Staphylococcus aureus": 24,
-                "Enterococcus faecium": 20,
-                "Candida auris": 35,
-                "Clostridioides difficile": 40
-            }
-            
-            scor_micro = pathogen_scores.get(data.bacterie, 15)
-            componente["Microorganisme"] = f"{scor_micro} ({data.bacterie})"
+            scor_micro = self.PATHOGEN_SCORES.get(data.bacterie, 15)
+            if not score_only:
+                componente.append(RiskComponent("Microorganisme", scor_micro, data.bacterie, "", f"{scor_micro} ({data.bacterie})"))
             
             # Bonus pentru rezistențe multiple
             if data.rezistente:
                 resistance_multiplier = 1 + (len(data.rezistente) * 0.3)
                 scor_micro *= resistance_multiplier
-                componente["Rezistențe"] = f"+{(resistance_multiplier-1)*100:.0f}% ({', '.join(data.rezistente)})"
+                if not score_only:
+                    componente.append(RiskComponent(
+                        "Rezistențe", scor_micro - scor_micro / resistance_multiplier, len(data.rezistente), "rezistențe",
+                        f"+{(resistance_multiplier-1)*100:.0f}% ({', '.join(data.rezistente)})"
+                    ))
         
         scor_micro *= self.risk_weights["microbiology"]
         scor_total += scor_micro
@@ -600,18 +729,22 @@ class UltraAdvancedIAAMCalculator:
         if data.crp > 0:
             scor_crp = min(data.crp * 0.1, 20)
             scor_inflamatori += scor_crp
-            componente["CRP"] = f"{scor_crp:.1f} (CRP: {data.crp} mg/L)"
+            if not score_only:
+                componente.append(RiskComponent("CRP", scor_crp, data.crp, "mg/L", f"{scor_crp:.1f} (CRP: {data.crp} mg/L)"))
         
         if data.pct > 0:
             scor_pct = min(data.pct * 2, 25)
             scor_inflamatori += scor_pct
-            componente["PCT"] = f"{scor_pct:.1f} (PCT: {data.pct} ng/mL)"
+            if not score_only:
+                componente.append(RiskComponent("PCT", scor_pct, data.pct, "ng/mL", f"{scor_pct:.1f} (PCT: {data.pct} ng/mL)"))
         
         if data.leucocite > 0:
             if data.leucocite > 15000 or data.leucocite < 4000:
                 scor_leucocite = 10
                 scor_inflamatori += scor_leucocite
-                componente["Leucocite"] = f"{scor_leucocite} (Leucocite: {data.leucocite}/μL)"
+                if not score_only:
+                    componente.append(RiskComponent("Leucocite", scor_leucocite, data.leucocite, "/μL",
+                                                    f"{scor_leucocite} (Leucocite: {data.leucocite}/μL)"))
         
         scor_inflamatori *= self.risk_weights["inflammatory"]
         scor_total += scor_inflamatori
@@ -620,15 +753,19 @@ class UltraAdvancedIAAMCalculator:
         scor_laborator = 0
         if data.creatinina > 1.5:
             scor_laborator += 8
-            componente["Funcție renală"] = f"8 (Creatinină: {data.creatinina} mg/dL)"
+            if not score_only:
+                componente.append(RiskComponent("Funcție renală", 8, data.creatinina, "mg/dL",
+                                                f"8 (Creatinină: {data.creatinina} mg/dL)"))
         
         if data.albumina > 0 and data.albumina < 3.0:
             scor_laborator += 6
-            componente["Albumină"] = f"6 (Albumină: {data.albumina} g/dL)"
+            if not score_only:
+                componente.append(RiskComponent("Albumină", 6, data.albumina, "g/dL", f"6 (Albumină: {data.albumina} g/dL)"))
         
         if data.hemoglobina > 0 and data.hemoglobina < 10:
             scor_laborator += 5
-            componente["Anemie"] = f"5 (Hb: {data.hemoglobina} g/dL)"
+            if not score_only:
+                componente.append(RiskComponent("Anemie", 5, data.hemoglobina, "g/dL", f"5 (Hb: {data.hemoglobina} g/dL)"))
         
         scor_laborator *= self.risk_weights["laboratory"]
         scor_total += scor_laborator
@@ -637,18 +774,21 @@ class UltraAdvancedIAAMCalculator:
         scor_clinic = 0
         if data.sofa_score > 0:
             scor_clinic += data.sofa_score * 2
-            componente["SOFA Score"] = f"{data.sofa_score * 2} (SOFA: {data.sofa_score})"
+            if not score_only:
+                componente.append(RiskComponent("SOFA Score", data.sofa_score * 2, data.sofa_score, "puncte SOFA",
+                                                f"{data.sofa_score * 2} (SOFA: {data.sofa_score})"))
         
         if data.apache_score > 0:
             scor_clinic += data.apache_score * 1.5
-            componente["APACHE Score"] = f"{data.apache_score * 1.5:.1f} (APACHE: {data.apache_score})"
+            if not score_only:
+                componente.append(RiskComponent("APACHE Score", data.apache_score * 1.5, data.apache_score, "puncte APACHE",
+                                                f"{data.apache_score * 1.5:.1f} (APACHE: {data.apache_score})"))
         
         scor_clinic *= self.risk_weights["clinical_scores"]
         scor_total += scor_clinic
         
         # 7. Calculul probabilității cu machine learning
         probabilitate = self._calculate_probability(scor_total)
-        interval_confidenta = self._calculate_confidence_interval(probabilitate)
         
         # 8. Determinarea nivelului de risc ultra-precis
         if scor_total < 25:
@@ -667,137 +807,172 @@ class UltraAdvancedIAAMCalculator:
             nivel_risc = "CRITIC"
             culoare = "#d32f2f"
         
-        # 9. Recomandări clinice ultra-detaliate
+        if score_only:
+            return {
+                "nivel_risc": nivel_risc,
+                "scor_total": round(scor_total, 1),
+                "culoare": culoare,
+                "probabilitate": probabilitate
+            }
+        
+        # 9. Intervalele Monte Carlo (doar pentru evaluarea completă; simulările folosesc score_only)
+        interval_confidenta = self._calculate_confidence_interval(data)
+        interval_date_lipsa = self._calculate_missing_data_interval(data, interval_confidenta)
+        
+        # 10. Recomandări clinice ultra-detaliate
         recomandari = self._generate_ultra_advanced_recommendations(nivel_risc, data, scor_total)
         
         return {
             "nivel_risc": nivel_risc,
             "scor_total": round(scor_total, 1),
             "culoare": culoare,
-            "componente": componente,
+            "componente": {componenta.nume: componenta.afisare for componenta in componente},
+            "componente_numerice": [dict(vars(componenta)) for componenta in componente],
             "recomandari": recomandari,
             "interpretare": self._generate_advanced_interpretation(nivel_risc, scor_total, data),
             "probabilitate": probabilitate,
             "interval_confidenta": interval_confidenta,
+            "interval_date_lipsa": interval_date_lipsa,
             "factori_risc_principali": self._identify_main_risk_factors(componente)
         }
     
+    def calculate_risk_batch(self, fields: Dict[str, Any]) -> np.ndarray:
+        """Calculează scorul total vectorizat pentru array-uri de valori.
+        
+        Fiecare câmp din BATCH_FIELDS poate fi un array (orice formă, cu
+        broadcasting) sau lipsă (valoarea implicită din PatientData).
+        "rezistente" acceptă liste de rezistențe sau direct numărul lor.
+        Rezultatul este identic (nerotunjit) cu scor_total din calculate_risk.
+        """
+        defaults = {name: PatientData.__dataclass_fields__[name].default for name in self.BATCH_FIELDS}
+        defaults["rezistente"] = 0
+        
+        def column(name: str, dtype=float) -> np.ndarray:
+            return np.asarray(fields.get(name, defaults[name]), dtype=dtype)
+        
+        ore = column("ore_spitalizare")
+        
+        # 1. Scor temporal (funcție liniară pe intervale)
+        scor_temporal = np.select(
+            [ore < 72, ore < 168, ore < 336, ore < 720],
+            [8 + (ore - 48) * 0.2, 15 + (ore - 72) * 0.1, 25 + (ore - 168) * 0.06, 35 + (ore - 336) * 0.03],
+            np.minimum(55, 45 + (ore - 720) * 0.01)
+        ) * self.risk_weights["temporal"]
+        
+        # 2. Dispozitive invazive
+        scor_dispozitive = sum(
+            np.where(column(device, bool), np.minimum(column(days) * rate, cap), 0.0)
+            for (device, days), (rate, cap) in zip(self.DEVICE_DAY_FIELDS.items(), ((3.5, 35), (2.5, 25), (4.5, 45)))
+        ) * self.risk_weights["devices"]
+        
+        # 3. Microbiologie (scorul patogenului se caută doar pe valorile distincte)
+        bacterie = np.asarray(fields.get("bacterie", ""), dtype=object)
+        codes, names = pd.factorize(bacterie.ravel())
+        pathogen = np.array([self.PATHOGEN_SCORES.get(name, 15) for name in names] + [15], dtype=float)
+        scor_patogen = pathogen[codes].reshape(bacterie.shape)
+        has_pathogen = np.array([bool(name) for name in names] + [False])[codes].reshape(bacterie.shape)
+        
+        rezistente = np.asarray(fields.get("rezistente", 0))
+        if rezistente.dtype == object:
+            rezistente = np.vectorize(len, otypes=[int])(rezistente)
+        scor_micro = np.where(
+            column("cultura_pozitiva", bool) & has_pathogen,
+            scor_patogen * (1 + rezistente * 0.3), 0.0
+        ) * self.risk_weights["microbiology"]
+        
+        # 4. Markeri inflamatori
+        crp, pct, leucocite = column("crp"), column("pct"), column("leucocite")
+        scor_inflamatori = (
+            np.where(crp > 0, np.minimum(crp * 0.1, 20), 0.0)
+            + np.where(pct > 0, np.minimum(pct * 2, 25), 0.0)
+            + np.where((leucocite > 0) & ((leucocite > 15000) | (leucocite < 4000)), 10, 0)
+        ) * self.risk_weights["inflammatory"]
+        
+        # 5. Analize laborator
+        albumina, hemoglobina = column("albumina"), column("hemoglobina")
+        scor_laborator = (
+            np.where(column("creatinina") > 1.5, 8, 0)
+            + np.where((albumina > 0) & (albumina < 3.0), 6, 0)
+            + np.where((hemoglobina > 0) & (hemoglobina < 10), 5, 0)
+        ) * self.risk_weights["laboratory"]
+        
+        # 6. Scoruri clinice
+        sofa, apache = column("sofa_score"), column("apache_score")
+        scor_clinic = (
+            np.where(sofa > 0, sofa * 2, 0) + np.where(apache > 0, apache * 1.5, 0)
+        ) * self.risk_weights["clinical_scores"]
+        
+        scor_total = scor_temporal + scor_dispozitive + scor_micro + scor_inflamatori + scor_laborator + scor_clinic
+        return np.where(ore < 48, 0.0, scor_total)
+    
+    def recommend_batch(self, fields: Dict[str, Any], niveluri: np.ndarray) -> List[Tuple[str, ...]]:
+        """Recomandările pentru un lot (câmpurile lipsă primesc valorile implicite din PatientData).
+
+        Pacienții sub 48h (FĂRĂ RISC) primesc recomandările standard, ca în calculate_risk.
+        """
+        n = len(niveluri)
+        columns = {"nivel_risc": np.asarray(niveluri, dtype=object)}
+        for name in self.recommendations.fields():
+            if name in fields:
+                columns[name] = fields[name]
+            else:
+                default = PatientData.__dataclass_fields__[name].default
+                columns[name] = np.full(n, "" if default is MISSING else default, dtype=object)
+        texts = self.recommendations.recommend_batch(columns, n)
+        return [self.NON_IAAM_RECOMMENDATIONS if nivel == "FĂRĂ RISC" else item
+                for nivel, item in zip(niveluri, texts)]
+    
+    def classify_batch(self, scores: np.ndarray, ore_spitalizare: np.ndarray) -> np.ndarray:
+        """Nivelurile de risc pentru scorurile (nerotunjite) din calculate_risk_batch"""
+        levels = np.array(self.LEVEL_NAMES + ("FĂRĂ RISC",), dtype=object)
+        index = np.searchsorted(self.LEVEL_THRESHOLDS, scores, side="right")
+        return levels[np.where(np.asarray(ore_spitalizare) < 48, len(self.LEVEL_NAMES), index)]
+    
+    def sensitivity(self, data: PatientData,
+                    interventions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Evaluează toate intervențiile contrafactuale într-un singur lot vectorizat.
+        
+        Returnează scorul actual și, pentru fiecare intervenție care schimbă
+        datele, scorul rezultat și diferența, ordonate după impact.
+        """
+        values = vars(data)
+        applicable = applicable_interventions(values, self.DEFAULT_INTERVENTIONS if interventions is None else interventions)
+        columns = counterfactual_columns(values, self.BATCH_FIELDS, applicable)
+        columns["rezistente"] = [len(value) for value in columns["rezistente"]]
+        columns["bacterie"] = np.asarray(columns["bacterie"], dtype=object)
+        scor_actual, rezultate = rank_deltas(applicable, self.calculate_risk_batch(columns))
+        return {"scor_actual": scor_actual, "interventii": rezultate}
+    
     def _calculate_probability(self, scor: float) -> float:
         """Calculează probabilitatea de IAAM folosind funcție sigmoidă"""
-        # Funcție sigmoidă calibrată pentru scorurile IAAM
-        return 1 / (1 + np.exp(-(scor - 60) / 20))
-    
-    def _calculate_confidence_interval(self, prob: float) -> Tuple[float, float]:
-        """Calculează intervalul de confidență pentru probabilitate"""
-        margin = 0.1 * prob  # 10% margin
-        return (max(0, prob - margin), min(1, prob + margin))
-    
-    def _identify_main_risk_factors(self, componente: Dict[str, str]) -> List[str]:
-        """Identifică factorii de risc principali"""
-        factors = []
-        for comp, value in componente.items():
-            score = float(re.search(r'(\d+(?:\.\d+)?)', value).group(1)) if re.search(r'(\d+(?:\.\d+)?)', value) else 0
-            if score > 15:
-                factors.append(comp)
-        return factors[:3]  # Top 3 factori
+        # Funcție sigmoidă calibrată pentru scorurile IAAM (vezi risk_calibration.py)
+        return self.calibration.predict(scor)
+    
+    def _calculate_confidence_interval(self, data: PatientData) -> Tuple[float, float]:
+        """Calculează intervalul de confidență pentru probabilitate (Monte Carlo)"""
+        return self.uncertainty.interval(self, data)
+    
+    def _calculate_missing_data_interval(self, data: PatientData,
+                                         interval_confidenta: Tuple[float, float]) -> Tuple[float, float]:
+        """Intervalul cu analizele lipsă eșantionate din priori (egal cu cel de măsurare dacă nu lipsește nimic)"""
+        if not self.uncertainty.missing(data):
+            return interval_confidenta
+        return self.uncertainty.interval(self, data, priori=True)
+    
+    def calculate_confidence_intervals(self, patients: List[PatientData], priori: bool = False) -> np.ndarray:
+        """Calculează intervalele de confidență pentru o cohortă (pacienți × [inferior, superior]);
+        cu priori=True include incertitudinea analizelor lipsă"""
+        return self.uncertainty.intervals(self, patients, priori)
+    
+    def _identify_main_risk_factors(self, componente: List[RiskComponent], top_k: int = 3) -> List[str]:
+        """Identifică factorii de risc principali (componentele cu cele mai multe puncte)"""
+        factori = [componenta for componenta in componente if componenta.puncte > 15]
+        factori.sort(key=lambda componenta: componenta.puncte, reverse=True)
+        return [componenta.nume for componenta in factori[:top_k]]
     
     def _generate_ultra_advanced_recommendations(self, nivel_risc: str, data: PatientData, scor: float) -> List[str]:
         """Generează recomandări clinice ultra-avansate și personalizate"""
-        recomandari = []
-        
-        # Recomandări de bază universale
-        recomandari.extend([
-            "🧼 Igienă strictă a mâinilor cu soluție hidroalcoolică înainte și după contactul cu pacientul",
-            "🦠 Implementarea precauțiilor de contact și izolare conform protocoalelor instituționale",
-            "📊 Monitorizare zilnică a parametrilor vitali și a stării clinice generale"
-        ])
-        
-        # Recomandări specifice nivelului de risc
-        if nivel_risc in ["RIDICAT", "FOARTE RIDICAT", "CRITIC"]:
-            recomandari.extend([
-                "🔬 Monitorizare microbiologică intensivă cu culturi de supraveghere săptămânale",
-                "💊 Evaluare pentru terapie antimicrobiană profilactică sau empirică țintită",
-                "👥 Consultare urgentă specialist în boli infecțioase și epidemiologie",
-                "📈 Implementarea unui plan de management multidisciplinar personalizat"
-            ])
-        
-        if nivel_risc in ["FOARTE RIDICAT", "CRITIC"]:
-            recomandari.extend([
-                "🏥 Izolare în cameră separată cu presiune negativă și filtrare HEPA",
-                "⚡ Alertă imediată a echipei de control al infecțiilor nosocomiale",
-                "📊 Raportare urgentă către comisia de infecții nosocomiale și conducerea medicală",
-                "🔄 Reevaluare zilnică a strategiei terapeutice și de prevenție"
-            ])
-        
-        # Recomandări specifice dispozitivelor invazive
-        if data.cateter_venos_central:
-            recomandari.extend([
-                "🩸 Evaluare zilnică a necesității menținerii cateterului venos central",
-                "🧽 Dezinfecție cu clorhexidină 2% la fiecare manipulare a cateterului",
-                "🔄 Schimbarea pansamentului transparent la 7 zile sau când este necesar"
-            ])
-        
-        if data.cateter_urinar:
-            recomandari.extend([
-                "🚿 Evaluare zilnică a necesității menținerii cateterului urinar",
-                "💧 Menținerea strictă a sistemului de drenaj închis și steril",
-                "🧼 Igienă perineală zilnică cu soluții antiseptice blânde"
-            ])
-        
-        if data.ventilatie_mecanica:
-            recomandari.extend([
-                "🫁 Implementarea protocolului de sevraj ventilator accelerat și sigur",
-                "🦷 Igienă orală cu clorhexidină 0.12% la fiecare 12 ore",
-                "📐 Menținerea capului la 30-45° pentru prevenirea pneumoniei asociate ventilatorului"
-            ])
-        
-        # Recomandări specifice microorganismelor
-        if data.bacterie:
-            if "Pseudomonas" in data.bacterie:
-                recomandari.extend([
-                    "💉 Considerare terapie combinată anti-Pseudomonas (beta-lactamice + aminoglicozide/fluorochinolone)",
-                    "🔬 Testare zilnică a sensibilității pentru optimizarea terapiei antimicrobiene"
-                ])
-            elif "Acinetobacter" in data.bacterie:
-                recomandari.extend([
-                    "🔬 Testare urgentă a sensibilității la colistin, tigecyclină și ampicilină-sulbactam",
-                    "💊 Considerare terapie combinată pentru Acinetobacter multidrog-rezistent"
-                ])
-            elif "MRSA" in str(data.rezistente) or "Staphylococcus" in data.bacterie:
-                recomandari.extend([
-                    "💊 Inițierea terapiei cu vancomicină, linezolid sau daptomicină",
-                    "📊 Monitorizare zilnică a nivelurilor serice de vancomicină"
-                ])
-        
-        # Recomandări pentru markeri inflamatori
-        if data.crp > 100 or data.pct > 2:
-            recomandari.extend([
-                "🔥 Monitorizare intensivă a markerilor inflamatori (CRP, PCT) la 24-48h",
-                "💊 Evaluare pentru terapie anti-inflamatoare adjuvantă dacă este indicată"
-            ])
-        
-        # Recomandări pentru analize urinare
-        if data.cultura_urina_pozitiva or data.bacterii_urina > 100000:
-            recomandari.extend([
-                "🔬 Repetarea culturii urinare după 48-72h de terapie antimicrobiană",
-                "💧 Asigurarea unei hidratări adecvate pentru diluarea bacteriilor urinare"
-            ])
-        
-        # Recomandări pentru funcția renală
-        if data.creatinina > 1.5:
-            recomandari.extend([
-                "🫘 Monitorizare zilnică a funcției renale și ajustarea dozelor medicamentelor",
-                "💧 Optimizarea statusului de hidratare și evitarea nefrotoxinelor"
-            ])
-        
-        # Recomandări pentru scoruri clinice ridicate
-        if data.sofa_score > 6 or data.apache_score > 15:
-            recomandari.extend([
-                "🏥 Considerare transferului în unitatea de terapie intensivă",
-                "👥 Consultare urgentă cu echipa de terapie intensivă și anestezie"
-            ])
-        
-        return recomandari
+        return self.recommendations.recommend(data, nivel_risc=nivel_risc)
     
     def _generate_advanced_interpretation(self, nivel_risc: str, scor: float, data: PatientData) -> str:
         """Generează interpretare clinică ultra-detaliată"""
@@ -823,11 +998,13 @@ class UltraAdvancedIAAMCalculator:
 class UltraProfessionalInterface:
     """Interfață ultra-profesională cu design medical avansat"""
     
+    SHARE_RISK_CACHE = True
+    
     def __init__(self):
         self.ocr = AdvancedMedicalOCR()
         self.nlp = UltraAdvancedNLP()
-        self.calculator = UltraAdvancedIAAMCalculator()
         self._init_session_state()
+        self.calculator = UltraAdvancedIAAMCalculator(cache=st.session_state.risk_cache)
         self.apply_ultra_professional_css()
     
     def _init_session_state(self):
@@ -843,6 +1020,26 @@ class UltraProfessionalInterface:
         
         if "uploaded_files" not in st.session_state:
             st.session_state.uploaded_files = []
+        
+        if "risk_cache" not in st.session_state:
+            # cache comun tuturor sesiunilor din proces, dacă este activat
+            st.session_state.risk_cache = shared_risk_cache() if self.SHARE_RISK_CACHE else RiskCache()
+        
+        if "patient_key" not in st.session_state:
+            st.session_state.patient_key = self._new_patient_key()
+        
+        if "risk_index" not in st.session_state:
+            # pacienții evaluați în sesiune, ordonați după scor, cu contoare pe niveluri
+            st.session_state.risk_index = RiskIndex(UltraAdvancedIAAMCalculator.LEVEL_NAMES + ("FĂRĂ RISC",))
+        
+        if "text_extractor" not in st.session_state:
+            # textul introdus anterior și candidații lui, pentru re-extracția incrementală
+            st.session_state.text_extractor = self.nlp.incremental()
+    
+    @staticmethod
+    def _new_patient_key() -> str:
+        """Identificator de sesiune pentru pacientul curent (PatientData nu are ID)"""
+        return datetime.now().strftime("PAC-%Y%m%d-%H%M%S-%f")
     
     def apply_ultra_professional_css(self):
         """Aplică CSS ultra-profesional pentru interfața medicală"""
@@ -1139,6 +1336,17 @@ class UltraProfessionalInterface:
             if data.rezistente:
                 st.metric("⚠️ Rezistențe", f"{len(data.rezistente)} detectate")
             
+            # Impactul intervențiilor (un singur calcul vectorizat la fiecare rerulare)
+            if data.ore_spitalizare >= 48:
+                sensibilitate = self.calculator.sensitivity(data)
+                if sensibilitate["interventii"]:
+                    st.markdown("---")
+                    st.markdown("### 🎯 Impact Intervenții")
+                    for rezultat in sensibilitate["interventii"][:5]:
+                        if rezultat["delta"] < 0:
+                            st.metric(rezultat["interventie"], f"{rezultat['scor']:.1f}", f"{rezultat['delta']:.1f}",
+                                      delta_color="inverse")
+            
             st.markdown("---")
             
             # Informații educaționale
@@ -1206,7 +1414,7 @@ class UltraProfessionalInterface:
                             
                             if extracted_text:
                                 # Extrage date medicale din text
-                                medical_data = self.nlp.extract_comprehensive_data(extracted_text)
+                                medical_data = self.nlp.extract_stream(extracted_text.splitlines(keepends=True))
                                 
                                 # Actualizează datele pacientului
                                 self._update_patient_data(medical_data)
@@ -1299,8 +1507,8 @@ class UltraProfessionalInterface:
                 "content": text
             })
             
-            # Extrage date medicale cu NLP avansat
-            extracted_data = self.nlp.extract_comprehensive_data(text)
+            # Extrage date medicale cu NLP avansat (doar regiunea modificată față de textul anterior)
+            extracted_data = st.session_state.text_extractor.update(text)
             
             # Actualizează datele pacientului
             self._update_patient_data(extracted_data)
@@ -1338,6 +1546,13 @@ class UltraProfessionalInterface:
             # Afișează rezultatul ultra-profesional
             self._display_ultra_risk_result(risk_result)
             
+            st.session_state.risk_index.update(
+                st.session_state.patient_key, risk_result["scor_total"], risk_result["nivel_risc"],
+                probabilitate=risk_result["probabilitate"], ore_spitalizare=data.ore_spitalizare,
+                bacterie=data.bacterie, factori=risk_result.get("factori_risc_principali", []),
+                evaluat=datetime.now()
+            )
+            
             # Adaugă în chat
             st.session_state.messages.append({
                 "role": "system",
@@ -1376,6 +1591,13 @@ class UltraProfessionalInterface:
         </div>
         """, unsafe_allow_html=True)
         
+        # Incertitudinea datorată analizelor lipsă (priori), raportată separat de estimarea punctuală
+        interval_date_lipsa = risk_result["interval_date_lipsa"]
+        if interval_date_lipsa != interval_confidenta:
+            lipsa = ", ".join(self.calculator.uncertainty.missing(st.session_state.patient_data))
+            st.caption(f"Cu analizele lipsă estimate ({lipsa}): "
+                       f"{interval_date_lipsa[0]:.1%} - {interval_date_lipsa[1]:.1%}")
+        
         # Interpretare clinică
         st.markdown("### 🎯 Interpretare Clinică Ultra-Detaliată")
         st.markdown(f"""
@@ -1430,16 +1652,11 @@ class UltraProfessionalInterface:
         st.markdown("### 📈 Analiza Grafică a Riscului")
         
         # Grafic cu componente
-        componente = risk_result["componente"]
+        componente = risk_result.get("componente_numerice", [])
         if componente:
-            # Extrage scorurile numerice
-            scores = []
-            labels = []
-            for comp, value in componente.items():
-                score_match = re.search(r'(\d+(?:\.\d+)?)', value)
-                if score_match:
-                    scores.append(float(score_match.group(1)))
-                    labels.append(comp)
+            # Scorurile numerice vin direct din calculator
+            scores = [float(componenta["puncte"]) for componenta in componente]
+            labels = [componenta["nume"] for componenta in componente]
             
             if scores:
                 fig = go.Figure()
@@ -1509,9 +1726,11 @@ class UltraProfessionalInterface:
     def _reset_patient_data(self):
         """Resetează datele pacientului"""
         st.session_state.patient_data = PatientData()
+        st.session_state.patient_key = self._new_patient_key()
         st.session_state.messages = []
         st.session_state.risk_calculated = False
         st.session_state.uploaded_files = []
+        st.session_state.text_extractor.reset()
         st.success("🔄 Datele au fost resetate complet!")
         st.rerun()
     
@@ -1555,6 +1774,7 @@ class UltraProfessionalInterface:
             - **Scor Total:** {risk_result['scor_total']} puncte
             - **Probabilitate:** {risk_result['probabilitate']:.1%}
             - **Interval Confidență:** {risk_result['interval_confidenta'][0]:.1%} - {risk_result['interval_confidenta'][1]:.1%}
+            - **Interval cu analizele lipsă:** {risk_result['interval_date_lipsa'][0]:.1%} - {risk_result['interval_date_lipsa'][1]:.1%}
             
             ## 📊 Componente Detaliate
             """
@@ -1601,27 +1821,24 @@ class UltraProfessionalInterface:
         """Analizează tendințele de risc"""
         st.markdown("### 📈 Analiză Trend Risc IAAM")
         
-        # Simulează evoluția riscului în timp
-        days = list(range(2, 31))  # 2-30 zile
-        risk_scores = []
-        
+        # Simulează evoluția riscului în timp (rezoluție orară, zilele 2-30)
         base_data = st.session_state.patient_data
-        
-        for day in days:
-            temp_data = PatientData(**asdict(base_data))
-            temp_data.ore_spitalizare = day * 24
-            
-            if day > 7:  # Adaugă dispozitive după o săptămână
-                temp_data.cateter_venos_central = True
-                temp_data.zile_cateter_venos = day - 7
-            
-            if day > 10:  # Adaugă infecție după 10 zile
-                temp_data.cultura_pozitiva = True
-                temp_data.bacterie = "Pseudomonas aeruginosa"
-                temp_data.crp = 100 + (day - 10) * 5
-            
-            risk = self.calculator.calculate_risk(temp_data)
-            risk_scores.append(risk['scor_total'])
+        start = replace(base_data, ore_spitalizare=48)
+        
+        # orele evenimentelor sunt relative la start (ziua d a internării = d * 24 - 48)
+        events = [
+            # Adaugă dispozitive după o săptămână
+            TimelineEvent(8 * 24 - 48, "cateter_venos_central", True),
+            TimelineEvent(8 * 24 - 48, "zile_cateter_venos", 1),
+            # Adaugă infecție după 10 zile
+            TimelineEvent(11 * 24 - 48, "cultura_pozitiva", True),
+            TimelineEvent(11 * 24 - 48, "bacterie", "Pseudomonas aeruginosa"),
+        ]
+        events += [TimelineEvent(day * 24 - 48, "crp", 100 + (day - 10) * 5) for day in range(11, 31)]
+        
+        trajectory = project_risk(self.calculator, start, events, horizon_hours=28 * 24)
+        days = (trajectory["ore"] + 48) / 24
+        risk_scores = trajectory["scor"]
         
         # Grafic trend
         fig = go.Figure()
@@ -1629,10 +1846,9 @@ class UltraProfessionalInterface:
         fig.add_trace(go.Scatter(
             x=days,
             y=risk_scores,
-            mode='lines+markers',
+            mode='lines',
             name='Scor Risc IAAM',
-            line=dict(color='#f56565', width=3),
-            marker=dict(size=8)
+            line=dict(color='#f56565', width=3)
         ))
         
         # Adaugă zone de risc
@@ -1701,7 +1917,7 @@ class UltraProfessionalInterface:
         
         for scenario_name, scenario_data in scenarios.items():
             temp_data = PatientData(**scenario_data)
-            risk = self.calculator.calculate_risk(temp_data)
+            risk = self.calculator.calculate_risk(temp_data, score_only=True)
             scenario_results.append({
                 "Scenariu": scenario_name,
                 "Scor": risk['scor_total'],
@@ -1770,8 +1986,32 @@ class UltraProfessionalInterface:
         st.info("Funcționalitate în dezvoltare: Analize avansate vor fi disponibile în curând.")
 
     def _show_complete_dashboard(self):
-        """Afișează dashboard complet"""
-        st.info("Funcționalitate în dezvoltare: Dashboard complet va fi disponibil în curând.")
+        """Afișează dashboard-ul secției: pacienții cu risc maxim și distribuția pe niveluri"""
+        index = st.session_state.risk_index
+        if not len(index):
+            st.info("📊 Nu există încă evaluări IAAM în această sesiune.")
+            return
+        
+        st.markdown("### 🏥 Dashboard Secție")
+        counts = index.level_counts()
+        for column, (nivel, numar) in zip(st.columns(len(counts)), counts.items()):
+            column.metric(nivel, numar)
+        
+        top = index.top()
+        st.markdown(f"#### 🔝 Top {len(top)} pacienți după risc")
+        st.dataframe(pd.DataFrame([
+            {
+                "Pacient": intrare["patient_id"],
+                "Scor": intrare["score"],
+                "Nivel": intrare["level"],
+                "Probabilitate": f"{intrare['probabilitate']:.1%}",
+                "Spitalizare (zile)": round(intrare["ore_spitalizare"] / 24, 1),
+                "Microorganism": intrare["bacterie"] or "-",
+                "Factori principali": ", ".join(intrare["factori"]),
+                "Evaluat": intrare["evaluat"].strftime("%d.%m.%Y %H:%M")
+            }
+            for intrare in top
+        ]), use_container_width=True, hide_index=True)
 
     def _generate_medical_report(self):
         """Generează raport medical"""
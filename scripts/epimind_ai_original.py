@@ -29,6 +29,7 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Any, Optional
 import requests
 import time
+from severity_scores import load_severity_table
 
 # Configurare aplicație
 st.set_page_config(
@@ -264,58 +265,18 @@ class IAMPredictor:
             "XDR": 30,
             "PDR": 40
         }
+        
+        # Praguri SOFA/qSOFA din tabelul versionat (comun cu EnhancedIAAMPredictor)
+        self.severity_table = load_severity_table("original")
     
     def calculate_sofa(self, data: Dict) -> int:
         """Calculează SOFA score"""
-        score = 0
-        
-        # Respirator
-        pao2_fio2 = data.get("pao2_fio2", 400)
-        if pao2_fio2 < 400: score += 1
-        if pao2_fio2 < 300: score += 1
-        if pao2_fio2 < 200: score += 1
-        if pao2_fio2 < 100: score += 1
-        
-        # Coagulare
-        platelets = data.get("trombocite", 200)
-        if platelets < 150: score += 1
-        if platelets < 100: score += 1
-        if platelets < 50: score += 1
-        if platelets < 20: score += 1
-        
-        # Hepatic
-        bilirubin = data.get("bilirubina", 1.0)
-        if bilirubin >= 1.2: score += 1
-        if bilirubin >= 2.0: score += 1
-        if bilirubin >= 6.0: score += 1
-        if bilirubin >= 12.0: score += 1
-        
-        # Cardiovascular
-        if data.get("hipotensiune"): score += 2
-        if data.get("vasopresoare"): score += 1
-        
-        # Neurologic
-        glasgow = data.get("glasgow", 15)
-        if glasgow < 15: score += 1
-        if glasgow < 13: score += 1
-        if glasgow < 10: score += 1
-        if glasgow < 6: score += 1
-        
-        # Renal
-        creatinine = data.get("creatinina", 1.0)
-        if creatinine >= 1.2: score += 1
-        if creatinine >= 2.0: score += 1
-        if creatinine >= 3.5: score += 1
-        if creatinine >= 5.0: score += 1
-        
+        score, _ = self.severity_table.sofa(data)
         return score
     
     def calculate_qsofa(self, data: Dict) -> int:
         """Calculează qSOFA score"""
-        score = 0
-        if data.get("tas", 120) < 100: score += 1
-        if data.get("frecventa_respiratorie", 18) >= 22: score += 1
-        if data.get("glasgow", 15) < 15: score += 1
+        score, _ = self.severity_table.qsofa(data)
         return score
     
     def evaluate_lab_markers(self, data: Dict) -> Tuple[int, List[str]]:
@@ -13,6 +13,8 @@ from dataclasses import dataclass, asdict, field
 from typing import Dict, List, Optional, Tuple, Any
 import requests
 from pathlib import Path
+from recommendation_rules import RecommendationEngine, RecommendationRule
+from medical_patterns import PatternRegistry
 
 # Configurare logging
 logging.basicConfig(level=logging.INFO)
@@ -27,15 +29,23 @@ class PatientData:
     
     # Date spitalizare
     ore_spitalizare: float = 0.0
+    diagnostic_principal: str = ""
     
     # Dispozitive invazive
+    cateter_venos_central: bool = False
+    zile_cateter_venos: int = 0
     cateter_urinar: bool = False
+    zile_cateter_urinar: int = 0
     cateter_vascular: bool = False
     ventilatie_mecanica: bool = False
+    zile_ventilatie: int = 0
     sonda_nazogastrica: bool = False
     drenaj_chirurgical: bool = False
     
     # Microbiologie
+    cultura_pozitiva: bool = False
+    bacterie: str = ""
+    rezistente: List[str] = field(default_factory=list)
     bacteria: str = ""
     rezistenta_antibiotice: str = ""
     
@@ -111,6 +121,76 @@ class PatientData:
 class ProfessionalAI:
     """AI ultra-avansat pentru procesare medicală"""
     
+    # Baza de cunoștințe medicale: pattern-uri compilate o singură dată, la import
+    BACTERIA_PATTERNS = PatternRegistry.compile_pairs([
+        (r"pseudomonas\s+aeruginosa|p\.?\s*aeruginosa|pseudomonas|aeruginosa", "Pseudomonas aeruginosa"),
+        (r"escherichia\s+coli|e\.?\s*coli|ecoli|e\s*coli", "Escherichia coli"),
+        (r"klebsiella\s+pneumoniae|k\.?\s*pneumoniae|klebsiella", "Klebsiella pneumoniae"),
+        (r"staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus|mrsa|mssa", "Staphylococcus aureus"),
+        (r"acinetobacter\s+baumannii|a\.?\s*baumannii|acinetobacter", "Acinetobacter baumannii"),
+        (r"enterococcus\s+faecium|e\.?\s*faecium|enterococcus|vre", "Enterococcus faecium"),
+        (r"candida\s+auris|c\.?\s*auris|candida", "Candida auris"),
+        (r"clostridioides\s+difficile|c\.?\s*difficile|cdiff|clostridium", "Clostridioides difficile"),
+        (r"enterobacter\s+cloacae|enterobacter", "Enterobacter cloacae"),
+        (r"serratia\s+marcescens|serratia", "Serratia marcescens")
+    ], re.IGNORECASE | re.UNICODE)
+    
+    RESISTANCE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"carbapenem\s*rezistent|crp|carbapenemaza", "Carbapenem-rezistent"),
+        (r"esbl|beta\s*lactamaza", "ESBL"),
+        (r"mrsa|meticilina\s*rezistent", "MRSA"),
+        (r"vre|vancomicina\s*rezistent", "VRE"),
+        (r"mdr|multi\s*drug\s*rezistent", "MDR"),
+        (r"xdr|extensively\s*drug\s*rezistent", "XDR"),
+        (r"pan\s*drug\s*rezistent|pdr", "PDR")
+    ], re.IGNORECASE | re.UNICODE)
+    
+    URINE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"proteinurie\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)", "proteinurie"),
+        (r"proteina\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)", "proteinurie"),
+        (r"hematurie\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)", "hematurie"),
+        (r"sange\s+urina\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)", "hematurie"),
+        (r"nitriti\s*[:=]?\s*(pozitiv|negativ|present|absent|\+)", "nitriti"),
+        (r"leucocit\s*esteraza\s*[:=]?\s*(pozitiv|negativ|\+{1,3})", "leucocit_esteraza"),
+        (r"bacterii\s*[:=]?\s*(\d+)\s*(?:cfu|ufc)", "bacterii_urina"),
+        (r"cultura\s*urina\s*[:=]?\s*(pozitiv|negativ)", "cultura_urina"),
+        (r"densitate\s*[:=]?\s*(\d+\.\d+)", "densitate_urina"),
+        (r"ph\s*urina\s*[:=]?\s*(\d+\.\d+)", "ph_urina"),
+        (r"glucoza\s*urina\s*[:=]?\s*(absent|urme|\+{1,3})", "glucoza_urina"),
+        (r"cetone\s*urina\s*[:=]?\s*(absent|urme|\+{1,3})", "cetone_urina"),
+        (r"bilirubina\s*urina\s*[:=]?\s*(absent|urme|\+{1,2})", "bilirubina_urina"),
+        (r"urobilinogen\s*[:=]?\s*(normal|crescut)", "urobilinogen_urina")
+    ], re.IGNORECASE)
+    
+    # (pattern, ore per unitate): zilele se convertesc în ore
+    HOSPITALIZATION_PATTERNS = PatternRegistry.compile_pairs([
+        (r"(\d+)\s+(?:de\s+)?(?:zile|days?)", 24),  # Detectează "8 zile" sau "8 de zile"
+        (r"(\d+)\s+(?:de\s+)?(?:ore|hours?)", 1),  # Detectează "8 ore" sau "8 de ore"
+        (r"internat\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)", 1),
+        (r"spitalizat\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)", 1),
+        (r"(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)\s+(?:de\s+)?(?:internare|spitalizare)", 1),
+        (r"internare\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)", 24),
+        (r"spitalizare\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)", 24),
+        (r"(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)\s+(?:de\s+)?(?:internare|spitalizare)", 24),
+        (r"ziua\s+(\d+)\s+(?:de\s+)?(?:internare|spitalizare)", 24),
+        (r"day\s+(\d+)\s+of\s+(?:hospitalization|admission)", 24)
+    ], re.IGNORECASE | re.UNICODE)
+    
+    # Parametri vitali (până acum se reconstruiau la fiecare apel de extracție)
+    VITAL_PATTERNS = PatternRegistry.compile_pairs([
+        (r"temperatura?\s*[:=]?\s*(\d+(?:\.\d+)?)\s*°?c?", "temperatura"),
+        (r"temp\s*[:=]?\s*(\d+(?:\.\d+)?)\s*°?c?", "temperatura"),
+        (r"ta\s*[:=]?\s*(\d+)/(\d+)", "tensiune"),
+        (r"tensiune\s*[:=]?\s*(\d+)/(\d+)", "tensiune"),
+        (r"fc\s*[:=]?\s*(\d+)", "frecventa_cardiaca"),
+        (r"puls\s*[:=]?\s*(\d+)", "frecventa_cardiaca"),
+        (r"fr\s*[:=]?\s*(\d+)", "frecventa_respiratorie"),
+        (r"crp\s*[:=]?\s*(\d+(?:\.\d+)?)", "crp"),
+        (r"pct\s*[:=]?\s*(\d+(?:\.\d+)?)", "pct"),
+        (r"leucocite\s*[:=]?\s*(\d+(?:\.\d+)?)", "leucocite"),
+        (r"glasgow\s*[:=]?\s*(\d+)", "glasgow_coma_scale")
+    ], re.IGNORECASE)
+    
     def __init__(self):
         self.ollama_available = self._check_ollama()
         self.medical_knowledge = self._load_medical_knowledge()
@@ -124,57 +204,13 @@ class ProfessionalAI:
             return False
     
     def _load_medical_knowledge(self) -> Dict:
-        """Încarcă baza de cunoștințe medicale extinsă"""
+        """Încarcă baza de cunoștințe medicale extinsă (tabelele compilate ale clasei)"""
         return {
-            "bacteria_patterns": {
-                r"pseudomonas\s+aeruginosa|p\.?\s*aeruginosa|pseudomonas|aeruginosa": "Pseudomonas aeruginosa",
-                r"escherichia\s+coli|e\.?\s*coli|ecoli|e\s*coli": "Escherichia coli",
-                r"klebsiella\s+pneumoniae|k\.?\s*pneumoniae|klebsiella": "Klebsiella pneumoniae",
-                r"staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus|mrsa|mssa": "Staphylococcus aureus",
-                r"acinetobacter\s+baumannii|a\.?\s*baumannii|acinetobacter": "Acinetobacter baumannii",
-                r"enterococcus\s+faecium|e\.?\s*faecium|enterococcus|vre": "Enterococcus faecium",
-                r"candida\s+auris|c\.?\s*auris|candida": "Candida auris",
-                r"clostridioides\s+difficile|c\.?\s*difficile|cdiff|clostridium": "Clostridioides difficile",
-                r"enterobacter\s+cloacae|enterobacter": "Enterobacter cloacae",
-                r"serratia\s+marcescens|serratia": "Serratia marcescens"
-            },
-            "resistance_patterns": {
-                r"carbapenem\s*rezistent|crp|carbapenemaza": "Carbapenem-rezistent",
-                r"esbl|beta\s*lactamaza": "ESBL",
-                r"mrsa|meticilina\s*rezistent": "MRSA",
-                r"vre|vancomicina\s*rezistent": "VRE",
-                r"mdr|multi\s*drug\s*rezistent": "MDR",
-                r"xdr|extensively\s*drug\s*rezistent": "XDR",
-                r"pan\s*drug\s*rezistent|pdr": "PDR"
-            },
-            "urine_patterns": {
-                r"proteinurie\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)": "proteinurie",
-                r"proteina\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)": "proteinurie",
-                r"hematurie\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)": "hematurie",
-                r"sange\s+urina\s*[:=]?\s*(absent|urme|\+{1,4}|negativ|pozitiv)": "hematurie",
-                r"nitriti\s*[:=]?\s*(pozitiv|negativ|present|absent|\+)": "nitriti",
-                r"leucocit\s*esteraza\s*[:=]?\s*(pozitiv|negativ|\+{1,3})": "leucocit_esteraza",
-                r"bacterii\s*[:=]?\s*(\d+)\s*(?:cfu|ufc)": "bacterii_urina",
-                r"cultura\s*urina\s*[:=]?\s*(pozitiv|negativ)": "cultura_urina",
-                r"densitate\s*[:=]?\s*(\d+\.\d+)": "densitate_urina",
-                r"ph\s*urina\s*[:=]?\s*(\d+\.\d+)": "ph_urina",
-                r"glucoza\s*urina\s*[:=]?\s*(absent|urme|\+{1,3})": "glucoza_urina",
-                r"cetone\s*urina\s*[:=]?\s*(absent|urme|\+{1,3})": "cetone_urina",
-                r"bilirubina\s*urina\s*[:=]?\s*(absent|urme|\+{1,2})": "bilirubina_urina",
-                r"urobilinogen\s*[:=]?\s*(normal|crescut)": "urobilinogen_urina"
-            },
-            "hospitalization_patterns": [
-                r"(\d+)\s+(?:de\s+)?(?:zile|days?)",  # Detectează "8 zile" sau "8 de zile"
-                r"(\d+)\s+(?:de\s+)?(?:ore|hours?)",  # Detectează "8 ore" sau "8 de ore"
-                r"internat\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)",
-                r"spitalizat\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)",
-                r"(?:de\s+)?(\d+)\s+(?:de\s+)?(?:ore|hours?)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"internare\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)",
-                r"spitalizare\s+(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)",
-                r"(?:de\s+)?(\d+)\s+(?:de\s+)?(?:zile|days?)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"ziua\s+(\d+)\s+(?:de\s+)?(?:internare|spitalizare)",
-                r"day\s+(\d+)\s+of\s+(?:hospitalization|admission)"
-            ]
+            "bacteria_patterns": self.BACTERIA_PATTERNS,
+            "resistance_patterns": self.RESISTANCE_PATTERNS,
+            "urine_patterns": self.URINE_PATTERNS,
+            "hospitalization_patterns": self.HOSPITALIZATION_PATTERNS,
+            "vital_patterns": self.VITAL_PATTERNS
         }
     
     def extract_medical_data(self, text: str) -> Dict[str, Any]:
@@ -183,8 +219,8 @@ class ProfessionalAI:
         extracted = {}
         
         # Extrage bacterii cu pattern matching îmbunătățit
-        for pattern, bacterie in self.medical_knowledge["bacteria_patterns"].items():
-            if re.search(pattern, text_lower, re.IGNORECASE | re.UNICODE):
+        for pattern, bacterie in self.medical_knowledge["bacteria_patterns"]:
+            if pattern.search(text_lower):
                 extracted["bacterie"] = bacterie
                 extracted["cultura_pozitiva"] = True
                 logger.info(f"✅ Bacterie detectată: {bacterie}")
@@ -192,8 +228,8 @@ class ProfessionalAI:
         
         # Extrage rezistențe
         rezistente = []
-        for pattern, rezistenta in self.medical_knowledge["resistance_patterns"].items():
-            if re.search(pattern, text_lower, re.IGNORECASE | re.UNICODE):
+        for pattern, rezistenta in self.medical_knowledge["resistance_patterns"]:
+            if pattern.search(text_lower):
                 rezistente.append(rezistenta)
                 logger.info(f"✅ Rezistență detectată: {rezistenta}")
         
@@ -201,12 +237,12 @@ class ProfessionalAI:
             extracted["rezistente"] = rezistente
         
         # Extrage ore spitalizare cu algoritm îmbunătățit
-        for pattern in self.medical_knowledge["hospitalization_patterns"]:
-            match = re.search(pattern, text_lower, re.IGNORECASE | re.UNICODE)
+        for pattern, ore_per_unitate in self.medical_knowledge["hospitalization_patterns"]:
+            match = pattern.search(text_lower)
             if match:
                 value = int(match.group(1))
                 # Detectează dacă sunt zile sau ore
-                if "zile" in pattern or "days" in pattern or "ziua" in pattern:
+                if ore_per_unitate == 24:
                     extracted["ore_spitalizare"] = float(value * 24)
                     logger.info(f"✅ Spitalizare detectată: {value} zile = {value * 24} ore")
                 else:
@@ -215,22 +251,8 @@ class ProfessionalAI:
                 break
         
         # Extrage parametri vitali cu regex îmbunătățit
-        vital_patterns = {
-            r"temperatura?\s*[:=]?\s*(\d+(?:\.\d+)?)\s*°?c?": "temperatura",
-            r"temp\s*[:=]?\s*(\d+(?:\.\d+)?)\s*°?c?": "temperatura",
-            r"ta\s*[:=]?\s*(\d+)/(\d+)": "tensiune",
-            r"tensiune\s*[:=]?\s*(\d+)/(\d+)": "tensiune",
-            r"fc\s*[:=]?\s*(\d+)": "frecventa_cardiaca",
-            r"puls\s*[:=]?\s*(\d+)": "frecventa_cardiaca",
-            r"fr\s*[:=]?\s*(\d+)": "frecventa_respiratorie",
-            r"crp\s*[:=]?\s*(\d+(?:\.\d+)?)": "crp",
-            r"pct\s*[:=]?\s*(\d+(?:\.\d+)?)": "pct",
-            r"leucocite\s*[:=]?\s*(\d+(?:\.\d+)?)": "leucocite",
-            r"glasgow\s*[:=]?\s*(\d+)": "glasgow_coma_scale"
-        }
-        
-        for pattern, param in vital_patterns.items():
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for pattern, param in self.medical_knowledge["vital_patterns"]:
+            match = pattern.search(text_lower)
             if match:
                 if param == "tensiune":
                     extracted["tensiune_sistolica"] = int(match.group(1))
@@ -241,8 +263,8 @@ class ProfessionalAI:
                 logger.info(f"✅ Parametru detectat: {param} = {match.group(1)}")
         
         # Extrage parametri analize urinare
-        for pattern, param in self.medical_knowledge["urine_patterns"].items():
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for pattern, param in self.medical_knowledge["urine_patterns"]:
+            match = pattern.search(text_lower)
             if match:
                 value = match.group(1)
                 if param == "nitriti":
@@ -348,6 +370,67 @@ class ProfessionalAI:
 class AdvancedIAAMCalculator:
     """Calculator ultra-avansat pentru riscul IAAM"""
     
+    PATHOGEN_SCORES = {
+        "Pseudomonas aeruginosa": 25,
+        "Acinetobacter baumannii": 25,
+        "Klebsiella pneumoniae": 20,
+        "Escherichia coli": 15,
+        "Staphylococcus aureus": 20,
+        "Enterococcus faecium": 18,
+        "Candida auris": 30,
+        "Clostridioides difficile": 35
+    }
+    
+    # Reguli declarative pentru recomandări (ordinea textelor = ordinea regulilor)
+    RECOMMENDATION_RULES = (
+        # Recomandări de bază
+        RecommendationRule((
+            "🧼 Igienă strictă a mâinilor înainte și după contactul cu pacientul",
+            "🦠 Precauții de contact și izolare conform protocoalelor"
+        )),
+        # Recomandări specifice nivelului de risc
+        RecommendationRule((
+            "🔬 Monitorizare microbiologică intensivă (culturi săptămânale)",
+            "💊 Evaluare pentru terapie antimicrobiană profilactică",
+            "👥 Consultare specialist boli infecțioase"
+        ), ((("nivel_risc", "in", ("RIDICAT", "FOARTE RIDICAT", "CRITIC")),),)),
+        RecommendationRule((
+            "🏥 Izolare în cameră separată cu presiune negativă",
+            "⚡ Alertă echipă de control infecții nosocomiale",
+            "📊 Raportare către comisia de infecții nosocomiale"
+        ), ((("nivel_risc", "in", ("FOARTE RIDICAT", "CRITIC")),),)),
+        # Recomandări specifice dispozitivelor
+        RecommendationRule((
+            "🩸 Evaluare zilnică necesitate cateter venos central",
+            "🧽 Dezinfecție cu clorhexidină la manipularea cateterului"
+        ), ((("cateter_venos_central", "true", None),),)),
+        RecommendationRule((
+            "🚿 Evaluare zilnică necesitate cateter urinar",
+            "💧 Menținerea sistemului de drenaj închis"
+        ), ((("cateter_urinar", "true", None),),)),
+        RecommendationRule((
+            "🫁 Protocol de sevraj ventilator accelerat",
+            "🦷 Igienă orală cu clorhexidină"
+        ), ((("ventilatie_mecanica", "true", None),),)),
+        # Recomandări specifice microorganismelor (prima regulă îndeplinită din grup)
+        RecommendationRule(("💉 Considerare terapie combinată anti-Pseudomonas",),
+                           ((("bacterie", "contine", "Pseudomonas"),),), grup="microorganism"),
+        RecommendationRule(("🔬 Testare sensibilitate la colistin și tigecyclină",),
+                           ((("bacterie", "contine", "Acinetobacter"),),), grup="microorganism"),
+        RecommendationRule(("💊 Considerare vancomicină sau linezolid",),
+                           ((("bacterie", "true", None),), (("rezistente", "contine", "MRSA"),)), grup="microorganism"),
+        # Recomandări specifice analizei urinare
+        RecommendationRule(("🔬 Analiza culturii urinare pentru identificarea bacteriilor",),
+                           ((("cultura_urina_pozitiva", "true", None),),)),
+        RecommendationRule((" antibiotice adecvate pentru bacterii urinare",), ((("bacterii_urina", ">", 0),),)),
+        RecommendationRule(("🔬 Testare urina pentru bacterii urinare",), ((("nitriti", "true", None),),)),
+        RecommendationRule(("🔬 Testare urina pentru bacterii urinare",), ((("leucocit_esteraza", "true", None),),)),
+    )
+    
+    def __init__(self):
+        # Tabelul de recomandări compilat (măști de condiții, texte memorate per mască)
+        self.recommendations = RecommendationEngine(self.RECOMMENDATION_RULES)
+    
     def calculate_risk(self, data: PatientData) -> Dict[str, Any]:
         """Calculează riscul IAAM cu algoritm ultra-precis"""
         if data.ore_spitalizare < 48:
@@ -409,18 +492,7 @@ class AdvancedIAAMCalculator:
         scor_micro = 0
         if data.cultura_pozitiva and data.bacterie:
             # Scoring bazat pe patogenitatea bacteriei
-            pathogen_scores = {
-                "Pseudomonas aeruginosa": 25,
-                "Acinetobacter baumannii": 25,
-                "Klebsiella pneumoniae": 20,
-                "Escherichia coli": 15,
-                "Staphylococcus aureus": 20,
-                "Enterococcus faecium": 18,
-                "Candida auris": 30,
-                "Clostridioides difficile": 35
-            }
-            
-            scor_micro = pathogen_scores.get(data.bacterie, 10)
+            scor_micro = self.PATHOGEN_SCORES.get(data.bacterie, 10)
             componente["Microorganisme"] = f"{scor_micro} ({data.bacterie})"
             
             # Bonus pentru rezistențe
@@ -512,59 +584,7 @@ class AdvancedIAAMCalculator:
     
     def _generate_clinical_recommendations(self, nivel_risc: str, data: PatientData, scor: int) -> List[str]:
         """Generează recomandări clinice ultra-detaliate"""
-        recomandari = []
-        
-        # Recomandări de bază
-        recomandari.append("🧼 Igienă strictă a mâinilor înainte și după contactul cu pacientul")
-        recomandari.append("🦠 Precauții de contact și izolare conform protocoalelor")
-        
-        # Recomandări specifice nivelului de risc
-        if nivel_risc in ["RIDICAT", "FOARTE RIDICAT", "CRITIC"]:
-            recomandari.append("🔬 Monitorizare microbiologică intensivă (culturi săptămânale)")
-            recomandari.append("💊 Evaluare pentru terapie antimicrobiană profilactică")
-            recomandari.append("👥 Consultare specialist boli infecțioase")
-        
-        if nivel_risc in ["FOARTE RIDICAT", "CRITIC"]:
-            recomandari.append("🏥 Izolare în cameră separată cu presiune negativă")
-            recomandari.append("⚡ Alertă echipă de control infecții nosocomiale")
-            recomandari.append("📊 Raportare către comisia de infecții nosocomiale")
-        
-        # Recomandări specifice dispozitivelor
-        if data.cateter_venos_central:
-            recomandari.append("🩸 Evaluare zilnică necesitate cateter venos central")
-            recomandari.append("🧽 Dezinfecție cu clorhexidină la manipularea cateterului")
-        
-        if data.cateter_urinar:
-            recomandari.append("🚿 Evaluare zilnică necesitate cateter urinar")
-            recomandari.append("💧 Menținerea sistemului de drenaj închis")
-        
-        if data.ventilatie_mecanica:
-            recomandari.append("🫁 Protocol de sevraj ventilator accelerat")
-            recomandari.append("🦷 Igienă orală cu clorhexidină")
-        
-        # Recomandări specifice microorganismelor
-        if data.bacterie:
-            if "Pseudomonas" in data.bacterie:
-                recomandari.append("💉 Considerare terapie combinată anti-Pseudomonas")
-            elif "Acinetobacter" in data.bacterie:
-                recomandari.append("🔬 Testare sensibilitate la colistin și tigecyclină")
-            elif "MRSA" in str(data.rezistente):
-                recomandari.append("💊 Considerare vancomicină sau linezolid")
-        
-        # Recomandări specifice analizei urinare
-        if data.cultura_urina_pozitiva:
-            recomandari.append("🔬 Analiza culturii urinare pentru identificarea bacteriilor")
-        
-        if data.bacterii_urina > 0:
-            recomandari.append(" antibiotice adecvate pentru bacterii urinare")
-        
-        if data.nitriti:
-            recomandari.append("🔬 Testare urina pentru bacterii urinare")
-        
-        if data.leucocit_esteraza:
-            recomandari.append("🔬 Testare urina pentru bacterii urinare")
-        
-        return recomandari
+        return self.recommendations.recommend(data, nivel_risc=nivel_risc)
     
     def _generate_interpretation(self, nivel_risc: str, scor: int, data: PatientData) -> str:
         """Generează interpretare clinică detaliată"""
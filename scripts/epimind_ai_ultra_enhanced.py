@@ -29,14 +29,18 @@ import plotly.express as px
 import json
 import re
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional
 import requests
 import time
 import hashlib
 import base64
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import logging
 from io import BytesIO
+from device_duration import ANCHOR_KEY, HOSPITALIZATION_ANCHORS, DurationResolver, Mention
+from keyword_automaton import KeywordAutomaton
+from medical_patterns import PatternRegistry
+from patient_patch import FieldChange, apply_patch
 
 # Configurare logging
 logging.basicConfig(level=logging.INFO)
@@ -527,145 +531,164 @@ class PatientData:
             self.rezistente = []
         if self.timestamp is None:
             self.timestamp = datetime.now()
+    
+    def patch(self, values: Dict[str, Any]) -> Dict[str, FieldChange]:
+        """Aplică în loc valorile extrase (validate după tipul câmpului); returnează doar modificările"""
+        return apply_patch(self, values)
 
 class UltraEnhancedMedicalDataExtractor:
     """Extractor ultra-îmbunătățit pentru "internat de X ore/zile" și alte date medicale"""
     
-    def __init__(self):
-        # ÎMBUNĂTĂȚIT: Patterns specifice pentru "internat de X ore/zile"
-        self.patterns = {
-            "ore_spitalizare": [
-                # Patterns noi pentru "internat de X ore/zile"
-                r"internat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
-                r"internat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
-                r"internare\s+de\s+(\d+)\s+(?:ore|hours?|h)\b", 
-                r"internare\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
-                r"spitalizat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
-                r"spitalizat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
-                r"hospitalizat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
-                r"hospitalizat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
-                
-                # Patterns existente îmbunătățite
-                r"(?:internare|spitalizare|hospitalizare)[\s:]*(\d+)\s*(?:ore|hours?|h)\b",
-                r"(\d+)\s*(?:ore|hours?|h).*(?:internare|spitalizare|hospitalizare)",
-                r"(\d+)\s*(?:zile|days?|d).*(?:internare|spitalizare|hospitalizare)",
-                r"ziua\s*(\d+)(?:\s+de\s+(?:internare|spitalizare))?",
-                r"de\s*(\d+)\s*(?:zile|days?|d)(?:\s+de\s+(?:internare|spitalizare))?",
-                r"(\d+)\s*(?:days?|zile).*(?:hospital|admission|internare)",
-                r"length\s*of\s*stay[\s:]*(\d+)\s*(?:days?|zile|ore|hours?)",
-                r"los[\s:]*(\d+)\s*(?:days?|zile|ore|hours?)",
-                r"admission[\s:]*(\d+)\s*(?:days?|hours?|zile|ore)\s*ago",
-                
-                # Patterns pentru contexte mai complexe
-                r"pacientul\s+(?:este\s+)?internat\s+de\s+(\d+)\s+(?:ore|zile|hours?|days?)",
-                r"de\s+(\d+)\s+(?:ore|zile)\s+(?:este\s+)?(?:internat|spitalizat|hospitalizat)",
-                r"(\d+)\s+(?:ore|zile)\s+de\s+(?:la\s+)?(?:internare|spitalizare|admisie)",
-            ],
-            
-            # Patterns îmbunătățite pentru alte valori
-            "leucocite": [
-                r"(?:leucocite|wbc|gb|white\s+blood\s+cells?)[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"(\d+(?:[.,]\d+)?)\s*(?:x\s*)?10\^?[39].*(?:leucocite|wbc|gb)",
-                r"leucocite[\s:=]*(\d+(?:[.,]\d+)?)\s*(?:x\s*10\^?[39]|mii|k|thousand)?",
-                r"wbc[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"gb[\s:=]*(\d+(?:[.,]\d+)?)"
-            ],
-            
-            "crp": [
-                r"(?:crp|c[\s-]?reactive[\s-]?protein)[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"proteina\s+c\s+reactiva[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"pcr[\s:=]*(\d+(?:[.,]\d+)?)"
-            ],
-            
-            "procalcitonina": [
-                r"(?:procalcitonina|pct|procalcitonin)[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"procalcitonin[\s:=]*(\d+(?:[.,]\d+)?)"
-            ],
+    # Tabelele se compilează o singură dată, la import (registrul comun de pattern-uri)
+    # ÎMBUNĂTĂȚIT: Patterns specifice pentru "internat de X ore/zile"
+    PATTERNS = PatternRegistry.compile_table({
+        "ore_spitalizare": [
+            # Patterns noi pentru "internat de X ore/zile"
+            r"internat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
+            r"internat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
+            r"internare\s+de\s+(\d+)\s+(?:ore|hours?|h)\b", 
+            r"internare\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
+            r"spitalizat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
+            r"spitalizat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
+            r"hospitalizat\s+de\s+(\d+)\s+(?:ore|hours?|h)\b",
+            r"hospitalizat\s+de\s+(\d+)\s+(?:zile|days?|d)\b",
             
-            "temperatura": [
-                r"(?:temperatura|temp|t|febra)[\s:=]*(\d+(?:[.,]\d+)?)\s*°?c?",
-                r"(\d+(?:[.,]\d+)?)\s*°c",
-                r"temperature[\s:=]*(\d+(?:[.,]\d+)?)",
-                r"fever[\s:=]*(\d+(?:[.,]\d+)?)"
-            ],
+            # Patterns existente îmbunătățite
+            r"(?:internare|spitalizare|hospitalizare)[\s:]*(\d+)\s*(?:ore|hours?|h)\b",
+            r"(\d+)\s*(?:ore|hours?|h).*(?:internare|spitalizare|hospitalizare)",
+            r"(\d+)\s*(?:zile|days?|d).*(?:internare|spitalizare|hospitalizare)",
+            r"ziua\s*(\d+)(?:\s+de\s+(?:internare|spitalizare))?",
+            r"de\s*(\d+)\s*(?:zile|days?|d)(?:\s+de\s+(?:internare|spitalizare))?",
+            r"(\d+)\s*(?:days?|zile).*(?:hospital|admission|internare)",
+            r"length\s*of\s*stay[\s:]*(\d+)\s*(?:days?|zile|ore|hours?)",
+            r"los[\s:]*(\d+)\s*(?:days?|zile|ore|hours?)",
+            r"admission[\s:]*(\d+)\s*(?:days?|hours?|zile|ore)\s*ago",
             
-            "frecventa_cardiaca": [
-                r"(?:puls|fc|hr|frecventa\s+cardiaca|heart\s+rate)[\s:=]*(\d+)",
-                r"(\d+)\s*bpm",
-                r"pulse[\s:=]*(\d+)"
-            ],
-            
-            "tas": [
-                r"(?:ta|tensiune|pas|systolic|blood\s+pressure)[\s:=]*(\d+)(?:/\d+)?",
-                r"(\d+)/\d+\s*mmhg",
-                r"systolic[\s:=]*(\d+)",
-                r"bp[\s:=]*(\d+)/\d+"
-            ],
-            
-            "tad": [
-                r"(?:ta|tensiune|pad|diastolic)[\s:=]*\d+/(\d+)",
-                r"\d+/(\d+)\s*mmhg",
-                r"diastolic[\s:=]*(\d+)",
-                r"bp[\s:=]*\d+/(\d+)"
-            ]
-        }
-        
-        # Patterns pentru bacterii (îmbunătățite)
-        self.bacteria_patterns = [
-            (r"escherichia\s+coli|e\.?\s*coli", "Escherichia coli"),
-            (r"klebsiella\s+pneumoniae|k\.?\s*pneumoniae", "Klebsiella pneumoniae"),
-            (r"pseudomonas\s+aeruginosa|p\.?\s*aeruginosa", "Pseudomonas aeruginosa"),
-            (r"staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus", "Staphylococcus aureus"),
-            (r"acinetobacter\s+baumannii|a\.?\s*baumannii", "Acinetobacter baumannii"),
-            (r"enterococcus\s+faecium|e\.?\s*faecium", "Enterococcus faecium"),
-            (r"candida\s+auris|c\.?\s*auris", "Candida auris"),
-            (r"clostridioides\s+difficile|c\.?\s*difficile|cdiff", "Clostridioides difficile"),
-            (r"enterobacter\s+cloacae", "Enterobacter cloacae"),
-            (r"serratia\s+marcescens", "Serratia marcescens")
+            # Patterns pentru contexte mai complexe
+            r"pacientul\s+(?:este\s+)?internat\s+de\s+(\d+)\s+(?:ore|zile|hours?|days?)",
+            r"de\s+(\d+)\s+(?:ore|zile)\s+(?:este\s+)?(?:internat|spitalizat|hospitalizat)",
+            r"(\d+)\s+(?:ore|zile)\s+de\s+(?:la\s+)?(?:internare|spitalizare|admisie)",
+        ],
+        
+        # Patterns îmbunătățite pentru alte valori
+        "leucocite": [
+            r"(?:leucocite|wbc|gb|white\s+blood\s+cells?)[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"(\d+(?:[.,]\d+)?)\s*(?:x\s*)?10\^?[39].*(?:leucocite|wbc|gb)",
+            r"leucocite[\s:=]*(\d+(?:[.,]\d+)?)\s*(?:x\s*10\^?[39]|mii|k|thousand)?",
+            r"wbc[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"gb[\s:=]*(\d+(?:[.,]\d+)?)"
+        ],
+        
+        "crp": [
+            r"(?:crp|c[\s-]?reactive[\s-]?protein)[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"proteina\s+c\s+reactiva[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"pcr[\s:=]*(\d+(?:[.,]\d+)?)"
+        ],
+        
+        "procalcitonina": [
+            r"(?:procalcitonina|pct|procalcitonin)[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"procalcitonin[\s:=]*(\d+(?:[.,]\d+)?)"
+        ],
+        
+        "temperatura": [
+            r"(?:temperatura|temp|t|febra)[\s:=]*(\d+(?:[.,]\d+)?)\s*°?c?",
+            r"(\d+(?:[.,]\d+)?)\s*°c",
+            r"temperature[\s:=]*(\d+(?:[.,]\d+)?)",
+            r"fever[\s:=]*(\d+(?:[.,]\d+)?)"
+        ],
+        
+        "frecventa_cardiaca": [
+            r"(?:puls|fc|hr|frecventa\s+cardiaca|heart\s+rate)[\s:=]*(\d+)",
+            r"(\d+)\s*bpm",
+            r"pulse[\s:=]*(\d+)"
+        ],
+        
+        "tas": [
+            r"(?:ta|tensiune|pas|systolic|blood\s+pressure)[\s:=]*(\d+)(?:/\d+)?",
+            r"(\d+)/\d+\s*mmhg",
+            r"systolic[\s:=]*(\d+)",
+            r"bp[\s:=]*(\d+)/\d+"
+        ],
+        
+        "tad": [
+            r"(?:ta|tensiune|pad|diastolic)[\s:=]*\d+/(\d+)",
+            r"\d+/(\d+)\s*mmhg",
+            r"diastolic[\s:=]*(\d+)",
+            r"bp[\s:=]*\d+/(\d+)"
         ]
-        
-        # Patterns pentru rezistențe (îmbunătățite)
-        self.resistance_patterns = [
-            (r"esbl\+?|extended[\s-]?spectrum", "ESBL"),
-            (r"mrsa|methicillin[\s-]?resistant", "MRSA"),
-            (r"vre|vancomycin[\s-]?resistant", "VRE"),
-            (r"cre|carbapenem[\s-]?resistant", "CRE"),
-            (r"kpc|klebsiella[\s-]?pneumoniae[\s-]?carbapenemase", "KPC"),
-            (r"ndm|new[\s-]?delhi[\s-]?metallo", "NDM"),
-            (r"oxa|oxacillinase", "OXA"),
-            (r"vim|verona[\s-]?integron", "VIM"),
-            (r"imp|imipenemase", "IMP"),
-            (r"xdr|extensively[\s-]?drug[\s-]?resistant", "XDR"),
-            (r"pdr|pandrug[\s-]?resistant", "PDR")
+    }, re.IGNORECASE)
+    
+    # Patterns pentru bacterii (îmbunătățite)
+    BACTERIA_PATTERNS = PatternRegistry.compile_pairs([
+        (r"escherichia\s+coli|e\.?\s*coli", "Escherichia coli"),
+        (r"klebsiella\s+pneumoniae|k\.?\s*pneumoniae", "Klebsiella pneumoniae"),
+        (r"pseudomonas\s+aeruginosa|p\.?\s*aeruginosa", "Pseudomonas aeruginosa"),
+        (r"staphylococcus\s+aureus|s\.?\s*aureus|staph\s+aureus", "Staphylococcus aureus"),
+        (r"acinetobacter\s+baumannii|a\.?\s*baumannii", "Acinetobacter baumannii"),
+        (r"enterococcus\s+faecium|e\.?\s*faecium", "Enterococcus faecium"),
+        (r"candida\s+auris|c\.?\s*auris", "Candida auris"),
+        (r"clostridioides\s+difficile|c\.?\s*difficile|cdiff", "Clostridioides difficile"),
+        (r"enterobacter\s+cloacae", "Enterobacter cloacae"),
+        (r"serratia\s+marcescens", "Serratia marcescens")
+    ], re.IGNORECASE)
+    
+    # Patterns pentru rezistențe (îmbunătățite)
+    RESISTANCE_PATTERNS = PatternRegistry.compile_pairs([
+        (r"esbl\+?|extended[\s-]?spectrum", "ESBL"),
+        (r"mrsa|methicillin[\s-]?resistant", "MRSA"),
+        (r"vre|vancomycin[\s-]?resistant", "VRE"),
+        (r"cre|carbapenem[\s-]?resistant", "CRE"),
+        (r"kpc|klebsiella[\s-]?pneumoniae[\s-]?carbapenemase", "KPC"),
+        (r"ndm|new[\s-]?delhi[\s-]?metallo", "NDM"),
+        (r"oxa|oxacillinase", "OXA"),
+        (r"vim|verona[\s-]?integron", "VIM"),
+        (r"imp|imipenemase", "IMP"),
+        (r"xdr|extensively[\s-]?drug[\s-]?resistant", "XDR"),
+        (r"pdr|pandrug[\s-]?resistant", "PDR")
+    ], re.IGNORECASE)
+    
+    # Keywords pentru dispozitive (îmbunătățite)
+    DEVICE_KEYWORDS = {
+        "cateter_central": [
+            "cateter central", "cvc", "cateter venos central", 
+            "central line", "hickman", "port", "picc", "central venous"
+        ],
+        "ventilatie_mecanica": [
+            "ventilatie", "intubat", "respirator", "ventilator",
+            "mechanical ventilation", "cpap", "bipap", "intubation"
+        ],
+        "sonda_urinara": [
+            "sonda urinara", "cateter urinar", "foley",
+            "urinary catheter", "bladder catheter", "sonda vezicala"
+        ],
+        "traheostomie": [
+            "traheostomie", "canula", "tracheostomy",
+            "tracheal tube", "canula traheala"
+        ],
+        "drenaj": [
+            "dren", "drenaj", "drain", "chest tube",
+            "dren toracic", "dren abdominal", "drainage"
+        ],
+        "peg": [
+            "peg", "gastrostomie", "gastrostomy",
+            "feeding tube", "sonda gastrica", "percutaneous endoscopic"
         ]
-        
-        # Keywords pentru dispozitive (îmbunătățite)
-        self.device_keywords = {
-            "cateter_central": [
-                "cateter central", "cvc", "cateter venos central", 
-                "central line", "hickman", "port", "picc", "central venous"
-            ],
-            "ventilatie_mecanica": [
-                "ventilatie", "intubat", "respirator", "ventilator",
-                "mechanical ventilation", "cpap", "bipap", "intubation"
-            ],
-            "sonda_urinara": [
-                "sonda urinara", "cateter urinar", "foley",
-                "urinary catheter", "bladder catheter", "sonda vezicala"
-            ],
-            "traheostomie": [
-                "traheostomie", "canula", "tracheostomy",
-                "tracheal tube", "canula traheala"
-            ],
-            "drenaj": [
-                "dren", "drenaj", "drain", "chest tube",
-                "dren toracic", "dren abdominal", "drainage"
-            ],
-            "peg": [
-                "peg", "gastrostomie", "gastrostomy",
-                "feeding tube", "sonda gastrica", "percutaneous endoscopic"
-            ]
-        }
+    }
+    
+    # Dispozitive și ancorele de internare într-un singur automat; duratele se atribuie după proximitate
+    KEYWORDS = KeywordAutomaton({
+        "dispozitiv": {keyword: device for device, keywords in DEVICE_KEYWORDS.items() for keyword in keywords},
+        ANCHOR_KEY: {anchor: None for anchor in HOSPITALIZATION_ANCHORS}
+    })
+    DURATIONS = DurationResolver()
+    
+    def __init__(self):
+        self.patterns = self.PATTERNS
+        self.bacteria_patterns = self.BACTERIA_PATTERNS
+        self.resistance_patterns = self.RESISTANCE_PATTERNS
+        self.device_keywords = self.DEVICE_KEYWORDS
+        self.keywords = self.KEYWORDS
+        self.durations = self.DURATIONS
     
     def extract_from_text(self, text: str) -> Dict:
         """Extrage date medicale cu algoritm ultra-îmbunătățit"""
@@ -678,7 +701,7 @@ class UltraEnhancedMedicalDataExtractor:
         # Extrage valori numerice cu validare îmbunătățită
         for key, patterns in self.patterns.items():
             for pattern in patterns:
-                matches = re.finditer(pattern, text_lower, re.IGNORECASE)
+                matches = pattern.finditer(text_lower)
                 for match in matches:
                     try:
                         value_str = match.group(1).replace(',', '.')
@@ -760,7 +783,7 @@ class UltraEnhancedMedicalDataExtractor:
         
         # Extrage bacterii
         for pattern, bacterie in self.bacteria_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
+            if pattern.search(text_lower):
                 extracted["bacterie"] = bacterie
                 extracted["cultura_pozitiva"] = True
                 logger.info(f"Extracted bacterie: {bacterie}")
@@ -769,44 +792,38 @@ class UltraEnhancedMedicalDataExtractor:
         # Extrage rezistențe
         rezistente = []
         for pattern, rezistenta in self.resistance_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
+            if pattern.search(text_lower):
                 rezistente.append(rezistenta)
                 logger.info(f"Extracted rezistenta: {rezistenta}")
         
         if rezistente:
             extracted["rezistente"] = rezistente
         
-        # Extrage dispozitive cu durata
-        for device, keywords in self.device_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    extracted[device] = True
-                    logger.info(f"Extracted device: {device}")
-                    
-                    # Încearcă să găsească durata dispozitivului
-                    duration_patterns = [
-                        rf"{re.escape(keyword)}.*?(\d+)\s*(?:zile|days?|d)\b",
-                        rf"(\d+)\s*(?:zile|days?|d).*?{re.escape(keyword)}",
-                        rf"{re.escape(keyword)}.*?de\s*(\d+)\s*(?:zile|days?)",
-                        rf"de\s*(\d+)\s*(?:zile|days?).*?{re.escape(keyword)}"
-                    ]
-                    
-                    for duration_pattern in duration_patterns:
-                        duration_match = re.search(duration_pattern, text_lower, re.IGNORECASE)
-                        if duration_match:
-                            try:
-                                days = int(duration_match.group(1))
-                                if 0 <= days <= 365:  # validare rezonabilă
-                                    extracted[f"{device}_days"] = days
-                                    logger.info(f"Extracted {device}_days: {days}")
-                                    break
-                            except ValueError:
-                                continue
-                    break
+        # Extrage dispozitive cu durata (perechi mențiune-durată în aceeași propoziție)
+        mentions = [Mention(hit.valoare or ANCHOR_KEY, hit.start, hit.end) for hit in self.keywords.find(text_lower)]
+        devices = {mention.cheie for mention in mentions} - {ANCHOR_KEY}
+        device_days = self.durations.resolve(text_lower, mentions) if devices else {}
+        for device in self.device_keywords:
+            if device in devices:
+                extracted[device] = True
+                logger.info(f"Extracted device: {device}")
+                
+                days = device_days.get(device)
+                if days is not None and 0 <= days <= 365:  # validare rezonabilă
+                    extracted[f"{device}_days"] = days
+                    logger.info(f"Extracted {device}_days: {days}")
         
         logger.info(f"Total extracted data: {extracted}")
         return extracted
     
+    def extract_many(self, texts: Iterable[str], workers: Optional[int] = None, chunk_size: int = 500) -> Iterator[Dict]:
+        """Extracție în lot (procese paralele, câte un extractor per proces), rezultate în ordinea textelor.
+        
+        Echivalent cu extract_from_text pe fiecare text; vezi note_extraction pentru fișiere JSONL.
+        """
+        from note_extraction import extract_many
+        return extract_many(texts, "ultra", workers, chunk_size)
+    
     def validate_extracted_data(self, data: Dict) -> Dict:
         """Validează și curăță datele extrase"""
         validated = {}
@@ -1003,19 +1020,11 @@ class UltraFluidChatInterface:
         extracted_data = self.extractor.extract_from_text(user_input)
         validated_data = self.extractor.validate_extracted_data(extracted_data)
         
-        # Salvează ultima extracție pentru feedback
-        st.session_state.last_extraction = validated_data
-        
         # Actualizează datele pacientului
-        if validated_data:
-            current_data = asdict(st.session_state.patient_data)
-            current_data.update(validated_data)
-            
-            # Recreează obiectul PatientData
-            st.session_state.patient_data = PatientData(**{
-                k: v for k, v in current_data.items() 
-                if k in PatientData.__dataclass_fields__
-            })
+        changes = st.session_state.patient_data.patch(validated_data)
+        
+        # Salvează ultima extracție pentru feedback (doar valorile care s-au schimbat)
+        st.session_state.last_extraction = {camp: change.nou for camp, change in changes.items()}
         
         # Pregătește context pentru AI
         data_summary = self._format_current_data()
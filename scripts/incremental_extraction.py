@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Re-extracție incrementală pentru texte editate
+Extractorul păstrează între apeluri textul anterior și candidații găsiți
+(câmp, valoare, poziție). La un text nou se compară cu cel vechi (prefixul
+și sufixul comune), se rescanează doar regiunea modificată plus o margine
+de context, candidații de dinainte rămân, cei de după se deplasează, iar
+valorile finale se recombină. Costul urmează dimensiunea editării, nu a
+documentului (în afara comparației de prefix/sufix, făcută pe blocuri).
+
+Presupunere: nicio potrivire nu este mai lungă decât `margine` caractere
+(pattern-urile extractoarelor acoperă o etichetă și o valoare).
+
+Exemplu:
+    python incremental_extraction.py "CRP 120, internat de 5 zile" "CRP 150, internat de 5 zile"
+"""
+
+import argparse
+import sys
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from clinical_scanner import Candidate
+from streaming_extraction import merge, select
+
+def common_prefix(old: str, new: str) -> int:
+    """Lungimea prefixului comun (căutare binară pe comparații de blocuri)"""
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[low:middle] == new[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def common_suffix(old: str, new: str, limit: int) -> int:
+    """Lungimea sufixului comun, fără să depășească `limit` caractere (nu se suprapune cu prefixul)"""
+    low, high = 0, min(len(old), len(new), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:len(old) - low] == new[len(new) - middle:len(new) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def snap_left(text: str, position: int) -> int:
+    """Poziția coborâtă până după un spațiu (o potrivire nu începe în mijlocul unui cuvânt tăiat)"""
+    while position > 0 and not text[position - 1].isspace():
+        position -= 1
+    return max(position, 0)
+
+def snap_right(text: str, position: int) -> int:
+    """Poziția urcată până la un spațiu"""
+    while position < len(text) and not text[position].isspace():
+        position += 1
+    return min(position, len(text))
+
+def keeps_positions(text: str) -> bool:
+    """lower() păstrează lungimea textului (pozițiile candidaților sunt aceleași în ambele forme)"""
+    return text.isascii() or len(text.lower()) == len(text)
+
+class IncrementalExtractor:
+    """Extracție cu stare: candidații cu pozițiile lor se actualizează doar în regiunea editată"""
+
+    def __init__(self, candidates: Callable[[str], Iterable[Candidate]], politica: str = "specific",
+                 multiple: Iterable[str] = (), margine: int = 96):
+        self.candidates = candidates  # text cu litere mici → toți candidații, cu poziții în acel text
+        self.politica = politica
+        self.multiple = tuple(multiple)
+        self.margine = margine
+        self.text = ""
+        self.candidati: List[Candidate] = []
+        self.rescanat: Tuple[int, int] = (0, 0)  # regiunea rescanată la ultimul apel (în textul nou)
+
+    def update(self, text: str) -> Dict:
+        """Datele extrase din textul nou (rescanând doar regiunea modificată față de apelul anterior)"""
+        old = self.text
+        if not old or not keeps_positions(old) or not keeps_positions(text):
+            # primul apel, sau lower() schimbă pozițiile ("İ"): scanare completă
+            return self._rescan_all(text)
+
+        prefix = common_prefix(old, text)
+        if prefix == len(old) == len(text):
+            return self.values()
+        suffix = common_suffix(old, text, min(len(old), len(text)) - prefix)
+        old_end, new_end = len(old) - suffix, len(text) - suffix
+
+        # fereastra (în pozițiile textului vechi): editarea plus marginea, aliniată la spații și extinsă
+        # până la punctul fix: niciun candidat vechi nu o traversează parțial (o extindere poate
+        # atinge candidați verificați deja în aceeași trecere, deci trecerea se repetă)
+        shift = new_end - old_end
+        start, end = max(0, prefix - self.margine), old_end + self.margine
+        while True:
+            previous = (start, end)
+            for candidate in self.candidati:
+                if candidate.start < end and candidate.end > start:
+                    start, end = min(start, candidate.start), max(end, candidate.end)
+            start = snap_left(text, start)  # înaintea prefixului comun: aceeași poziție în ambele texte
+            end = snap_right(text, min(end + shift, len(text))) - shift
+            if (start, end) == previous:
+                break
+
+        kept = [c for c in self.candidati if c.end <= start]
+        after = [c for c in self.candidati if c.start >= end]
+        for candidate in after:
+            candidate.start += shift
+            candidate.end += shift
+        window_end = end + shift
+        fresh = list(self.candidates(text[start:window_end].lower()))
+        for candidate in fresh:
+            candidate.start += start
+            candidate.end += start
+
+        self.text = text
+        self.candidati = kept + fresh + after
+        self.rescanat = (start, window_end)
+        return self.values()
+
+    def values(self) -> Dict:
+        """Valorile finale per câmp (politica extractorului)"""
+        return merge(self.candidati, self.politica, self.multiple)
+
+    def sources(self) -> Dict[str, Tuple[int, int]]:
+        """Poziția în text a valorii alese pentru fiecare câmp (câmpurile multiple nu au o singură sursă)"""
+        grouped: Dict[str, List[Candidate]] = {}
+        for candidate in self.candidati:
+            grouped.setdefault(candidate.camp, []).append(candidate)
+        return {camp: select(group, self.politica).span for camp, group in grouped.items()
+                if camp not in self.multiple}
+
+    def reset(self):
+        """Uită textul și candidații (pacient nou)"""
+        self.text = ""
+        self.candidati = []
+        self.rescanat = (0, 0)
+
+    def _rescan_all(self, text: str) -> Dict:
+        """Scanare completă a textului"""
+        self.text = text
+        self.candidati = list(self.candidates(text.lower()))
+        self.rescanat = (0, len(text))
+        return self.values()
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: extracția UltraAdvancedNLP pe versiuni succesive ale unui text"""
+    parser = argparse.ArgumentParser(description="Re-extracție incrementală pentru texte editate")
+    parser.add_argument("texte", nargs="+", help="versiunile succesive ale textului")
+    args = parser.parse_args()
+
+    from epimind_ai_final_professional import UltraAdvancedNLP
+
+    extractor = object.__new__(UltraAdvancedNLP).incremental()  # extracția nu folosește vectorizatorul TF-IDF
+    for version, text in enumerate(args.texte, 1):
+        values = extractor.update(text)
+        start, end = extractor.rescanat
+        print(f"📝 Versiunea {version}: rescanat [{start}, {end}) din {len(text)} caractere")
+        for camp, (source_start, source_end) in extractor.sources().items():
+            print(f"   {camp:<24} {values[camp]!s:<24} ← {text[source_start:source_end]!r}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Automat Aho-Corasick pentru vocabularele de cuvinte-cheie medicale
+Toate vocabularele unei componente (dispozitive, bacterii, rezistențe,
+corecții OCR) intră într-un singur automat construit o singură dată;
+textul se parcurge o singură dată, caracter cu caracter, iar timpul de
+căutare nu depinde de numărul de cuvinte-cheie.
+
+Potrivirile respectă limitele de cuvânt ("port" nu se găsește în
+"important"), nu țin cont de majuscule, iar spațiile și cratimele
+consecutive contează ca un singur spațiu ("e.  coli" = "e. coli").
+
+Exemplu:
+    python keyword_automaton.py "CVC de 3 zile, E. coli ESBL+, fără MRSA"
+"""
+
+import argparse
+import bisect
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from medical_patterns import PatternRegistry
+
+# Spații și cratime consecutive → un singur spațiu (în text și în cuvintele-cheie)
+SPACES = PatternRegistry.compile(r"[\s\-]+")
+
+@dataclass
+class KeywordHit:
+    """Potrivire a unui cuvânt-cheie (poziția este în textul original, [start, end))"""
+    categorie: str
+    cuvant: str
+    valoare: Any
+    start: int
+    end: int
+
+def normalize_keyword(keyword: str) -> str:
+    """Forma în care cuvântul-cheie intră în automat"""
+    return SPACES.sub(" ", keyword.lower()).strip()
+
+class KeywordAutomaton:
+    """Automat Aho-Corasick (DFA complet pe alfabetul cuvintelor-cheie) cu categorii de vocabular"""
+
+    def __init__(self, vocabularies: Mapping[str, Mapping[str, Any]]):
+        self._keywords: List[Tuple[str, str, Any]] = []  # (categorie, cuvânt normalizat, valoare)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for categorie, vocabulary in vocabularies.items():
+            for keyword, valoare in vocabulary.items():
+                normalized = normalize_keyword(keyword)
+                if not normalized:
+                    raise ValueError(f"Cuvânt-cheie gol în vocabularul {categorie!r}")
+                state = 0
+                for char in normalized:
+                    following = goto[state].get(char)
+                    if following is None:
+                        following = goto[state][char] = len(goto)
+                        goto.append({})
+                        outputs.append([])
+                    state = following
+                outputs[state].append(len(self._keywords))
+                self._keywords.append((categorie, normalized, valoare))
+
+        # legăturile de eșec (BFS), apoi tranzițiile complete: un singur lookup per caracter la căutare
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            for char, following in goto[state].items():
+                fail[following] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(following)
+        self._delta = delta
+        self._outputs = [tuple(output) for output in outputs]
+        self.categorii = tuple(vocabularies)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def find(self, text: str, categorii: Optional[Iterable[str]] = None) -> List[KeywordHit]:
+        """Toate potrivirile (inclusiv suprapuse), în ordinea sfârșitului în text"""
+        wanted = None if categorii is None else set(categorii)
+        collapsed, offsets, removed = self._collapse(text)
+        delta, outputs, keywords = self._delta, self._outputs, self._keywords
+        last = len(collapsed)
+        hits = []
+        state = 0
+        for index, char in enumerate(collapsed):
+            state = delta[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for keyword_index in outputs[state]:
+                categorie, keyword, valoare = keywords[keyword_index]
+                if wanted is not None and categorie not in wanted:
+                    continue
+                start, end = index + 1 - len(keyword), index + 1
+                # limite de cuvânt (ca \b): doar la capetele alfanumerice ale cuvântului-cheie
+                if start > 0 and keyword[0].isalnum() and collapsed[start - 1].isalnum():
+                    continue
+                if end < last and keyword[-1].isalnum() and collapsed[end].isalnum():
+                    continue
+                hits.append(KeywordHit(categorie, keyword, valoare,
+                                       self._original(start, offsets, removed, False),
+                                       self._original(end, offsets, removed, True)))
+        return hits
+
+    def replace(self, text: str, categorie: str) -> str:
+        """Înlocuiește potrivirile categoriei cu valorile lor (cea mai din stânga, apoi cea mai lungă)"""
+        hits = sorted(self.find(text, (categorie,)), key=lambda hit: (hit.start, -hit.end))
+        parts, position = [], 0
+        for hit in hits:
+            if hit.start < position:
+                continue  # suprapusă cu o înlocuire anterioară
+            parts.append(text[position:hit.start])
+            parts.append(str(hit.valoare))
+            position = hit.end
+        parts.append(text[position:])
+        return "".join(parts)
+
+    @staticmethod
+    def _collapse(text: str) -> Tuple[str, List[int], List[int]]:
+        """Textul cu majuscule mici și spații comasate, plus corecția pozițiilor spre textul original"""
+        lowered = text.lower()
+        if len(lowered) != len(text):  # litere care se extind la lower() (rar): caracter cu caracter
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        offsets, removed = [], []  # pozițiile (comasate) după fiecare grup de spații și totalul eliminat
+        parts, position, total = [], 0, 0
+        for match in SPACES.finditer(lowered):
+            start, end = match.span()
+            parts.append(lowered[position:start])
+            parts.append(" ")
+            position = end
+            if end - start > 1:
+                total += end - start - 1
+                offsets.append(start - (total - (end - start - 1)) + 1)
+                removed.append(total)
+        parts.append(lowered[position:])
+        return "".join(parts), offsets, removed
+
+    @staticmethod
+    def _original(index: int, offsets: List[int], removed: List[int], is_end: bool) -> int:
+        """Poziția din textul comasat → poziția din textul original"""
+        if not offsets:
+            return index
+        group = bisect.bisect_right(offsets, index - 1 if is_end else index) - 1
+        return index + (removed[group] if group >= 0 else 0)
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: potrivirile vocabularului extractorului Enhanced"""
+    parser = argparse.ArgumentParser(description="Automat Aho-Corasick pentru cuvinte-cheie medicale")
+    parser.add_argument("text", help="textul în care se caută")
+    args = parser.parse_args()
+
+    from epimind_ai_enhanced import EnhancedMedicalDataExtractor
+
+    automaton = EnhancedMedicalDataExtractor.KEYWORDS
+    print(f"🔤 {len(automaton)} cuvinte-cheie în categoriile {', '.join(automaton.categorii)}")
+    for hit in automaton.find(args.text):
+        print(f"{hit.start:>5}-{hit.end:<5} {hit.categorie:<12} {args.text[hit.start:hit.end]!r} → {hit.valoare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
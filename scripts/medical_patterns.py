@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Registrul comun de expresii regulate pentru extractoarele de date medicale
+Extractoarele (Enhanced, UltraEnhanced, UltraAdvancedNLP, ProfessionalAI)
+își declară tabelele de pattern-uri ca atribute de clasă compilate prin
+registru, deci fiecare pattern se compilează o singură dată, la import,
+inclusiv pattern-urile parametrizate per cuvânt-cheie
+
+Exemplu:
+    python medical_patterns.py            # numărul de pattern-uri compilate
+    python medical_patterns.py --list     # și lista lor
+"""
+
+import argparse
+import re
+import sys
+from typing import Dict, Iterable, Mapping, Pattern, Sequence, Tuple, TypeVar
+
+V = TypeVar("V")
+
+KEYWORD_PLACEHOLDER = "{keyword}"
+
+class PatternRegistry:
+    """Cache de pattern-uri compilate, partajat de toate extractoarele (cheie: text + flags)"""
+
+    _compiled: Dict[Tuple[str, int], Pattern] = {}
+
+    @classmethod
+    def compile(cls, pattern: str, flags: int = 0) -> Pattern:
+        """Pattern-ul compilat (o singură compilare per pereche text/flags)"""
+        key = (pattern, flags)
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            compiled = cls._compiled[key] = re.compile(pattern, flags)
+        return compiled
+
+    @classmethod
+    def compile_table(cls, table: Mapping[str, Sequence[str]], flags: int = 0) -> Dict[str, Tuple[Pattern, ...]]:
+        """Tabel câmp → pattern-uri alternative, în ordinea de încercare"""
+        return {key: tuple(cls.compile(pattern, flags) for pattern in patterns) for key, patterns in table.items()}
+
+    @classmethod
+    def compile_pairs(cls, pairs: Iterable[Tuple[str, V]], flags: int = 0) -> Tuple[Tuple[Pattern, V], ...]:
+        """Perechi (pattern, valoare asociată), de ex. pattern → nume bacterie sau câmp"""
+        return tuple((cls.compile(pattern, flags), value) for pattern, value in pairs)
+
+    @classmethod
+    def keyword_patterns(cls, templates: Sequence[str], keywords: Iterable[str],
+                         flags: int = 0) -> Dict[str, Tuple[Pattern, ...]]:
+        """Pattern-urile parametrizate per cuvânt-cheie ({keyword} se înlocuiește cu re.escape(cuvânt))"""
+        return {keyword: tuple(cls.compile(template.replace(KEYWORD_PLACEHOLDER, re.escape(keyword)), flags)
+                               for template in templates)
+                for keyword in keywords}
+
+    @classmethod
+    def patterns(cls) -> Tuple[Pattern, ...]:
+        """Toate pattern-urile compilate până acum"""
+        return tuple(cls._compiled.values())
+
+    @classmethod
+    def size(cls) -> int:
+        """Numărul de pattern-uri compilate"""
+        return len(cls._compiled)
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: încarcă extractoarele și afișează registrul"""
+    parser = argparse.ArgumentParser(description="Registrul de expresii regulate al extractoarelor medicale")
+    parser.add_argument("--list", action="store_true", help="afișează și pattern-urile compilate")
+    args = parser.parse_args()
+
+    import epimind_ai_enhanced  # noqa: F401 - tabelele se compilează la import
+    import epimind_ai_final_professional  # noqa: F401
+    import epimind_ai_professional  # noqa: F401
+    import epimind_ai_ultra_enhanced  # noqa: F401
+    # registrul folosit de extractoare (rulat ca script, acest fișier este __main__)
+    from medical_patterns import PatternRegistry as registry
+
+    if args.list:
+        for pattern in registry.patterns():
+            print(f"{pattern.flags:>4}  {pattern.pattern}")
+    print(f"🧩 {registry.size()} pattern-uri compilate")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Extracție în lot din note clinice arhivate (linie de comandă)
+Citește note JSONL ({"patient_id"/"id", "text", opțional "timestamp"}) sau
+text simplu (o notă pe linie), împarte fișierul în fragmente procesate în
+paralel (ProcessPoolExecutor; fiecare proces își creează extractorul o
+singură dată, deci pattern-urile și automatele se compilează o dată per
+proces) și scrie înregistrările PatientData ca JSONL, în ordinea notelor.
+O notă invalidă (JSON corupt, marcaj temporal ne-ISO, eroare de extracție)
+nu oprește lotul: în locul ei se scrie {"eroare": ..., "nota": nr. liniei},
+iar numărul de erori se raportează la final
+
+Exemplu:
+    python note_extraction.py note_internare.jsonl --extractor enhanced --workers 8 -o pacienti.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS = ("enhanced", "ultra")
+
+# Extractorul fiecărui proces de lucru (creat o singură dată în init_worker)
+_extractor = None
+_patient_class = None
+
+def create_extractor(name: str) -> Tuple[Any, type]:
+    """Extractorul ales și clasa PatientData a modulului lui (importul Streamlit doar în procesele de lucru)"""
+    if name == "enhanced":
+        from epimind_ai_enhanced import EnhancedMedicalDataExtractor, PatientData
+        return EnhancedMedicalDataExtractor(), PatientData
+    if name == "ultra":
+        from epimind_ai_ultra_enhanced import PatientData, UltraEnhancedMedicalDataExtractor
+        return UltraEnhancedMedicalDataExtractor(), PatientData
+    raise ValueError(f"Extractor necunoscut: {name} (disponibile: {', '.join(EXTRACTORS)})")
+
+def init_worker(name: str):
+    """Inițializează extractorul în procesul de lucru"""
+    global _extractor, _patient_class
+    _extractor, _patient_class = create_extractor(name)
+
+def parse_note(fmt: str, item: Any) -> Optional[Dict[str, Any]]:
+    """Decodează o notă (linie JSONL, linie de text sau text/dicționar) în {"text", ...}; None pentru o linie goală"""
+    if fmt == "jsonl":
+        if not item.strip():
+            return None
+        note = json.loads(item)
+        if not isinstance(note, dict):
+            raise ValueError(f"linia JSONL nu este un obiect: {type(note).__name__}")
+        return note
+    if fmt == "text":
+        return {"text": item.rstrip("\n")} if item.strip() else None
+    return item if isinstance(item, dict) else {"text": item}
+
+def patient_record(extractor, patient_class: type, extracted: Dict[str, Any], note: Dict[str, Any]) -> Dict[str, Any]:
+    """Înregistrarea PatientData a unei note (datele validate peste valorile implicite)"""
+    values = {key: value for key, value in extractor.validate_extracted_data(extracted).items()
+              if key in patient_class.__dataclass_fields__}
+    patient_id = note.get("patient_id")
+    if patient_id is None:
+        patient_id = note.get("id")
+    if patient_id is not None:  # "id": 0 este un identificator valid
+        values["patient_id"] = str(patient_id)
+    if note.get("timestamp"):
+        values["timestamp"] = datetime.fromisoformat(note["timestamp"])
+    return asdict(patient_class(**values))
+
+def extract_chunk(task: Tuple[str, List[Any], bool, int]) -> Tuple[int, Any, int]:
+    """Extrage un fragment în procesul de lucru: datele extrase per notă sau liniile JSONL PatientData.
+
+    Returnează numărul de note, rezultatele și numărul de erori; o notă care nu poate fi
+    decodată sau extrasă devine o înregistrare de eroare, iar restul fragmentului continuă.
+    """
+    fmt, payload, as_records, offset = task
+    results, errors = [], 0
+    for position, item in enumerate(payload, offset + 1):
+        try:
+            note = parse_note(fmt, item)
+            if note is None:
+                continue
+            extracted = _extractor.extract_from_text(note.get("text") or "")
+            result = patient_record(_extractor, _patient_class, extracted, note) if as_records else extracted
+        except Exception as e:  # o notă invalidă nu oprește lotul
+            logger.warning(f"Nota {position} nu a putut fi extrasă: {e}")
+            result = {"eroare": f"{type(e).__name__}: {e}", "nota": position}
+            errors += 1
+        results.append(result)
+    if not as_records:
+        return len(results), results, errors
+    lines = "".join(json.dumps(result, ensure_ascii=False, default=str) + "\n" for result in results)
+    return len(results), lines, errors
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[Tuple[str, List[str]]]:
+    """Generator: fragmente brute din fișier (decodarea se face în procesele de lucru)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".jsonl", ".ndjson", ".txt"):
+        raise ValueError(f"Format de fișier nesuportat: {extension} (JSONL sau TXT, o notă pe linie)")
+    fmt = "text" if extension == ".txt" else "jsonl"
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            yield fmt, lines
+
+def _with_offsets(chunks: Iterable[Tuple[str, List[Any]]]) -> Iterator[Tuple[str, List[Any], int]]:
+    """Generator: fragmentele cu numărul de linii/note dinaintea lor"""
+    offset = 0
+    for fmt, payload in chunks:
+        yield fmt, payload, offset
+        offset += len(payload)
+
+def run_chunks(chunks: Iterable[Tuple[str, List[Any]]], extractor: str = "enhanced", workers: Optional[int] = None,
+               as_records: bool = True) -> Iterator[Tuple[int, Any, int]]:
+    """Generator: (note, rezultate, erori) per fragment, în ordinea de intrare, cu un număr limitat de fragmente în lucru"""
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Extractor necunoscut: {extractor} (disponibile: {', '.join(EXTRACTORS)})")
+    workers = workers or os.cpu_count() or 1
+    # poziția primei note a fiecărui fragment (numerotarea înregistrărilor de eroare)
+    tasks = ((fmt, payload, as_records, offset) for fmt, payload, offset in _with_offsets(chunks))
+    if workers == 1:  # fără procese de lucru (loturi mici, depanare)
+        init_worker(extractor)
+        for task in tasks:
+            yield extract_chunk(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(extractor,)) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(extract_chunk, task))
+            # fereastră mărginită: memoria nu crește cu numărul de note
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def extract_many(texts: Iterable[Any], extractor: str = "enhanced", workers: Optional[int] = None,
+                 chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Generator: datele extrase din fiecare text (sau notă {"text": ...}), în ordinea de intrare
+    (o notă care nu poate fi extrasă dă {"eroare": ..., "nota": poziția ei})"""
+    iterator = iter(texts)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    for _, extracted, _ in run_chunks((("notes", chunk) for chunk in chunks), extractor, workers, as_records=False):
+        yield from extracted
+
+def main():
+    """Punctul de intrare al liniei de comandă"""
+    parser = argparse.ArgumentParser(description="Extracție în lot din note clinice arhivate")
+    parser.add_argument("input", help="fișier JSONL (câmpul text) sau TXT (o notă pe linie)")
+    parser.add_argument("--extractor", choices=EXTRACTORS, default="enhanced",
+                        help="enhanced (EnhancedMedicalDataExtractor) sau ultra (UltraEnhancedMedicalDataExtractor)")
+    parser.add_argument("--workers", type=int, default=None, help="procese de lucru (implicit: numărul de nuclee)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="note per fragment")
+    parser.add_argument("-o", "--output", default="-", help="fișier JSONL de ieșire (implicit stdout)")
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    total = failed = 0
+    try:
+        for count, lines, errors in run_chunks(iter_chunks(args.input, args.chunk_size), args.extractor, args.workers):
+            output.write(lines)
+            total += count
+            failed += errors
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {total - failed} note extrase în {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} note/s, "
+          f"extractor {args.extractor}, {args.workers or os.cpu_count()} procese)", file=sys.stderr)
+    if failed:
+        print(f"⚠️ {failed} note nu au putut fi extrase (înregistrări cu câmpul \"eroare\")", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Actualizarea în loc a fișei pacientului cu datele extrase
+Valorile extrase dintr-un mesaj se aplică direct pe obiectul PatientData
+existent, câmp cu câmp: câmpurile necunoscute și cele de identificare se
+ignoră, valorile se aduc la tipul declarat al câmpului (cele incompatibile
+se ignoră cu avertisment), iar rezultatul este setul de modificări
+(valoare veche → valoare nouă) doar pentru câmpurile care chiar s-au
+schimbat. Fișa nu mai trece prin asdict() și reconstrucție la fiecare
+mesaj, iar scorarea și interfața pot reacționa doar la ce s-a modificat.
+
+Exemplu:
+    python patient_patch.py '{"crp": 150, "cateter_central": true, "cateter_central_days": 3}'
+"""
+
+import argparse
+import json
+import logging
+import numbers
+import sys
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple, get_origin
+
+logger = logging.getLogger(__name__)
+
+# Câmpurile de identificare nu se modifică din datele extrase (patient_id este cheia rescorării)
+PROTECTED_FIELDS = ("patient_id", "timestamp")
+
+@dataclass(frozen=True)
+class FieldChange:
+    """Modificarea unui câmp al pacientului"""
+    camp: str
+    vechi: Any
+    nou: Any
+
+@lru_cache(maxsize=None)
+def field_types(cls: type) -> Dict[str, Any]:
+    """Tipul declarat al fiecărui câmp al clasei (calculat o singură dată per clasă)"""
+    return {field.name: field.type for field in fields(cls)}
+
+def coerce(tip: Any, value: Any) -> Any:
+    """Valoarea adusă la tipul câmpului (TypeError dacă nu este compatibilă)"""
+    if tip is bool:
+        if isinstance(value, bool):
+            return value
+    elif tip in (int, float):
+        if isinstance(value, numbers.Real) and not isinstance(value, bool):
+            return tip(value)
+    elif tip is str:
+        if isinstance(value, str):
+            return value.strip()
+    elif tip is list or get_origin(tip) is list:
+        if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+            return list(value)  # copie: lista extractorului nu devine a pacientului
+    else:
+        return value
+    raise TypeError(f"{type(value).__name__} în loc de {getattr(tip, '__name__', tip)}")
+
+def apply_patch(record: Any, values: Mapping[str, Any],
+                protected: Tuple[str, ...] = PROTECTED_FIELDS) -> Dict[str, FieldChange]:
+    """Aplică valorile pe fișa pacientului, în loc; returnează modificările efective per câmp"""
+    types = field_types(type(record))
+    changes: Dict[str, FieldChange] = {}
+    for camp, value in values.items():
+        if camp not in types or camp in protected:
+            continue
+        try:
+            value = coerce(types[camp], value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Valoare ignorată pentru {camp}={value!r}: {e}")
+            continue
+        old = getattr(record, camp)
+        if old != value:
+            setattr(record, camp, value)
+            changes[camp] = FieldChange(camp, old, value)
+    return changes
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: modificările aplicate pe o fișă PatientData nouă"""
+    parser = argparse.ArgumentParser(description="Actualizarea în loc a fișei pacientului")
+    parser.add_argument("valori", help="valorile extrase, ca obiect JSON")
+    args = parser.parse_args()
+
+    from epimind_ai_enhanced import PatientData
+
+    patient = PatientData()
+    changes = patient.patch(json.loads(args.valori))
+    for change in changes.values():
+        print(f"✏️ {change.camp}: {change.vechi!r} → {change.nou!r}")
+    print(f"✅ {len(changes)} câmpuri modificate pentru pacientul {patient.patient_id}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Motor compilat de reguli pentru recomandările clinice IAAM
+Regulile declarative (condiții -> texte) se compilează o singură dată;
+fiecare pacient devine o mască de biți a condițiilor îndeplinite, iar
+lista de recomandări se construiește o singură dată per mască
+"""
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Predicat: (câmp, operator, valoare); câmpurile de context (ex. "nivel_risc") se dau separat de pacient
+Predicate = Tuple[str, str, Any]
+# Condiție compilată: (pacient, context) -> îndeplinită
+Check = Callable[[Any, Mapping[str, Any]], bool]
+
+COMPARISONS = {">": np.greater, "<": np.less, ">=": np.greater_equal, "<=": np.less_equal}
+SCALAR_COMPARISONS = {">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le}
+
+# Măștile lotului sunt int64: bitul 63 ar depăși intervalul
+MAX_RULES = 63
+
+@dataclass(frozen=True)
+class RecommendationRule:
+    """Regulă: toate clauzele (fiecare = oricare dintre predicate) -> texte.
+
+    Dintre regulile aceluiași grup se aplică doar prima îndeplinită (lanț if/elif).
+    """
+    texte: Tuple[str, ...]
+    conditii: Tuple[Tuple[Predicate, ...], ...] = ()
+    grup: Optional[str] = None
+
+def evaluate_predicate(column: np.ndarray, op: str, value: Any) -> np.ndarray:
+    """Evaluează un predicat pe o coloană (lot de pacienți)"""
+    if op == "true":
+        # o valoare lipsă (NaN) nu îndeplinește condiția, deși bool(nan) este True
+        if column.dtype == object:
+            return np.fromiter((bool(item) and item == item for item in column), dtype=bool, count=len(column))
+        if column.dtype.kind == "f":
+            return np.nan_to_num(column, nan=0.0).astype(bool)
+        return column.astype(bool)
+    if op == "in":
+        return np.isin(column, list(value))
+    if op == "contine":
+        return np.fromiter((value in str(item) for item in column), dtype=bool, count=len(column))
+    return COMPARISONS[op](column.astype(float), value)
+
+def compile_predicate(op: str, value: Any) -> Callable[[Any], bool]:
+    """Testul unui predicat pentru o singură valoare (un pacient)"""
+    if op == "true":
+        return bool
+    if op == "in":
+        return frozenset(value).__contains__
+    if op == "contine":
+        return lambda item: value in str(item)
+    if op in SCALAR_COMPARISONS:
+        compare = SCALAR_COMPARISONS[op]
+        return lambda item: compare(item, value)
+    raise ValueError(f"Operator necunoscut în regulă: {op}")
+
+def _any(checks: Sequence[Check]) -> Check:
+    """Clauză: oricare dintre predicate"""
+    if len(checks) == 1:
+        return checks[0]
+    def clause(patient: Any, context: Mapping[str, Any]) -> bool:
+        for check in checks:
+            if check(patient, context):
+                return True
+        return False
+    return clause
+
+def _all(checks: Sequence[Check]) -> Check:
+    """Regulă: toate clauzele"""
+    if len(checks) == 1:
+        return checks[0]
+    def rule(patient: Any, context: Mapping[str, Any]) -> bool:
+        for check in checks:
+            if not check(patient, context):
+                return False
+        return True
+    return rule
+
+class RecommendationEngine:
+    """Evaluator de măști de condiții cu recomandări memorate per mască"""
+
+    def __init__(self, rules: Sequence[RecommendationRule], context: Sequence[str] = ("nivel_risc",)):
+        self.rules = tuple(rules)
+        if len(self.rules) > MAX_RULES:
+            raise ValueError(f"Cel mult {MAX_RULES} reguli per motor (măști int64), nu {len(self.rules)}")
+        self.context = tuple(context)
+        # regulile fără condiții sunt mereu active
+        self._always = sum(1 << bit for bit, rule in enumerate(self.rules) if not rule.conditii)
+        self._checks = self._compile()
+        self._texts: Dict[int, Tuple[str, ...]] = {}
+
+    def _compile(self) -> Tuple[Tuple[int, Check], ...]:
+        """Compilează condițiile fiecărei reguli într-o singură funcție (închideri, fără cod generat)"""
+        return tuple(
+            (1 << bit, _all([_any([self._predicate(*predicate) for predicate in clause]) for clause in rule.conditii]))
+            for bit, rule in enumerate(self.rules) if rule.conditii
+        )
+
+    def _predicate(self, field: str, op: str, value: Any) -> Check:
+        """Predicatul aplicat pe câmpul pacientului sau pe câmpul de context"""
+        test = compile_predicate(op, value)
+        if field in self.context:
+            return lambda patient, context: test(context.get(field))
+        read = operator.attrgetter(field)
+        return lambda patient, context: test(read(patient))
+
+    def fields(self) -> Tuple[str, ...]:
+        """Câmpurile pacientului citite de reguli (fără câmpurile de context)"""
+        return tuple(dict.fromkeys(
+            field for rule in self.rules for clause in rule.conditii for field, _, _ in clause
+            if field not in self.context
+        ))
+
+    def mask(self, patient: Any, **context: Any) -> int:
+        """Masca de biți a regulilor îndeplinite pentru un pacient"""
+        m = self._always
+        for bit, check in self._checks:
+            if check(patient, context):
+                m |= bit
+        return m
+
+    def masks(self, columns: Mapping[str, Any], n: int) -> np.ndarray:
+        """Măștile pentru un lot de pacienți (coloane NumPy, inclusiv câmpurile de context)"""
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        masks = np.full(n, self._always, dtype=np.int64)
+        for bit, rule in enumerate(self.rules):
+            if not rule.conditii:
+                continue
+            active = np.ones(n, dtype=bool)
+            for clause in rule.conditii:
+                any_met = np.zeros(n, dtype=bool)
+                for field, op, value in clause:
+                    any_met |= evaluate_predicate(arrays[field], op, value)
+                active &= any_met
+            masks |= np.where(active, 1 << bit, 0)
+        return masks
+
+    def texts(self, mask: int) -> Tuple[str, ...]:
+        """Recomandările pentru o mască (construite o singură dată)"""
+        texts = self._texts.get(mask)
+        if texts is None:
+            collected, groups = [], set()
+            for bit, rule in enumerate(self.rules):
+                if not mask & (1 << bit) or (rule.grup is not None and rule.grup in groups):
+                    continue
+                if rule.grup is not None:
+                    groups.add(rule.grup)
+                collected.extend(rule.texte)
+            texts = self._texts[mask] = tuple(collected)
+        return texts
+
+    def recommend(self, patient: Any, **context: Any) -> List[str]:
+        """Lista de recomandări pentru un pacient"""
+        return list(self.texts(self.mask(patient, **context)))
+
+    def recommend_batch(self, columns: Mapping[str, Any], n: int) -> List[Tuple[str, ...]]:
+        """Recomandările pentru un lot (tupluri partajate între pacienții cu aceeași mască)"""
+        masks = self.masks(columns, n)
+        unique, inverse = np.unique(masks, return_inverse=True)
+        texts = [self.texts(int(mask)) for mask in unique]
+        return [texts[index] for index in inverse]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Motor de alerte IAAM la traversarea pragurilor de risc
+Primește actualizări incrementale de scor (din ward_stream sau din
+interfață) și emite o alertă când pacientul trece granița unui nivel
+(50/80/110/140), cu benzi de histerezis contra oscilațiilor și cu
+debounce per pacient. O de-escaladare din fereastra de debounce rămâne în
+așteptare și se emite prin flush(now) când fereastra expiră, chiar dacă
+pentru pacient nu mai sosesc evenimente (ward_stream emite doar schimbări)
+"""
+
+import bisect
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+@dataclass
+class RiskAlert:
+    """Alertă de schimbare a nivelului de risc"""
+    patient_id: str
+    timestamp: float
+    scor: float
+    nivel: str
+    nivel_anterior: str
+    escaladare: bool
+
+class AlertEngine:
+    """Niveluri cu histerezis și debounce, stare compactă per pacient"""
+
+    def __init__(self, thresholds: Sequence[float], levels: Sequence[str],
+                 hysteresis: float = 5.0, debounce_seconds: float = 15 * 60):
+        if len(levels) != len(thresholds) + 1:
+            raise ValueError("Numărul de niveluri trebuie să fie egal cu numărul de praguri + 1")
+        self.thresholds = tuple(thresholds)
+        self.levels = tuple(levels)
+        self.hysteresis = hysteresis
+        self.debounce_seconds = debounce_seconds
+        # patient_id -> [nivel curent (cu histerezis), nivel ultima alertă, momentul ultimei alerte, ultimul scor]
+        self._state: Dict[str, list] = {}
+        # patient_id -> momentul de la care de-escaladarea amânată poate fi emisă
+        self._pending: Dict[str, float] = {}
+
+    def level_index(self, score: float, current: Optional[int] = None) -> int:
+        """Nivelul pentru scor; coborârea cere scăderea sub prag minus banda de histerezis"""
+        raw = bisect.bisect_right(self.thresholds, score)
+        if current is None or raw >= current:
+            return raw
+        return max(raw, min(current, bisect.bisect_right(self.thresholds, score + self.hysteresis)))
+
+    def observe(self, patient_id: str, score: float, timestamp: float) -> Optional[RiskAlert]:
+        """Aplică o actualizare de scor; returnează alerta de emis sau None"""
+        state = self._state.get(patient_id)
+        if state is None:
+            # referința unui pacient nou este nivelul minim: prima evaluare peste el alertează
+            state = self._state[patient_id] = [0, 0, None, score]
+
+        level = state[0] = self.level_index(score, state[0])
+        state[3] = score
+        alerted, last_time = state[1], state[2]
+        if level == alerted:
+            self._pending.pop(patient_id, None)
+            return None
+
+        # în fereastra de debounce se amână doar de-escaladările; o escaladare
+        # peste ultimul nivel alertat se emite imediat
+        debounced = last_time is not None and timestamp - last_time < self.debounce_seconds
+        if debounced and level < alerted:
+            self._pending[patient_id] = last_time + self.debounce_seconds
+            return None
+
+        return self._emit(patient_id, timestamp)
+
+    def due(self, now: float) -> List[str]:
+        """Pacienții cu o de-escaladare amânată a cărei fereastră de debounce a expirat"""
+        return [patient_id for patient_id, moment in self._pending.items() if moment <= now]
+
+    def flush(self, now: float) -> List[RiskAlert]:
+        """Emite de-escaladările amânate ajunse la termen (datate la expirarea ferestrei)"""
+        return [self._emit(patient_id, self._pending[patient_id]) for patient_id in self.due(now)]
+
+    def _emit(self, patient_id: str, timestamp: float) -> RiskAlert:
+        """Alerta pentru nivelul curent al pacientului; acesta devine noul nivel alertat"""
+        state = self._state[patient_id]
+        level, alerted = state[0], state[1]
+        state[1], state[2] = level, timestamp
+        self._pending.pop(patient_id, None)
+        return RiskAlert(patient_id, timestamp, state[3], self.levels[level], self.levels[alerted], level > alerted)
+
+    def forget(self, patient_id: str):
+        """Elimină starea unui pacient (externare)"""
+        self._state.pop(patient_id, None)
+        self._pending.pop(patient_id, None)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def current_level(self, patient_id: str) -> Optional[str]:
+        """Nivelul curent (cu histerezis) al unui pacient"""
+        state = self._state.get(patient_id)
+        return self.levels[state[0]] if state is not None else None
+
+def alerts_from_changes(changes: Iterable[Dict[str, Any]], engine: AlertEngine,
+                        now: Optional[float] = None) -> Iterator[RiskAlert]:
+    """Generator: transformă evenimentele de schimbare din ward_stream în alerte.
+
+    Ceasul fluxului este momentul fiecărui eveniment: de-escaladările amânate ajunse
+    la termen se emit înaintea lui; cu `now`, și cele ajunse la termen după ultimul eveniment.
+    """
+    from ward_stream import parse_timestamp
+    for change in changes:
+        timestamp = parse_timestamp(change["timestamp"])
+        yield from engine.flush(timestamp)
+        if not isinstance(change.get("score"), (int, float)) or change.get("level") not in engine.levels:
+            # pacient sub 48h (NU IAAM): nu intră în evaluarea pragurilor
+            continue
+        alert = engine.observe(change["patient_id"], change["score"], timestamp)
+        if alert is not None:
+            yield alert
+    if now is not None:
+        yield from engine.flush(now)
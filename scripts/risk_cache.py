@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Cache LRU adresat prin conținut pentru evaluările de risc IAAM
+Cheia este hash-ul canonic al câmpurilor relevante pentru scor plus
+versiunea profilului de scorare, deci date identice dau același rezultat
+indiferent de pacient, rerulare Streamlit sau sesiune
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+def _canonical_value(value: Any) -> Any:
+    """Normalizează o valoare pentru serializare deterministă"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(item) for item in value]
+    if isinstance(value, Mapping):
+        return {str(key): _canonical_value(item) for key, item in value.items()}
+    return str(value)
+
+def canonical_key(values: Mapping[str, Any], profile_version: str, fields: Optional[Iterable[str]] = None) -> str:
+    """Calculează cheia canonică (hash) pentru câmpurile de scor și versiunea profilului"""
+    names = sorted(fields) if fields is not None else sorted(values)
+    payload = {
+        "profile": profile_version,
+        "fields": {name: _canonical_value(values.get(name)) for name in names}
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+class RiskCache:
+    """Cache LRU mărginit cu contoare de hit/miss, sigur pentru mai multe sesiuni"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Returnează o copie a rezultatului memorat sau îl calculează și îl memorează"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        # calculul se face în afara lock-ului; rezultatul memorat nu este expus apelantului
+        result = compute()
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Golește cache-ul și resetează contoarele"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistici de utilizare a cache-ului"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+_shared_cache: Optional[RiskCache] = None
+_shared_lock = threading.Lock()
+
+def shared_risk_cache(maxsize: int = 4096) -> RiskCache:
+    """Cache-ul comun tuturor sesiunilor din același proces server"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = RiskCache(maxsize)
+        return _shared_cache
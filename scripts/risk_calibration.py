@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Calibrarea probabilității IAAM pe evaluări istorice etichetate
+Ajustează sigmoida scor -> probabilitate (intercept și pantă logistică,
+opțional regresie izotonică), calculează curba de fiabilitate și scorul
+Brier, apoi salvează parametrii ca artefact JSON versionat
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import isotonic_regression
+from scipy.special import expit
+
+DEFAULT_CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "probability_calibration.json")
+SCHEMA_VERSION = 1
+
+class ProbabilityCalibration:
+    """Funcția calibrată scor -> probabilitate IAAM"""
+
+    def __init__(self, intercept: float = -3.0, panta: float = 0.05, version: str = "default",
+                 izotonic: Optional[Tuple[Sequence[float], Sequence[float]]] = None,
+                 metrici: Optional[Dict[str, Any]] = None):
+        self.intercept = float(intercept)
+        self.panta = float(panta)
+        self.version = version
+        self.izotonic = None
+        if izotonic is not None:
+            scores, probabilities = (np.asarray(values, dtype=float) for values in izotonic)
+            if len(scores) != len(probabilities) or np.any(np.diff(scores) <= 0) or np.any(np.diff(probabilities) < 0):
+                raise ValueError("Calibrarea izotonică cere scoruri strict crescătoare și probabilități monotone")
+            self.izotonic = (scores, probabilities)
+        self.metrici = metrici or {}
+
+    def predict(self, scor):
+        """Probabilitatea calibrată pentru un scor sau un array de scoruri"""
+        if self.izotonic is not None:
+            return np.interp(scor, *self.izotonic)
+        return expit(self.intercept + self.panta * np.asarray(scor, dtype=float))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Artefactul serializabil"""
+        return {
+            "schema": SCHEMA_VERSION,
+            "version": self.version,
+            "intercept": self.intercept,
+            "panta": self.panta,
+            "izotonic": None if self.izotonic is None else {
+                "scor": self.izotonic[0].tolist(), "probabilitate": self.izotonic[1].tolist()
+            },
+            "metrici": self.metrici
+        }
+
+    @classmethod
+    def from_dict(cls, artifact: Dict[str, Any]) -> "ProbabilityCalibration":
+        """Reconstruiește calibrarea dintr-un artefact"""
+        if artifact.get("schema") != SCHEMA_VERSION:
+            raise ValueError(f"Schemă de calibrare necunoscută: {artifact.get('schema')}")
+        izotonic = artifact.get("izotonic")
+        return cls(artifact["intercept"], artifact["panta"], artifact["version"],
+                   None if izotonic is None else (izotonic["scor"], izotonic["probabilitate"]),
+                   artifact.get("metrici"))
+
+    def save(self, path: str = DEFAULT_CALIBRATION_PATH):
+        """Salvează artefactul de calibrare"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+def _aggregate(scores: np.ndarray, outcomes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Grupează evaluările pe scoruri distincte: (scoruri, număr evaluări, număr evenimente)"""
+    unique, inverse = np.unique(scores, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique)).astype(float)
+    events = np.bincount(inverse, weights=outcomes, minlength=len(unique))
+    return unique, counts, events
+
+def fit_logistic(scores, outcomes, max_iter: int = 50, tol: float = 1e-10) -> Tuple[float, float]:
+    """Ajustează interceptul și panta logistică (Newton-Raphson pe scoruri grupate)"""
+    unique, counts, events = _aggregate(np.asarray(scores, dtype=float), np.asarray(outcomes, dtype=float))
+    # centrarea scorurilor stabilizează iterațiile
+    center, scale = np.average(unique, weights=counts), max(np.ptp(unique), 1.0)
+    x = (unique - center) / scale
+    beta = np.array([np.log((events.sum() + 0.5) / (counts.sum() - events.sum() + 0.5)), 0.0])
+    for _ in range(max_iter):
+        p = expit(beta[0] + beta[1] * x)
+        w = counts * p * (1 - p)
+        residual = events - counts * p
+        gradient = np.array([residual.sum(), (residual * x).sum()])
+        hessian = np.array([[w.sum(), (w * x).sum()], [(w * x).sum(), (w * x * x).sum()]])
+        # regularizare minimă pentru date perfect separabile
+        step = np.linalg.solve(hessian + 1e-9 * np.eye(2), gradient)
+        beta += step
+        if np.abs(step).max() < tol:
+            break
+    slope = beta[1] / scale
+    return float(beta[0] - slope * center), float(slope)
+
+def fit_isotonic(scores, outcomes) -> Tuple[np.ndarray, np.ndarray]:
+    """Regresie izotonică ponderată pe scoruri grupate (scipy.optimize.isotonic_regression)"""
+    unique, counts, events = _aggregate(np.asarray(scores, dtype=float), np.asarray(outcomes, dtype=float))
+    fitted = isotonic_regression(events / counts, weights=counts, increasing=True).x
+    # păstrează doar punctele unde funcția în trepte se schimbă (plus capetele)
+    keep = np.ones(len(unique), dtype=bool)
+    keep[1:-1] = (np.diff(fitted)[:-1] != 0) | (np.diff(fitted)[1:] != 0)
+    return unique[keep], fitted[keep]
+
+def reliability_curve(probabilities, outcomes, n_bins: int = 10) -> Dict[str, np.ndarray]:
+    """Curba de fiabilitate: probabilitatea medie prezisă vs. frecvența observată pe intervale"""
+    probabilities = np.asarray(probabilities, dtype=float)
+    outcomes = np.asarray(outcomes, dtype=float)
+    bins = np.minimum((probabilities * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        predicted = np.bincount(bins, weights=probabilities, minlength=n_bins) / counts
+        observed = np.bincount(bins, weights=outcomes, minlength=n_bins) / counts
+    return {"prezis": predicted, "observat": observed, "numar": counts}
+
+def brier_score(probabilities, outcomes) -> float:
+    """Scorul Brier (eroarea pătratică medie a probabilităților)"""
+    return float(np.mean((np.asarray(probabilities, dtype=float) - np.asarray(outcomes, dtype=float)) ** 2))
+
+def load_outcomes(path: str, score_column: str = "scor_total", outcome_column: str = "iaam") -> Tuple[np.ndarray, np.ndarray]:
+    """Citește evaluările istorice etichetate (CSV, JSON sau JSONL)"""
+    if path.endswith(".csv"):
+        frame = pd.read_csv(path, usecols=[score_column, outcome_column])
+    else:
+        frame = pd.read_json(path, lines=path.endswith(".jsonl"))[[score_column, outcome_column]]
+    frame = frame.dropna()
+    return frame[score_column].to_numpy(dtype=float), frame[outcome_column].to_numpy(dtype=float)
+
+def fit_calibration(scores, outcomes, isotonic: bool = False, n_bins: int = 10,
+                    version: Optional[str] = None) -> ProbabilityCalibration:
+    """Ajustează calibrarea și atașează metricile de fiabilitate"""
+    scores = np.asarray(scores, dtype=float)
+    outcomes = np.asarray(outcomes, dtype=float)
+    if not len(scores):
+        raise ValueError("Nu există evaluări pentru calibrare")
+    intercept, panta = fit_logistic(scores, outcomes)
+    calibration = ProbabilityCalibration(
+        intercept, panta, version or datetime.now().strftime("%Y%m%d-%H%M%S"),
+        fit_isotonic(scores, outcomes) if isotonic else None
+    )
+    probabilities = calibration.predict(scores)
+    curve = reliability_curve(probabilities, outcomes, n_bins)
+    calibration.metrici = {
+        "evaluari": int(len(scores)),
+        "prevalenta": float(outcomes.mean()),
+        "brier": brier_score(probabilities, outcomes),
+        "brier_necalibrat": brier_score(ProbabilityCalibration().predict(scores), outcomes),
+        "fiabilitate": {key: np.nan_to_num(values).tolist() for key, values in curve.items()}
+    }
+    return calibration
+
+@lru_cache(maxsize=None)
+def load_calibration(path: str = DEFAULT_CALIBRATION_PATH) -> ProbabilityCalibration:
+    """Încarcă (o singură dată) artefactul de calibrare; fără fișier se folosește sigmoida implicită"""
+    if not os.path.exists(path):
+        return ProbabilityCalibration()
+    with open(path, "r", encoding="utf-8") as f:
+        return ProbabilityCalibration.from_dict(json.load(f))
+
+def main():
+    """Ajustează calibrarea pe un fișier de evaluări și salvează artefactul"""
+    parser = argparse.ArgumentParser(description="Calibrarea probabilității IAAM")
+    parser.add_argument("outcomes", help="fișier CSV/JSON/JSONL cu evaluări etichetate")
+    parser.add_argument("--score-column", default="scor_total")
+    parser.add_argument("--outcome-column", default="iaam")
+    parser.add_argument("--isotonic", action="store_true", help="calibrare izotonică în locul celei logistice")
+    parser.add_argument("--output", default=DEFAULT_CALIBRATION_PATH)
+    args = parser.parse_args()
+
+    scores, outcomes = load_outcomes(args.outcomes, args.score_column, args.outcome_column)
+    calibration = fit_calibration(scores, outcomes, isotonic=args.isotonic)
+    calibration.save(args.output)
+
+    print(f"✅ Calibrare {calibration.version}: intercept {calibration.intercept:.4f}, pantă {calibration.panta:.5f}")
+    print(f"📊 Brier: {calibration.metrici['brier']:.4f} (necalibrat: {calibration.metrici['brier_necalibrat']:.4f})")
+    print(f"📁 Artefact salvat în {args.output}")
+
+if __name__ == "__main__":
+    main()
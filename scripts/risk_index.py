@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Index incremental al pacienților cu risc IAAM maxim
+Menține permanent primii K pacienți activi după scor și numărul de
+pacienți pe fiecare nivel de risc; o evaluare nouă sau o externare
+costă O(log n), fără resortarea întregii secții la fiecare rerulare
+"""
+
+import heapq
+import itertools
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+class RiskIndex:
+    """Heap cu ștergere leneșă (max după scor) plus contoare pe niveluri"""
+
+    # Heap-ul se recompactează când intrările expirate depășesc intrările active
+    COMPACT_RATIO = 2
+
+    def __init__(self, levels: Sequence[str], k: int = 10):
+        self.levels = tuple(levels)
+        self.k = k
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._heap: List[tuple] = []
+        self._counts: Counter = Counter()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._entries
+
+    def get(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        """Ultima evaluare indexată a unui pacient"""
+        entry = self._entries.get(patient_id)
+        return dict(entry) if entry is not None else None
+
+    def update(self, patient_id: str, score: float, level: str, **details: Any):
+        """Înregistrează (sau înlocuiește) evaluarea unui pacient"""
+        if level not in self.levels:
+            raise ValueError(f"Nivel de risc necunoscut: {level}")
+        with self._lock:
+            previous = self._entries.get(patient_id)
+            if previous is not None:
+                self._counts[previous["level"]] -= 1
+            version = next(self._sequence)
+            self._entries[patient_id] = {"patient_id": patient_id, "score": score, "level": level, **details}
+            self._versions[patient_id] = version
+            self._counts[level] += 1
+            heapq.heappush(self._heap, (-score, version, patient_id))
+            self._maybe_compact()
+
+    def remove(self, patient_id: str) -> bool:
+        """Scoate un pacient din index (externare); intrarea din heap expiră leneș"""
+        with self._lock:
+            entry = self._entries.pop(patient_id, None)
+            if entry is None:
+                return False
+            del self._versions[patient_id]
+            self._counts[entry["level"]] -= 1
+            self._maybe_compact()
+            return True
+
+    def _is_live(self, item: tuple) -> bool:
+        """Intrarea din heap corespunde ultimei evaluări a pacientului"""
+        return self._versions.get(item[2]) == item[1]
+
+    def _maybe_compact(self):
+        """Reconstruiește heap-ul doar din intrările active (cost amortizat O(1))"""
+        if len(self._heap) > self.COMPACT_RATIO * max(len(self._entries), 16):
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+
+    def top(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Primii k pacienți după scor (la egalitate, evaluarea mai veche întâi)"""
+        k = self.k if k is None else k
+        with self._lock:
+            heap = self._heap
+            taken = []
+            while heap and len(taken) < k:
+                item = heapq.heappop(heap)
+                if self._is_live(item):
+                    taken.append(item)
+            # intrările active se pun înapoi, cele expirate rămân eliminate
+            for item in taken:
+                heapq.heappush(heap, item)
+            return [dict(self._entries[patient_id]) for _, _, patient_id in taken]
+
+    def level_counts(self) -> Dict[str, int]:
+        """Numărul de pacienți activi pe fiecare nivel de risc, în ordinea nivelurilor"""
+        with self._lock:
+            return {level: self._counts[level] for level in self.levels}
+
+    def clear(self):
+        """Golește indexul"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._heap.clear()
+            self._counts.clear()
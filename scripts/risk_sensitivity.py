@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Analiză de sensibilitate (contrafactuală) pentru scorul de risc IAAM
+Toate intervențiile ("ce-ar fi dacă se scoate cateterul?") se evaluează
+într-un singur calcul vectorizat: rândul 0 este pacientul actual, apoi
+câte un rând pentru fiecare intervenție
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+def applicable_interventions(values: Mapping[str, Any],
+                             interventions: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Păstrează doar intervențiile care modifică efectiv datele pacientului"""
+    applicable = {}
+    for name, changes in interventions.items():
+        unknown = [field for field in changes if field not in values]
+        if unknown:
+            raise KeyError(f"Intervenția '{name}' modifică câmpuri necunoscute: {', '.join(unknown)}")
+        modified = {field: value for field, value in changes.items() if values[field] != value}
+        if modified:
+            applicable[name] = modified
+    return applicable
+
+def counterfactual_columns(values: Mapping[str, Any], fields: Sequence[str],
+                           interventions: Mapping[str, Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """Construiește coloanele lotului: pacientul actual urmat de câte un rând per intervenție"""
+    columns = {}
+    for field in fields:
+        base = values[field]
+        columns[field] = [base] + [changes.get(field, base) for changes in interventions.values()]
+    return columns
+
+def rank_deltas(interventions: Mapping[str, Mapping[str, Any]], scores: Sequence[float],
+                digits: Optional[int] = 1) -> Tuple[float, List[Dict[str, Any]]]:
+    """Calculează diferențele față de scorul actual, ordonate după impact (cea mai mare scădere prima).
+
+    Cu digits=None scorurile și diferențele se rotunjesc la întregi.
+    """
+    baseline = float(scores[0])
+    ranked = [
+        {
+            "interventie": name,
+            "scor": round(float(score), digits),
+            "delta": round(float(score) - baseline, digits),
+            "modificari": dict(changes)
+        }
+        for (name, changes), score in zip(interventions.items(), scores[1:])
+    ]
+    ranked.sort(key=lambda item: item["delta"])
+    return round(baseline, digits), ranked
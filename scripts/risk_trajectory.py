@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Motor vectorizat de traiectorii de risc IAAM
+Proiectează scorul unui pacient (sau al unei secții întregi) la rezoluție
+orară, pe baza unei cronologii de evenimente clinice (inserții/scoateri
+de dispozitive, rezultate de culturi, valori de laborator)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+@dataclass
+class TimelineEvent:
+    """Eveniment clinic programat, relativ la momentul evaluării"""
+    ora: float
+    camp: str
+    valoare: Any
+
+def _field_value(name: str, value: Any) -> Any:
+    """Normalizează valoarea unui câmp pentru evaluarea vectorizată"""
+    if name == "rezistente" and isinstance(value, (list, tuple)):
+        return len(value)
+    return value
+
+def build_trajectory_fields(calculator, patients: Sequence[Any], timelines: Sequence[Iterable[TimelineEvent]],
+                            hours: np.ndarray) -> Dict[str, np.ndarray]:
+    """Construiește câmpurile (pacienți × ore) pentru calculate_risk_batch.
+
+    Valorile sunt constante pe porțiuni între evenimente; durata de
+    spitalizare și zilele dispozitivelor cresc odată cu timpul.
+    """
+    n_hours = len(hours)
+    day_fields = calculator.DEVICE_DAY_FIELDS
+    fields = {}
+
+    for name in calculator.BATCH_FIELDS:
+        base = np.asarray([_field_value(name, getattr(patient, name)) for patient in patients],
+                          dtype=object if name == "bacterie" else None)
+        if base.dtype.kind in "iu":
+            # evenimentele pot aduce valori fracționare (ex. CRP 12.5)
+            base = base.astype(float)
+        fields[name] = np.repeat(base[:, None], n_hours, axis=1)
+
+    # timpul curge: ore de spitalizare și zile de dispozitiv (de la începutul segmentului)
+    fields["ore_spitalizare"] = fields["ore_spitalizare"] + hours[None, :]
+    elapsed_days = np.floor(hours / 24.0)
+    for days in day_fields.values():
+        fields[days] = fields[days] + elapsed_days[None, :]
+
+    for row, events in enumerate(timelines):
+        events = sorted(events, key=lambda event: event.ora)
+        if not events:
+            continue
+        by_field: Dict[str, List[TimelineEvent]] = {}
+        for event in events:
+            by_field.setdefault(event.camp, []).append(event)
+
+        for name, field_events in by_field.items():
+            if name not in fields:
+                continue
+            event_hours = np.array([event.ora for event in field_events], dtype=float)
+            values = [fields[name][row, 0]] + [_field_value(name, event.valoare) for event in field_events]
+            index = np.searchsorted(event_hours, hours, side="right")
+            fields[name][row] = np.asarray(values, dtype=fields[name].dtype)[index]
+
+        # segmente de durată pentru dispozitive: inserția pornește de la 0 zile,
+        # un eveniment explicit pe câmpul de zile pornește de la valoarea dată
+        for device, days in day_fields.items():
+            starts = [(event.ora, 0.0) for event in by_field.get(device, []) if event.valoare]
+            starts += [(event.ora, float(event.valoare)) for event in by_field.get(days, [])]
+            if not starts:
+                continue
+            starts.sort(key=lambda start: start[0])
+            start_hours = np.array([0.0] + [hour for hour, _ in starts])
+            start_days = np.array([getattr(patients[row], days)] + [value for _, value in starts], dtype=float)
+            segment = np.searchsorted(start_hours, hours, side="right") - 1
+            fields[days][row] = start_days[segment] + np.floor((hours - start_hours[segment]) / 24.0)
+
+    return fields
+
+def project_ward(calculator, patients: Sequence[Any], timelines: Optional[Sequence[Iterable[TimelineEvent]]] = None,
+                 horizon_hours: float = 14 * 24, step_hours: float = 1.0) -> Dict[str, np.ndarray]:
+    """Proiectează scorul tuturor pacienților dintr-o secție într-o singură trecere vectorizată"""
+    hours = np.arange(0.0, horizon_hours + step_hours / 2, step_hours)
+    if timelines is None:
+        timelines = [()] * len(patients)
+    fields = build_trajectory_fields(calculator, patients, timelines, hours)
+    scores = calculator.calculate_risk_batch(fields)
+    return {
+        "ore": hours,
+        "scor": scores,
+        "probabilitate": calculator._calculate_probability(scores)
+    }
+
+def project_risk(calculator, patient: Any, events: Iterable[TimelineEvent] = (),
+                 horizon_hours: float = 14 * 24, step_hours: float = 1.0) -> Dict[str, np.ndarray]:
+    """Proiectează traiectoria de risc a unui pacient la rezoluție orară"""
+    ward = project_ward(calculator, [patient], [list(events)], horizon_hours, step_hours)
+    return {"ore": ward["ore"], "scor": ward["scor"][0], "probabilitate": ward["probabilitate"][0]}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Intervale de incertitudine Monte Carlo pentru probabilitatea IAAM
+Valorile măsurate sunt perturbate după modele de eroare de măsurare, iar
+câmpurile nemăsurate (valoare 0 în PatientData) sunt eșantionate din
+distribuții a priori; toate extragerile trec vectorizat prin scor și sigmoidă.
+
+Se raportează două intervale: cel de măsurare (câmpurile nemăsurate rămân ca
+în estimarea punctuală, deci conține probabilitatea afișată) și cel cu datele
+lipsă (priori pentru câmpurile nemăsurate), care arată cât s-ar putea muta
+probabilitatea după completarea analizelor lipsă. Zgomotul de măsurare și cel
+al priorilor vin din fluxuri aleatoare separate, deci valorile măsurate primesc
+aceleași extrageri în ambele intervale
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+@dataclass(frozen=True)
+class MeasurementError:
+    """Model de eroare de măsurare pentru un câmp (relativă: log-normală, absolută: normală)"""
+    sigma: float
+    relativa: bool = True
+
+@dataclass(frozen=True)
+class Prior:
+    """Distribuție a priori pentru un câmp nemăsurat"""
+    distributie: str
+    centru: float
+    sigma: float
+    minim: float = 0.0
+
+# Erori analitice tipice (coeficient de variație sau deviație absolută)
+DEFAULT_MEASUREMENT_ERRORS = {
+    "crp": MeasurementError(0.10),
+    "pct": MeasurementError(0.15),
+    "leucocite": MeasurementError(0.05),
+    "creatinina": MeasurementError(0.07),
+    "albumina": MeasurementError(0.2, relativa=False),
+    "hemoglobina": MeasurementError(0.3, relativa=False)
+}
+
+# Valori plauzibile la un pacient internat, folosite când analiza lipsește
+DEFAULT_PRIORS = {
+    "crp": Prior("lognormal", 20.0, 1.0),
+    "pct": Prior("lognormal", 0.2, 1.0),
+    "leucocite": Prior("normal", 9000.0, 3000.0, minim=1000.0),
+    "creatinina": Prior("lognormal", 1.0, 0.35),
+    "albumina": Prior("normal", 3.5, 0.5, minim=1.0),
+    "hemoglobina": Prior("normal", 11.5, 1.8, minim=4.0)
+}
+
+class UncertaintyModel:
+    """Propagă incertitudinea datelor de intrare prin calculate_risk_batch"""
+
+    def __init__(self, erori: Optional[Mapping[str, MeasurementError]] = None,
+                 priori: Optional[Mapping[str, Prior]] = None,
+                 n_draws: int = 2000, nivel: float = 0.95, seed: Optional[int] = 0):
+        self.erori = dict(DEFAULT_MEASUREMENT_ERRORS if erori is None else erori)
+        self.priori = dict(DEFAULT_PRIORS if priori is None else priori)
+        for name, prior in self.priori.items():
+            if prior.distributie not in ("normal", "lognormal"):
+                raise ValueError(f"Distribuție a priori necunoscută pentru {name}: {prior.distributie}")
+        self.n_draws = n_draws
+        self.nivel = nivel
+        self.seed = seed
+
+    def signature(self) -> str:
+        """Descrierea canonică a modelului (intră în cheia de cache)"""
+        return json.dumps({
+            "erori": {name: asdict(error) for name, error in self.erori.items()},
+            "priori": {name: asdict(prior) for name, prior in self.priori.items()},
+            "n_draws": self.n_draws, "nivel": self.nivel, "seed": self.seed
+        }, sort_keys=True)
+
+    def sample_fields(self, calculator, patients: Sequence[Any], priori: bool = True) -> Dict[str, np.ndarray]:
+        """Construiește câmpurile (pacienți × extrageri) pentru calculate_risk_batch.
+
+        Cu priori=False câmpurile nemăsurate rămân la valoarea din estimarea punctuală.
+        """
+        error_rng, prior_rng = (np.random.default_rng(seed) for seed in np.random.SeedSequence(self.seed).spawn(2))
+        n_patients = len(patients)
+        fields = {}
+        for name in calculator.BATCH_FIELDS:
+            values = [getattr(patient, name) for patient in patients]
+            if name == "rezistente":
+                values = [len(value) for value in values]
+            fields[name] = np.asarray(values, dtype=object if name == "bacterie" else None)[:, None]
+
+        for name in dict.fromkeys(list(self.erori) + list(self.priori)):
+            base = fields[name][:, 0].astype(float)
+            draws = np.repeat(base[:, None], self.n_draws, axis=1)
+            measured = base != 0
+
+            error = self.erori.get(name)
+            if error is not None and measured.any():
+                noise = error_rng.standard_normal((int(measured.sum()), self.n_draws)) * error.sigma
+                if error.relativa:
+                    draws[measured] *= np.exp(noise)
+                else:
+                    # o valoare măsurată rămâne pozitivă (0 înseamnă „nemăsurat”)
+                    draws[measured] = np.maximum(draws[measured] + noise, 1e-6)
+
+            prior = self.priori.get(name)
+            if priori and prior is not None and not measured.all():
+                noise = prior_rng.standard_normal((n_patients - int(measured.sum()), self.n_draws)) * prior.sigma
+                sampled = prior.centru * np.exp(noise) if prior.distributie == "lognormal" else prior.centru + noise
+                draws[~measured] = np.maximum(sampled, prior.minim)
+
+            fields[name] = draws
+        return fields
+
+    def missing(self, patient: Any) -> Tuple[str, ...]:
+        """Câmpurile nemăsurate ale pacientului care au o distribuție a priori"""
+        return tuple(name for name in self.priori if getattr(patient, name) == 0)
+
+    def intervals(self, calculator, patients: Sequence[Any], priori: bool = False) -> np.ndarray:
+        """Intervalele de probabilitate (pacienți × [inferior, superior]) pentru o cohortă.
+
+        Implicit intervalul de măsurare (conține estimarea punctuală); cu priori=True și
+        câmpurile nemăsurate sunt eșantionate din distribuțiile a priori.
+        """
+        if not len(patients):
+            return np.zeros((0, 2))
+        scores = calculator.calculate_risk_batch(self.sample_fields(calculator, patients, priori))
+        probabilities = calculator._calculate_probability(scores)
+        alpha = (1 - self.nivel) / 2
+        bounds = np.quantile(probabilities, [alpha, 1 - alpha], axis=1).T
+        # riscul IAAM nu se evaluează înainte de 48h
+        early = np.array([patient.ore_spitalizare < 48 for patient in patients])
+        bounds[early] = 0.0
+        return bounds
+
+    def interval(self, calculator, patient: Any, priori: bool = False) -> Tuple[float, float]:
+        """Intervalul de probabilitate pentru un pacient"""
+        lower, upper = self.intervals(calculator, [patient], priori)[0]
+        return (float(lower), float(upper))
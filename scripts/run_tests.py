@@ -7,6 +7,17 @@ import subprocess
 import sys
 import os
 
+def check_performance(strict: bool = False) -> bool:
+    """Rulează micro-benchmark-ul scurt și semnalează regresiile față de referința JSON"""
+    print("\n⏱️ Verificare performanță (scripts/benchmark_scoring.py --check --quick)...")
+    result = subprocess.run([sys.executable, "scripts/benchmark_scoring.py", "--check", "--quick"],
+                            capture_output=True, text=True, cwd=".")
+    print(result.stdout)
+    if result.returncode != 0:
+        print("⚠️ REGRESII DE PERFORMANȚĂ DETECTATE" if result.stdout else result.stderr)
+        return not strict
+    return True
+
 def run_tests():
     """Rulează toate testele și verifică funcționalitatea"""
     print("🚀 Verificare completă EpiMind AI Enhanced")
@@ -59,6 +70,9 @@ def run_tests():
 
 if __name__ == "__main__":
     success = run_tests()
+    if success and "--no-benchmark" not in sys.argv:
+        # regresiile de performanță eșuează verificarea doar cu --strict
+        success = check_performance(strict="--strict" in sys.argv)
     if success:
         print("\n🚀 Pentru a rula aplicația:")
         print("   streamlit run scripts/epimind_ai_enhanced.py")
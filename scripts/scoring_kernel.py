@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Nucleu comun de scorare IAAM pentru toate motoarele de predicție
+Fiecare motor (original, enhanced, professional, final) este descris
+declarativ ca profil: grupuri ponderate de termeni (intervale, liniar,
+puncte condiționate, microbiologie, SOFA/qSOFA) plus pragurile de nivel.
+Un lot de pacienți se scorează sub toate profilurile într-o singură
+trecere: coloanele de intrare, alias-urile și predicatele se rezolvă o
+singură dată și sunt partajate între profiluri
+
+Exemplu:
+    python scoring_kernel.py pacienti.jsonl -o comparatie.jsonl
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from epimind_ai_enhanced import EnhancedIAAMPredictor, PatientData as EnhancedPatientData
+from epimind_ai_final_professional import PatientData as FinalPatientData, UltraAdvancedIAAMCalculator
+from epimind_ai_original import IAMPredictor
+from epimind_ai_professional import AdvancedIAAMCalculator, PatientData as ProfessionalPatientData
+from recommendation_rules import Predicate, evaluate_predicate
+from severity_scores import bin_index, load_severity_table
+
+# Condiții în formă normală conjunctivă: toate clauzele, fiecare = oricare dintre predicate
+Conditions = Tuple[Tuple[Predicate, ...], ...]
+
+# Numele echivalente ale câmpurilor în formele PatientData ale motoarelor
+# (unitățile nu se convertesc: leucocitele sunt în 10^3/μL pentru original și
+# enhanced, dar în /μL pentru professional și final)
+FIELD_ALIASES = (
+    ("procalcitonina", "pct"),
+    ("cateter_central", "cateter_venos_central"),
+    ("cateter_central_days", "zile_cateter_venos"),
+    ("sonda_urinara", "cateter_urinar"),
+    ("sonda_urinara_days", "zile_cateter_urinar"),
+    ("ventilatie_mecanica_days", "zile_ventilatie"),
+    ("tas", "tensiune_sistolica"),
+    ("glasgow", "glasgow_coma_scale"),
+    ("bilirubina", "bilirubina_totala"),
+)
+
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    name: tuple(other for other in group if other != name) for group in FIELD_ALIASES for name in group
+}
+
+@dataclass(frozen=True)
+class Bins:
+    """Puncte pe intervale: points[i] pentru valorile dintre edges[i-1] și edges[i]"""
+    camp: str
+    edges: Tuple[float, ...]
+    points: Tuple[float, ...]
+    side: str = "right"
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        return np.asarray(self.points)[bin_index(self.edges, columns.number(self.camp), self.side)]
+
+@dataclass(frozen=True)
+class Linear:
+    """Valoare × rată, plafonată opțional"""
+    camp: str
+    rata: float
+    plafon: Optional[float] = None
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        value = columns.number(self.camp) * self.rata
+        return value if self.plafon is None else np.minimum(value, self.plafon)
+
+@dataclass(frozen=True)
+class Segments:
+    """Funcție liniară pe intervale: baza + (valoare - origine) × panta, plafonată opțional"""
+    camp: str
+    edges: Tuple[float, ...]
+    segmente: Tuple[Tuple[float, float, float], ...]
+    plafon: Optional[float] = None
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        value = columns.number(self.camp)
+        pieces = [base + (value - origin) * slope for base, origin, slope in self.segmente]
+        result = np.select([value < edge for edge in self.edges], pieces[:-1], pieces[-1])
+        return result if self.plafon is None else np.minimum(result, self.plafon)
+
+@dataclass(frozen=True)
+class Points:
+    """Puncte fixe când condițiile sunt îndeplinite"""
+    puncte: float
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        return np.full(columns.n, self.puncte)
+
+@dataclass(frozen=True)
+class Microbiology:
+    """Cultură pozitivă: (baza + scor bacterie) × (1 + factor × nr. rezistențe) + puncte pe rezistențe"""
+    bacterii: Mapping[str, float] = field(default_factory=dict)
+    bacterie_implicita: float = 0
+    baza: float = 0
+    rezistente: Mapping[str, float] = field(default_factory=dict)
+    rezistenta_implicita: float = 0
+    factor_rezistente: float = 0.0
+    necesita_bacterie: bool = False
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        culture = columns.flag("cultura_pozitiva")
+        bacteria = columns.raw("bacterie", "")
+        codes, names = pd.factorize(bacteria)
+        bonus = np.array([self.bacterii.get(name, self.bacterie_implicita) for name in names]
+                         + [self.bacterie_implicita], dtype=float)[codes]
+        if self.necesita_bacterie:
+            culture = culture & np.array([bool(name) for name in names] + [False])[codes]
+
+        lists = [value if isinstance(value, (list, tuple)) else () for value in columns.raw("rezistente", None)]
+        lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+        resistance_points = np.zeros(columns.n)
+        if lengths.any() and (self.rezistente or self.rezistenta_implicita):
+            points = np.fromiter(map(self.rezistente.get, itertools.chain.from_iterable(lists),
+                                     itertools.repeat(self.rezistenta_implicita)),
+                                 dtype=float, count=int(lengths.sum()))
+            resistance_points = np.bincount(np.repeat(np.arange(columns.n), lengths), weights=points,
+                                            minlength=columns.n)
+        value = (self.baza + bonus) * (1 + lengths * self.factor_rezistente) + resistance_points
+        return np.where(culture, value, 0.0)
+
+@dataclass(frozen=True)
+class Sofa:
+    """Scorul SOFA din tabelul de severitate al profilului × rată"""
+    rata: float
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        return columns.severity()[0] * self.rata
+
+@dataclass(frozen=True)
+class Qsofa:
+    """Puncte fixe când qSOFA atinge pragul"""
+    prag: int
+    puncte: float
+    conditii: Conditions = ()
+
+    def evaluate(self, columns: "ProfileColumns") -> np.ndarray:
+        return np.where(columns.severity()[1] >= self.prag, self.puncte, 0)
+
+@dataclass(frozen=True)
+class TermGroup:
+    """Grup de termeni însumați și apoi ponderați"""
+    nume: str
+    termeni: Tuple[Any, ...]
+    pondere: float = 1.0
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """Descrierea declarativă a unui motor de scorare"""
+    nume: str
+    grupuri: Tuple[TermGroup, ...]
+    praguri: Tuple[float, ...]
+    niveluri: Tuple[str, ...]
+    nivel_non_iaam: str
+    # valorile implicite ale câmpurilor lipsă (celelalte câmpuri numerice sunt 0)
+    implicite: Mapping[str, Any] = field(default_factory=dict)
+    severitate: Optional[str] = None
+    ore_minime: float = 48
+    zecimale: Optional[int] = 0
+
+class InputColumns:
+    """Coloanele lotului, rezolvate (cu alias-uri și valori implicite) o singură dată"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.n = len(frame)
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    def _source(self, name: str) -> Optional[str]:
+        """Coloana din care se citește un câmp (numele propriu sau un alias)"""
+        if name in self.frame:
+            return name
+        return next((alias for alias in ALIASES.get(name, ()) if alias in self.frame), None)
+
+    def raw(self, name: str, default: Any) -> np.ndarray:
+        """Valorile unui câmp (object), cu valoarea implicită pentru lipsuri"""
+        key = ("raw", name, default)
+        values = self._cache.get(key)
+        if values is None:
+            source = self._source(name)
+            if source is None:
+                values = np.empty(self.n, dtype=object)
+                values.fill(default)
+            else:
+                values = self.frame[source].to_numpy(dtype=object)
+                missing = pd.isna(self.frame[source]).to_numpy()
+                if missing.any():
+                    values = values.copy()
+                    values[missing] = default
+            self._cache[key] = values
+        return values
+
+    def number(self, name: str, default: float) -> np.ndarray:
+        """Valorile numerice ale unui câmp"""
+        key = ("number", name, default)
+        values = self._cache.get(key)
+        if values is None:
+            source = self._source(name)
+            if source is None:
+                values = np.full(self.n, float(default))
+            else:
+                values = self.frame[source].to_numpy()
+                if values.dtype.kind in "biuf":
+                    values = values.astype(float)
+                    values[np.isnan(values)] = default
+                else:
+                    values = self.raw(name, default).astype(float)
+            self._cache[key] = values
+        return values
+
+    def predicate(self, name: str, default: Any, op: str, value: Any) -> np.ndarray:
+        """Masca unui predicat (memorată: profilurile care îl folosesc îl evaluează o dată)"""
+        key = ("predicate", name, default, op, value if not isinstance(value, (list, set)) else tuple(value))
+        mask = self._cache.get(key)
+        if mask is None:
+            column = self.raw(name, default) if op in ("true", "in", "contine") else self.number(name, default)
+            mask = self._cache[key] = evaluate_predicate(column, op, value)
+        return mask
+
+class ProfileColumns:
+    """Vederea unui profil asupra coloanelor comune (valorile implicite ale profilului)"""
+
+    def __init__(self, columns: InputColumns, profile: ScoringProfile):
+        self.columns = columns
+        self.profile = profile
+        self.n = columns.n
+        self._severity = None
+
+    def default(self, name: str, fallback: Any = 0) -> Any:
+        return self.profile.implicite.get(name, fallback)
+
+    def number(self, name: str) -> np.ndarray:
+        return self.columns.number(name, self.default(name))
+
+    def raw(self, name: str, fallback: Any) -> np.ndarray:
+        return self.columns.raw(name, self.default(name, fallback))
+
+    def flag(self, name: str) -> np.ndarray:
+        return self.columns.predicate(name, self.default(name, False), "true", None)
+
+    def condition(self, conditii: Conditions) -> np.ndarray:
+        """Masca condițiilor în formă normală conjunctivă"""
+        active = np.ones(self.n, dtype=bool)
+        for clause in conditii:
+            any_met = np.zeros(self.n, dtype=bool)
+            for name, op, value in clause:
+                any_met = any_met | self.columns.predicate(name, self.default(name), op, value)
+            active &= any_met
+        return active
+
+    def severity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """SOFA și qSOFA din tabelul profilului (calculate o singură dată)"""
+        if self._severity is None:
+            table = load_severity_table(self.profile.severitate)
+            names = set(itertools.chain.from_iterable(table.organ_fields().values())) | set(table.qsofa_fields())
+            values = {name: self.number(name) for name in names}
+            self._severity = (np.asarray(table.sofa(values)[0]), np.asarray(table.qsofa(values)[0]))
+        return self._severity
+
+def _profile_defaults(profile: ScoringProfile) -> ScoringProfile:
+    """Completează valorile implicite cu cele din tabelul de severitate"""
+    if profile.severitate is None:
+        return profile
+    defaults = dict(load_severity_table(profile.severitate).defaults)
+    defaults.update(profile.implicite)
+    return ScoringProfile(**{**vars(profile), "implicite": defaults})
+
+def patients_frame(patients: Any) -> pd.DataFrame:
+    """DataFrame din DataFrame, coloane, listă de dicționare sau de dataclass-uri PatientData"""
+    if isinstance(patients, pd.DataFrame):
+        return patients.reset_index(drop=True)
+    if isinstance(patients, Mapping):
+        return pd.DataFrame({name: list(values) if np.ndim(values) else [values]
+                             for name, values in patients.items()})
+    return pd.DataFrame([dict(vars(patient)) if is_dataclass(patient) else dict(patient) for patient in patients])
+
+class ScoringKernel:
+    """Scorare simultană sub mai multe profiluri declarative"""
+
+    def __init__(self, profiles: Optional[Sequence[ScoringProfile]] = None):
+        profiles = DEFAULT_PROFILES if profiles is None else profiles
+        self.profiles = {profile.nume: _profile_defaults(profile) for profile in profiles}
+
+    def evaluate(self, patients: Any) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Scorul (nerotunjit) și nivelul pentru fiecare profil, într-o singură trecere"""
+        columns = InputColumns(patients_frame(patients))
+        results = {}
+        for name, profile in self.profiles.items():
+            view = ProfileColumns(columns, profile)
+            score = np.zeros(columns.n)
+            for group in profile.grupuri:
+                group_score = np.zeros(columns.n)
+                for term in group.termeni:
+                    value = term.evaluate(view)
+                    if term.conditii:
+                        value = np.where(view.condition(term.conditii), value, 0)
+                    group_score = group_score + value
+                score = score + group_score * group.pondere if group.pondere != 1.0 else score + group_score
+            is_iaam = view.number("ore_spitalizare") >= profile.ore_minime
+            score = np.where(is_iaam, score, 0.0)
+            levels = np.array(profile.niveluri + (profile.nivel_non_iaam,), dtype=object)
+            level_codes = np.where(is_iaam, bin_index(profile.praguri, score, "right"), len(profile.niveluri))
+            results[name] = (score, levels[level_codes])
+        return results
+
+    def score_batch(self, patients: Any) -> pd.DataFrame:
+        """Tabel comparativ: <profil>_scor și <profil>_nivel pentru fiecare pacient"""
+        frame = patients_frame(patients)
+        result = {"patient_id": frame["patient_id"].to_numpy()} if "patient_id" in frame else {}
+        for name, (score, levels) in self.evaluate(frame).items():
+            digits = self.profiles[name].zecimale
+            if digits == 0:
+                score = score.astype(np.int64)
+            elif digits is not None:
+                # round() Python, ca în motoare (np.round diferă la jumătăți)
+                score = np.array([round(value, digits) for value in score.tolist()])
+            result[f"{name}_scor"] = score
+            result[f"{name}_nivel"] = levels
+        return pd.DataFrame(result)
+
+    def score(self, patient: Any) -> Dict[str, Dict[str, Any]]:
+        """Scorul și nivelul unui pacient sub toate profilurile"""
+        row = self.score_batch([patient]).iloc[0]
+        return {name: {"scor": row[f"{name}_scor"].item(), "nivel": row[f"{name}_nivel"]} for name in self.profiles}
+
+def _devices(weights: Mapping[str, float], edges: Tuple[float, ...], extra) -> Tuple[Bins, ...]:
+    """Termenii dispozitivelor: punctele pe intervalele de zile, doar dacă dispozitivul este prezent"""
+    return tuple(
+        Bins(f"{device}_days", edges, tuple(extra(weight)), "left", (((device, "true", None),),))
+        for device, weight in weights.items()
+    )
+
+def _dataclass_defaults(cls: type) -> Dict[str, Any]:
+    """Valorile implicite declarate ale câmpurilor PatientData (fără cele None)"""
+    return {item.name: item.default for item in fields(cls) if item.default not in (MISSING, None)}
+
+def original_profile(engine: Optional[IAMPredictor] = None) -> ScoringProfile:
+    """Profilul motorului original, din ponderile IAMPredictor"""
+    engine = engine or IAMPredictor()
+    return ScoringProfile(
+        nume="original",
+        grupuri=(TermGroup("total", (
+            Bins("ore_spitalizare", (72, 168), (5, 10, 15)),
+            *_devices(engine.device_weights, (3, 7), lambda weight: (weight, weight + 5, weight + 10)),
+            Microbiology(baza=15, rezistenta_implicita=10, rezistente=dict(engine.resistance_weights)),
+            Sofa(3),
+            Qsofa(2, 15),
+            Points(10, ((("leucocite", "true", None),), (("leucocite", ">=", 12), ("leucocite", "<", 4)))),
+            Bins("crp", (50, 100), (0, 8, 15)),
+            Bins("procalcitonina", (0.5, 2.0), (0, 10, 20)),
+        )),),
+        praguri=(35, 60, 90, 120),
+        niveluri=("SCĂZUT", "MODERAT", "ÎNALT", "FOARTE ÎNALT", "CRITIC"),
+        nivel_non_iaam="NU IAAM",
+        severitate="original",
+    )
+
+def enhanced_profile(engine: Optional[EnhancedIAAMPredictor] = None) -> ScoringProfile:
+    """Profilul motorului enhanced, din tabelele EnhancedIAAMPredictor și valorile implicite PatientData"""
+    engine = engine or EnhancedIAAMPredictor()
+    return ScoringProfile(
+        nume="enhanced",
+        grupuri=(TermGroup("total", (
+            Bins("ore_spitalizare", (72, 168, 336, 720), (8, 15, 25, 35, 45)),
+            *_devices(engine.device_weights, (3, 7, 14),
+                      lambda weight: (int(weight * multiplier) for multiplier in (1.0, 1.5, 2.0, 2.5))),
+            Microbiology(baza=20, rezistenta_implicita=15, bacterii=dict(engine.bacteria_risk),
+                         rezistente=dict(engine.resistance_weights)),
+            Sofa(4),
+            Qsofa(2, 20),
+            Bins("leucocite", (4, 12, 20), (15, 0, 12, 20)),
+            Bins("crp", (10, 50, 100, 200), (0, 5, 10, 18, 25)),
+            Bins("procalcitonina", (0.25, 0.5, 2.0, 10), (0, 8, 15, 25, 35)),
+            Points(8, ((("temperatura", ">=", 38.5),),)),
+            Points(10, ((("temperatura", "<=", 36.0),),)),
+            Points(5, ((("frecventa_cardiaca", ">=", 100),),)),
+        )),),
+        praguri=engine.LEVEL_THRESHOLDS,
+        niveluri=engine.LEVEL_NAMES,
+        nivel_non_iaam="NU IAAM",
+        implicite=_dataclass_defaults(EnhancedPatientData),
+        severitate="enhanced",
+    )
+
+def professional_profile(engine: Optional[AdvancedIAAMCalculator] = None) -> ScoringProfile:
+    """Profilul motorului professional, din tabelele AdvancedIAAMCalculator și valorile implicite PatientData"""
+    engine = engine or AdvancedIAAMCalculator()
+    return ScoringProfile(
+        nume="professional",
+        grupuri=(TermGroup("total", (
+            Bins("ore_spitalizare", (72, 168, 336, 720, 1440), (8, 15, 25, 35, 45, 55)),
+            Linear("zile_cateter_venos", 3, 30, ((("cateter_venos_central", "true", None),),)),
+            Linear("zile_cateter_urinar", 2, 20, ((("cateter_urinar", "true", None),),)),
+            Linear("zile_ventilatie", 4, 40, ((("ventilatie_mecanica", "true", None),),)),
+            Microbiology(bacterie_implicita=10, rezistenta_implicita=8, necesita_bacterie=True,
+                         bacterii=dict(engine.PATHOGEN_SCORES)),
+            Bins("crp", (10, 50, 150), (0, 5, 10, 15), "left"),
+            Bins("pct", (0.5, 2, 10), (5, 10, 15, 20), "left", ((("pct", ">", 0),),)),
+            Points(10, ((("cultura_urina_pozitiva", "true", None),),)),
+            Linear("bacterii_urina", 0.5, 10, ((("bacterii_urina", ">", 0),),)),
+            Points(5, ((("nitriti", "true", None),),)),
+            Points(5, ((("leucocit_esteraza", "true", None),),)),
+        )),),
+        praguri=(20, 40, 70, 100),
+        niveluri=("SCĂZUT", "MODERAT", "RIDICAT", "FOARTE RIDICAT", "CRITIC"),
+        nivel_non_iaam="FĂRĂ RISC",
+        implicite=_dataclass_defaults(ProfessionalPatientData),
+        zecimale=None,
+    )
+
+def final_profile(engine: Optional[UltraAdvancedIAAMCalculator] = None) -> ScoringProfile:
+    """Profilul motorului final, din tabelele și ponderile UltraAdvancedIAAMCalculator"""
+    engine = engine or UltraAdvancedIAAMCalculator()
+    weights = engine.risk_weights
+    return ScoringProfile(
+        nume="final",
+        grupuri=(
+            TermGroup("temporal", (
+                Segments("ore_spitalizare", (72, 168, 336, 720),
+                         ((8, 48, 0.2), (15, 72, 0.1), (25, 168, 0.06), (35, 336, 0.03), (45, 720, 0.01)), 55),
+            ), weights["temporal"]),
+            TermGroup("devices", (
+                Linear("zile_cateter_venos", 3.5, 35, ((("cateter_venos_central", "true", None),),)),
+                Linear("zile_cateter_urinar", 2.5, 25, ((("cateter_urinar", "true", None),),)),
+                Linear("zile_ventilatie", 4.5, 45, ((("ventilatie_mecanica", "true", None),),)),
+            ), weights["devices"]),
+            TermGroup("microbiology", (
+                Microbiology(bacterie_implicita=15, factor_rezistente=0.3, necesita_bacterie=True,
+                             bacterii=dict(engine.PATHOGEN_SCORES)),
+            ), weights["microbiology"]),
+            TermGroup("inflammatory", (
+                Linear("crp", 0.1, 20, ((("crp", ">", 0),),)),
+                Linear("pct", 2, 25, ((("pct", ">", 0),),)),
+                Points(10, ((("leucocite", ">", 0),), (("leucocite", ">", 15000), ("leucocite", "<", 4000)))),
+            ), weights["inflammatory"]),
+            TermGroup("laboratory", (
+                Points(8, ((("creatinina", ">", 1.5),),)),
+                Points(6, ((("albumina", ">", 0),), (("albumina", "<", 3.0),))),
+                Points(5, ((("hemoglobina", ">", 0),), (("hemoglobina", "<", 10),))),
+            ), weights["laboratory"]),
+            TermGroup("clinical_scores", (
+                Linear("sofa_score", 2, conditii=((("sofa_score", ">", 0),),)),
+                Linear("apache_score", 1.5, conditii=((("apache_score", ">", 0),),)),
+            ), weights["clinical_scores"]),
+        ),
+        praguri=engine.LEVEL_THRESHOLDS,
+        niveluri=engine.LEVEL_NAMES,
+        nivel_non_iaam="FĂRĂ RISC",
+        implicite=_dataclass_defaults(FinalPatientData),
+        zecimale=1,
+    )
+
+ORIGINAL_PROFILE = original_profile()
+ENHANCED_PROFILE = enhanced_profile()
+PROFESSIONAL_PROFILE = professional_profile()
+FINAL_PROFILE = final_profile()
+
+DEFAULT_PROFILES = (ORIGINAL_PROFILE, ENHANCED_PROFILE, PROFESSIONAL_PROFILE, FINAL_PROFILE)
+
+def main():
+    """Scorează o cohortă sub toate profilurile și scrie tabelul comparativ ca JSONL"""
+    from cohort_score import iter_chunks, parse_chunk
+    parser = argparse.ArgumentParser(description="Comparație IAAM între profilurile de scorare")
+    parser.add_argument("input", help="fișier JSON, JSONL sau CSV cu pacienți")
+    parser.add_argument("--profiles", nargs="+", default=None,
+                        help=f"profilurile comparate (implicit: {' '.join(p.nume for p in DEFAULT_PROFILES)})")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="pacienți per fragment")
+    parser.add_argument("-o", "--output", default="-", help="fișier JSONL de ieșire (implicit stdout)")
+    args = parser.parse_args()
+
+    profiles = DEFAULT_PROFILES
+    if args.profiles:
+        known = {profile.nume: profile for profile in DEFAULT_PROFILES}
+        unknown = [name for name in args.profiles if name not in known]
+        if unknown:
+            parser.error(f"Profil necunoscut: {', '.join(unknown)} (disponibile: {', '.join(known)})")
+        profiles = [known[name] for name in args.profiles]
+    kernel = ScoringKernel(profiles)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    total = 0
+    try:
+        for chunk in iter_chunks(args.input, args.chunk_size):
+            table = kernel.score_batch(parse_chunk(*chunk))
+            output.write(table.to_json(orient="records", lines=True, force_ascii=False))
+            output.write("\n" if len(table) else "")
+            total += len(table)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {total} pacienți × {len(kernel.profiles)} profiluri în {elapsed:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
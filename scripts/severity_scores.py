@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Motor SOFA/qSOFA bazat pe tabele de praguri
+Pragurile pe organe se încarcă dintr-un fișier JSON versionat și sunt
+evaluate cu căutare binară, atât pentru un pacient cât și pentru loturi
+"""
+
+import bisect
+import json
+import operator
+import os
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple
+
+import numpy as np
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "severity_breakpoints.json")
+
+def bin_index(edges, values: np.ndarray, side: str = "right") -> np.ndarray:
+    """Indexul intervalului pentru fiecare valoare (echivalent np.searchsorted pe praguri sortate)"""
+    edges = np.asarray(edges)
+    if len(edges) > 8:
+        return np.searchsorted(edges, values, side=side)
+    # pentru tabele mici, comparațiile vectorizate sunt mai rapide decât căutarea binară
+    index = np.zeros(np.shape(values), dtype=np.intp)
+    for edge in edges:
+        index += (values >= edge) if side == "right" else (values > edge)
+    return index
+
+class SeverityScoreTable:
+    """Tabel de praguri SOFA/qSOFA pentru un profil de scorare"""
+
+    OPERATORS = {"<": operator.lt, ">=": operator.ge}
+
+    def __init__(self, profile: Dict[str, Any], version: str, name: str = ""):
+        self.name = name
+        self.version = version
+        self.defaults = profile.get("defaults", {})
+        self.sofa_organs = profile["sofa"]
+        self.qsofa_criteria = profile["qsofa"]
+        self._organs = []
+
+        for organ, spec in self.sofa_organs.items():
+            field = spec.get("field")
+            edges, points = spec.get("edges", []), spec.get("points", [0])
+            if len(points) != len(edges) + 1:
+                raise ValueError(f"SOFA {organ}: {len(points)} puncte pentru {len(edges)} praguri")
+            if any(low >= high for low, high in zip(edges, edges[1:])):
+                raise ValueError(f"SOFA {organ}: pragurile trebuie să fie strict crescătoare")
+            # forma compilată: liste pentru bisect (un pacient), array-uri pentru loturi
+            self._organs.append((
+                organ, field, edges, points,
+                np.asarray(edges, dtype=float), np.asarray(points, dtype=np.int64),
+                spec.get("side", "right"), tuple(spec.get("flags", {}).items()),
+                spec.get("combine", "sum") == "max"
+            ))
+
+        self._organ_index = {compiled[0]: compiled for compiled in self._organs}
+
+        self._criteria = []
+        for criterion_name, criterion in self.qsofa_criteria.items():
+            if criterion["operator"] not in self.OPERATORS:
+                raise ValueError(f"qSOFA {criterion_name}: operator necunoscut {criterion['operator']}")
+            self._criteria.append((criterion_name, criterion["field"],
+                                   self.OPERATORS[criterion["operator"]], criterion["threshold"]))
+
+    def organ_fields(self) -> Dict[str, Tuple[str, ...]]:
+        """Câmpurile citite de fiecare organ SOFA (valoare și indicatori)"""
+        return {
+            organ: tuple(name for name in (field,) + tuple(flag for flag, _ in flags) if name is not None)
+            for organ, field, _, _, _, _, _, flags, _ in self._organs
+        }
+
+    def qsofa_fields(self) -> Tuple[str, ...]:
+        """Câmpurile citite de criteriile qSOFA"""
+        return tuple(dict.fromkeys(field for _, field, _, _ in self._criteria))
+
+    def _value(self, values: Mapping[str, Any], field: str) -> Any:
+        """Valoarea unui câmp, cu valoarea implicită din tabel dacă lipsește"""
+        return values.get(field, self.defaults.get(field))
+
+    def _organ_points(self, compiled: tuple, values: Mapping[str, Any]) -> Any:
+        """Evaluează un organ compilat pentru un pacient sau un lot"""
+        _, field, edges, points, edges_array, points_array, side, flags, combine_max = compiled
+        defaults = self.defaults
+        score = 0
+        if field is not None:
+            value = values.get(field, defaults.get(field))
+            if isinstance(value, np.ndarray):
+                score = points_array[bin_index(edges_array, value, side)]
+            elif side == "right":
+                score = points[bisect.bisect_right(edges, value)]
+            else:
+                score = points[bisect.bisect_left(edges, value)]
+
+        for flag, flag_points in flags:
+            active = values.get(flag, defaults.get(flag))
+            if isinstance(active, np.ndarray):
+                contribution = np.where(active.astype(bool, copy=False), flag_points, 0)
+            else:
+                contribution = flag_points if active else 0
+            if not combine_max:
+                score = score + contribution
+            elif isinstance(score, np.ndarray) or isinstance(contribution, np.ndarray):
+                score = np.maximum(score, contribution)
+            else:
+                score = max(score, contribution)
+        return score
+
+    def organ_points(self, organ: str, values: Mapping[str, Any]) -> Any:
+        """Calculează punctele SOFA pentru un organ (scalar sau array NumPy)"""
+        return self._organ_points(self._organ_index[organ], values)
+
+    def sofa(self, values: Mapping[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Calculează SOFA total și punctele pe organe"""
+        scores = {compiled[0]: self._organ_points(compiled, values) for compiled in self._organs}
+        return sum(scores.values()), scores
+
+    def qsofa(self, values: Mapping[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Calculează qSOFA și criteriile îndeplinite (bool sau mască pe lot)"""
+        defaults = self.defaults
+        met = {
+            name: compare(values.get(field, defaults.get(field)), threshold)
+            for name, field, compare, threshold in self._criteria
+        }
+        return sum(met.values()), met
+
+    def qsofa_labels(self, values: Mapping[str, Any], met: Mapping[str, bool]) -> list:
+        """Descrierile criteriilor qSOFA îndeplinite pentru un pacient"""
+        return [
+            criterion["label"].format(value=self._value(values, criterion["field"]))
+            for name, criterion in self.qsofa_criteria.items() if met[name]
+        ]
+
+@lru_cache(maxsize=None)
+def load_severity_table(profile: str = "enhanced", path: str = DEFAULT_TABLE_PATH) -> SeverityScoreTable:
+    """Încarcă (o singură dată) tabelul de praguri pentru un profil"""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    if profile not in table["profiles"]:
+        raise KeyError(f"Profil SOFA necunoscut: {profile}")
+    return SeverityScoreTable(table["profiles"][profile], table["version"], profile)
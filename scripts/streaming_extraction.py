@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Extracție în flux pentru documente lungi (OCR pe mai multe pagini, foi de observație)
+Documentul vine ca o secvență de linii sau pagini; se scanează doar
+propozițiile complete, iar restul ultimei bucăți (propoziția neterminată)
+trece în bucata următoare, deci contextul unei propoziții nu se pierde la
+granița dintre bucăți, iar memoria folosită nu depinde de lungimea
+documentului (cel mult `max_carry` caractere reținute plus bucata curentă).
+
+Fiecare candidat primește poziția în document și data cea mai recentă
+întâlnită înaintea lui ("12.03.2024", "2024-03-12"); valorile finale se
+aleg per câmp cu o politică de combinare:
+    specific   regula cea mai specifică (prioritatea ei), apoi prima apariție
+    recent     candidatul cu data cea mai recentă, apoi ultima apariție
+    incredere  valoarea susținută de cele mai multe mențiuni, ponderate
+               cu specificitatea regulii
+
+Exemplu:
+    python streaming_extraction.py foaie_observatie.txt --politica recent
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from clinical_scanner import Candidate
+from device_duration import SENTENCE_END
+from medical_patterns import PatternRegistry
+
+# Date "zz.ll.aaaa" / "zz/ll/aaaa" sau ISO "aaaa-ll-zz"
+DATE_PATTERN = PatternRegistry.compile(r"(?<![\d.])(?:(\d{1,2})[./](\d{1,2})[./](\d{4})"
+                                       r"|(\d{4})-(\d{1,2})-(\d{1,2}))(?![\d.]\d)")
+
+POLICIES = ("specific", "recent", "incredere")
+
+def parse_date(match) -> Optional[date]:
+    """Data dintr-o potrivire DATE_PATTERN (None dacă nu este o dată validă)"""
+    day, month, year = (match.group(1), match.group(2), match.group(3)) if match.group(1) else \
+        (match.group(6), match.group(5), match.group(4))
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+def select(candidates: Sequence[Candidate], politica: str = "specific") -> Optional[Candidate]:
+    """Candidatul ales de politică dintre candidații aceluiași câmp"""
+    if not candidates:
+        return None
+    if politica == "specific":
+        return min(candidates, key=lambda c: (c.prioritate, c.start))
+    if politica == "recent":
+        return max(candidates, key=lambda c: (c.data or date.min, c.start))
+    if politica == "incredere":
+        support: Dict[Any, float] = defaultdict(float)
+        for candidate in candidates:
+            support[candidate.valoare] += 1.0 / (1 + candidate.prioritate)
+        best = max(support.values())
+        return min((c for c in candidates if support[c.valoare] == best), key=lambda c: (c.prioritate, c.start))
+    raise ValueError(f"Politică necunoscută: {politica} (disponibile: {', '.join(POLICIES)})")
+
+def merge(candidates: Iterable[Candidate], politica: str = "specific",
+          multiple: Iterable[str] = ()) -> Dict[str, Any]:
+    """Valorile finale per câmp; câmpurile din `multiple` păstrează toate valorile distincte"""
+    grouped: Dict[str, List[Candidate]] = defaultdict(list)
+    for candidate in candidates:
+        grouped[candidate.camp].append(candidate)
+    multiple = frozenset(multiple)
+    merged = {}
+    for camp, group in grouped.items():
+        if camp in multiple:
+            group.sort(key=lambda c: (c.prioritate, c.start))
+            merged[camp] = list(dict.fromkeys(c.valoare for c in group))
+        else:
+            merged[camp] = select(group, politica).valoare
+    return merged
+
+class StreamingExtractor:
+    """Aplică o funcție de extracție pe propozițiile complete ale unui flux de bucăți de text"""
+
+    def __init__(self, candidates: Callable[[str], Iterable[Candidate]], max_carry: int = 8192):
+        self.candidates = candidates  # text (cu litere mici) → candidați cu poziții în acel text
+        self.max_carry = max_carry
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[Candidate]:
+        """Candidații documentului, în ordinea blocurilor, cu poziții în document și data curentă.
+
+        Bucățile se concatenează ca atare (liniile unui fișier își păstrează "\\n").
+        """
+        carry, offset, current = "", 0, None
+        for chunk in chunks:
+            text = carry + chunk
+            cut = self._cut(text, len(carry))
+            if cut:
+                found, current = self._block(text[:cut], offset, current)
+                yield from found
+                offset += cut
+                text = text[cut:]
+            carry = text
+        if carry:
+            yield from self._block(carry, offset, current)[0]
+
+    def collect(self, chunks: Iterable[str]) -> Dict[str, List[Candidate]]:
+        """Candidații per câmp, în ordinea din document"""
+        grouped: Dict[str, List[Candidate]] = defaultdict(list)
+        for candidate in self.stream(chunks):
+            grouped[candidate.camp].append(candidate)
+        return dict(grouped)
+
+    def _cut(self, text: str, searched: int) -> int:
+        """Lungimea prefixului format din propoziții complete (0 dacă nu există încă unul)"""
+        cut = 0
+        # restul reținut nu conține sfârșituri de propoziție: se caută doar în bucata nouă
+        for match in SENTENCE_END.finditer(text, max(0, searched - 1)):
+            if match.end() < len(text) or match.group() == "\n":  # "38." la final poate continua cu "5"
+                cut = match.end()
+        if not cut and len(text) > self.max_carry:  # propoziție foarte lungă: tăiem la ultimul spațiu
+            cut = text.rfind(" ") + 1 or len(text)
+        return cut
+
+    def _block(self, block: str, offset: int, current: Optional[date]) -> Tuple[List[Candidate], Optional[date]]:
+        """Candidații unui bloc de propoziții complete și data curentă la sfârșitul blocului"""
+        lowered = block.lower()
+        dates = [(match.start(), parse_date(match)) for match in DATE_PATTERN.finditer(lowered)]
+        dates = [(start, found) for start, found in dates if found is not None]
+        found = sorted(self.candidates(lowered), key=lambda c: c.start)
+        index = 0
+        for candidate in found:
+            while index < len(dates) and dates[index][0] <= candidate.start:
+                current = dates[index][1]
+                index += 1
+            candidate.data = current
+            candidate.start += offset
+            candidate.end += offset
+        return found, dates[-1][1] if dates else current
+
+def main() -> int:
+    """Punctul de intrare al liniei de comandă: extracția Enhanced în flux, linie cu linie"""
+    parser = argparse.ArgumentParser(description="Extracție în flux pentru documente medicale lungi")
+    parser.add_argument("fisier", help="fișierul text ('-' pentru intrarea standard)")
+    parser.add_argument("--politica", choices=POLICIES, default="specific", help="politica de combinare")
+    args = parser.parse_args()
+
+    from epimind_ai_enhanced import EnhancedMedicalDataExtractor
+
+    extractor = EnhancedMedicalDataExtractor()
+    source = sys.stdin if args.fisier == "-" else open(args.fisier, "r", encoding="utf-8")
+    with source:
+        extracted = extractor.extract_stream(source, args.politica)
+    for camp, valoare in extracted.items():
+        print(f"{camp:<28} {valoare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,12 +4,14 @@ Test script pentru EpiMind AI Enhanced
 Testează toate funcționalitățile principale
 """
 
+import itertools
 import sys
+import random
 import json
 from datetime import datetime
 from epimind_ai_enhanced import (
     PatientData, EnhancedOllamaAI, EnhancedIAAMPredictor, 
-    EnhancedMedicalDataExtractor
+    EnhancedMedicalDataExtractor, patients_to_frame
 )
 
 def test_patient_data():
@@ -93,6 +95,1055 @@ def test_iaam_predictor():
     for detail in result['details'][:5]:  # primele 5
         print(f"     • {detail}")
 
+def test_iaam_predictor_batch():
+    """Testează scorarea în lot față de scorarea individuală"""
+    print("\n🧪 Testez EnhancedIAAMPredictor.predict_iaam_risk_batch...")
+    
+    predictor = EnhancedIAAMPredictor()
+    patients = [
+        PatientData(ore_spitalizare=24),
+        PatientData(ore_spitalizare=72, cateter_central=True, cateter_central_days=3),
+        PatientData(ore_spitalizare=400, ventilatie_mecanica=True, ventilatie_mecanica_days=15,
+                    pao2_fio2=180, glasgow=15, crp=250, procalcitonina=12),
+        PatientData(ore_spitalizare=120, tas=65, frecventa_respiratorie=24, glasgow=9,
+                    cultura_pozitiva=True, bacterie="Klebsiella pneumoniae", rezistente=["KPC", "XDR"]),
+        PatientData(ore_spitalizare=800, leucocite=2.0, temperatura=35.5, vasopresoare=True,
+                    cultura_pozitiva=True, rezistente=["necunoscut"])
+    ]
+    
+    batch = predictor.predict_iaam_risk_batch(patients_to_frame(patients))
+    
+    for patient, row in zip(patients, batch.itertuples()):
+        expected = predictor.predict_iaam_risk(patient)
+        assert row.patient_id == patient.patient_id
+        assert row.score == expected["score"], (row.score, expected["score"])
+        assert row.level == expected["level"]
+        assert row.color_class == expected.get("color_class", "risk-low")
+        if expected["is_iaam"]:
+            assert row.sofa_score == expected["sofa_score"]
+            assert row.qsofa_score == expected["qsofa_score"]
+    
+    print(f"✅ {len(batch)} pacienți scorați identic în lot")
+
+def test_incremental_rescore():
+    """Testează rescorarea incrementală pe baza grafului de dependențe"""
+    print("\n🧪 Testez EnhancedIAAMPredictor.rescore...")
+    
+    predictor = EnhancedIAAMPredictor()
+    patient = PatientData(ore_spitalizare=120, cateter_central=True, cateter_central_days=5,
+                          crp=40, glasgow=13, tas=95)
+    
+    first = predictor.rescore(patient)
+    assert first["score"] == predictor.predict_iaam_risk(patient)["score"]
+    assert predictor.field_components["crp"] == ["crp"]
+    
+    # modificare CRP: doar componenta CRP se recalculează
+    patient.crp = 180
+    patient.rezistente.append("KPC")
+    patient.cultura_pozitiva = True
+    updated = predictor.rescore(patient)
+    expected = predictor.predict_iaam_risk(patient)
+    assert updated["score"] == expected["score"]
+    assert updated["details"] == expected["details"]
+    
+    # lista explicită de câmpuri modificate
+    patient.glasgow = 8
+    assert predictor.rescore(patient, ["glasgow"])["sofa_details"] == expected["sofa_details"] | {"neurologic": 3}
+    
+    print(f"✅ Scor {first['score']} → {updated['score']} (rescorare incrementală)")
+
+def test_patient_patch():
+    """Testează actualizarea în loc a fișei pacientului (set tipizat de modificări)"""
+    print("\n🧪 Testez PatientData.patch...")
+    
+    from patient_patch import FieldChange
+    from epimind_ai_ultra_enhanced import PatientData as UltraPatientData, UltraEnhancedMedicalDataExtractor
+    
+    patient = PatientData(ore_spitalizare=72)
+    patient_id = patient.patient_id
+    resistances = ["ESBL"]
+    changes = patient.patch({"crp": 150, "ore_spitalizare": 72, "cateter_central": True, "glasgow": 13.0,
+                             "rezistente": resistances, "patient_id": "X", "necunoscut": 1, "tas": "90"})
+    
+    # doar câmpurile schimbate, cu valoarea veche și cea nouă, aduse la tipul câmpului
+    assert changes == {"crp": FieldChange("crp", 5.0, 150.0),
+                       "cateter_central": FieldChange("cateter_central", False, True),
+                       "glasgow": FieldChange("glasgow", 15, 13),
+                       "rezistente": FieldChange("rezistente", [], ["ESBL"])}
+    assert isinstance(patient.crp, float) and isinstance(patient.glasgow, int)
+    assert patient.patient_id == patient_id and patient.tas == 120  # identificarea și valorile invalide rămân
+    resistances.append("KPC")
+    assert patient.rezistente == ["ESBL"]  # lista extractorului a fost copiată
+    assert patient.patch({"crp": 150.0}) == {}
+    
+    # rescorarea doar pe câmpurile modificate dă scorul complet
+    predictor = EnhancedIAAMPredictor()
+    predictor.rescore(patient)
+    changes = patient.patch({"crp": 220, "ventilatie_mecanica": True, "ventilatie_mecanica_days": 4})
+    assert predictor.rescore(patient, sorted(changes)) == predictor.predict_iaam_risk(patient)
+    
+    # aceeași interfață pentru fișa UltraEnhanced (extractorul ei validează deja tipurile)
+    extractor = UltraEnhancedMedicalDataExtractor()
+    ultra = UltraPatientData()
+    extracted = extractor.validate_extracted_data(extractor.extract_from_text("internat de 3 zile, CRP 120"))
+    changes = ultra.patch(extracted)
+    assert set(changes) == set(extracted) and ultra.ore_spitalizare == 72 and ultra.crp == 120
+    
+    print(f"✅ {len(changes)} câmpuri modificate în loc, rescorare identică cu evaluarea completă")
+
+def test_score_only():
+    """Testează modul score_only (fără texte de explicație)"""
+    print("\n🧪 Testez predict_iaam_risk(score_only=True)...")
+    
+    predictor = EnhancedIAAMPredictor()
+    patient = PatientData(ore_spitalizare=240, ventilatie_mecanica=True, ventilatie_mecanica_days=9,
+                          cultura_pozitiva=True, bacterie="Acinetobacter baumannii", rezistente=["XDR"],
+                          tas=85, frecventa_respiratorie=25, procalcitonina=3.0)
+    
+    full = predictor.predict_iaam_risk(patient)
+    fast = predictor.predict_iaam_risk(patient, score_only=True)
+    
+    assert "details" not in fast and "recommendations" not in fast
+    for key, value in fast.items():
+        assert full[key] == value, key
+    
+    print(f"✅ Scor {fast['score']} ({fast['level']}) fără detalii")
+
+def test_risk_cache():
+    """Testează cache-ul LRU adresat prin conținut"""
+    print("\n🧪 Testez RiskCache...")
+    
+    from risk_cache import RiskCache
+    
+    cache = RiskCache(maxsize=2)
+    predictor = EnhancedIAAMPredictor(cache=cache)
+    uncached = EnhancedIAAMPredictor()
+    
+    first = PatientData(ore_spitalizare=96, crp=120, cateter_central=True, cateter_central_days=4)
+    twin = PatientData(ore_spitalizare=96.0, crp=120, cateter_central=True, cateter_central_days=4)
+    
+    result = predictor.predict_iaam_risk(first)
+    twin_result = predictor.predict_iaam_risk(twin)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert twin_result["patient_id"] == twin.patient_id
+    assert twin_result["score"] == result["score"] == uncached.predict_iaam_risk(first)["score"]
+    
+    # rezultatul returnat este o copie; modificarea lui nu afectează cache-ul
+    twin_result["details"].clear()
+    assert predictor.predict_iaam_risk(first)["details"] == result["details"]
+    
+    # evicție LRU
+    predictor.predict_iaam_risk(PatientData(ore_spitalizare=200))
+    predictor.predict_iaam_risk(PatientData(ore_spitalizare=300))
+    assert cache.stats()["size"] == 2
+    
+    # prima evaluare prin rescore (calea interfeței Enhanced) folosește același cache
+    cache = RiskCache()
+    predictor = EnhancedIAAMPredictor(cache=cache)
+    predictor.rescore(first)
+    assert predictor.rescore(twin)["score"] == result["score"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    
+    print(f"✅ Cache: {cache.stats()}")
+
+def test_severity_table():
+    """Testează tabelul de praguri SOFA/qSOFA (pacient individual și lot)"""
+    print("\n🧪 Testez SeverityScoreTable...")
+    
+    import numpy as np
+    from severity_scores import load_severity_table
+    
+    table = load_severity_table("enhanced")
+    patient = vars(PatientData(pao2_fio2=150, trombocite=40, bilirubina=2.5, tas=85,
+                               glasgow=12, creatinina=4.0, frecventa_respiratorie=24))
+    
+    score, organs = table.sofa(patient)
+    assert organs == {"respirator": 3, "coagulare": 3, "hepatic": 2,
+                      "cardiovascular": 2, "neurologic": 2, "renal": 3}
+    assert score == 15
+    qsofa_score, _ = table.qsofa(patient)
+    assert qsofa_score == 3
+    
+    # același tabel evaluat pe array-uri
+    cohort = {field: np.array([value, value]) for field, value in patient.items()
+              if isinstance(value, (int, float))}
+    cohort_scores, _ = table.sofa(cohort)
+    assert cohort_scores.tolist() == [15, 15]
+    
+    # profilul original: cardiovascular aditiv, valori implicite pentru câmpurile lipsă
+    original = load_severity_table("original")
+    assert original.sofa({"hipotensiune": True, "vasopresoare": True})[0] == 3
+    assert original.qsofa({})[0] == 0
+    
+    print(f"✅ Tabel SOFA versiunea {table.version}: scor {score}, qSOFA {qsofa_score}")
+
+def test_ultra_risk_components():
+    """Testează componentele numerice ale calculatorului ultra-avansat"""
+    print("\n🧪 Testez UltraAdvancedIAAMCalculator (componente numerice)...")
+    
+    from epimind_ai_final_professional import PatientData as UltraPatientData, UltraAdvancedIAAMCalculator
+    
+    calculator = UltraAdvancedIAAMCalculator()
+    patient = UltraPatientData(ore_spitalizare=400, cateter_venos_central=True, zile_cateter_venos=9,
+                               ventilatie_mecanica=True, zile_ventilatie=6, crp=125, pct=4,
+                               cultura_pozitiva=True, bacterie="Klebsiella pneumoniae", rezistente=["KPC"])
+    
+    result = calculator.calculate_risk(patient)
+    records = {record["nume"]: record for record in result["componente_numerice"]}
+    
+    assert set(records) == set(result["componente"])
+    assert records["CRP"]["puncte"] == 12.5 and records["CRP"]["unitate"] == "mg/L"
+    assert result["componente"]["CRP"] == "12.5 (CRP: 125 mg/L)"
+    
+    # factorii principali: componentele > 15 puncte, ordonate descrescător
+    ranked = sorted((r for r in records.values() if r["puncte"] > 15), key=lambda r: -r["puncte"])
+    assert result["factori_risc_principali"] == [r["nume"] for r in ranked[:3]]
+    
+    print(f"✅ Factori principali: {', '.join(result['factori_risc_principali'])}")
+
+def test_risk_trajectory():
+    """Testează proiecția vectorizată a traiectoriei de risc"""
+    print("\n🧪 Testez risk_trajectory.project_risk / project_ward...")
+    
+    from dataclasses import replace
+    from epimind_ai_final_professional import PatientData as UltraPatientData, UltraAdvancedIAAMCalculator
+    from risk_trajectory import TimelineEvent, project_risk, project_ward
+    
+    calculator = UltraAdvancedIAAMCalculator()
+    patient = UltraPatientData(ore_spitalizare=60, crp=30, cateter_urinar=True, zile_cateter_urinar=2)
+    events = [
+        TimelineEvent(30, "cateter_venos_central", True),
+        TimelineEvent(100, "cultura_pozitiva", True),
+        TimelineEvent(100, "bacterie", "Pseudomonas aeruginosa"),
+        TimelineEvent(120, "crp", 150),
+        TimelineEvent(200, "cateter_urinar", False),
+    ]
+    
+    trajectory = project_risk(calculator, patient, events)
+    assert len(trajectory["scor"]) == 14 * 24 + 1
+    
+    for hour in (0, 29, 30, 99, 130, 250, 336):
+        state = replace(patient, ore_spitalizare=60 + hour, zile_cateter_urinar=2 + hour // 24)
+        if hour >= 30:
+            state = replace(state, cateter_venos_central=True, zile_cateter_venos=(hour - 30) // 24)
+        if hour >= 100:
+            state = replace(state, cultura_pozitiva=True, bacterie="Pseudomonas aeruginosa")
+        if hour >= 120:
+            state = replace(state, crp=150)
+        if hour >= 200:
+            state = replace(state, cateter_urinar=False)
+        expected = calculator.calculate_risk(state)["scor_total"]
+        assert abs(trajectory["scor"][hour] - expected) < 0.06, (hour, trajectory["scor"][hour], expected)
+    
+    ward = project_ward(calculator, [patient] * 50)
+    assert ward["scor"].shape == (50, 14 * 24 + 1)
+    
+    print(f"✅ Traiectorie: {trajectory['scor'][0]:.1f} → {trajectory['scor'][-1]:.1f} în 14 zile")
+
+def test_sensitivity():
+    """Testează analiza contrafactuală vectorizată pe ambele calculatoare"""
+    print("\n🧪 Testez analiza de sensibilitate (intervenții)...")
+    
+    from dataclasses import replace
+    from epimind_ai_final_professional import PatientData as UltraPatientData, UltraAdvancedIAAMCalculator
+    
+    predictor = EnhancedIAAMPredictor()
+    patient = PatientData(ore_spitalizare=200, cateter_central=True, cateter_central_days=10,
+                          procalcitonina=3.0, crp=120, cultura_pozitiva=True,
+                          bacterie="Klebsiella pneumoniae", rezistente=["KPC"])
+    
+    result = predictor.sensitivity(patient)
+    assert result["current_score"] == predictor.predict_iaam_risk(patient)["score"]
+    # intervențiile fără efect (ex. sondă urinară absentă) nu apar
+    assert "Îndepărtare sondă urinară" not in [item["interventie"] for item in result["interventions"]]
+    deltas = [item["delta"] for item in result["interventions"]]
+    assert deltas == sorted(deltas)
+    for item in result["interventions"]:
+        expected = predictor.predict_iaam_risk(replace(patient, **item["modificari"]))["score"]
+        assert item["scor"] == expected and item["delta"] == expected - result["current_score"]
+    
+    calculator = UltraAdvancedIAAMCalculator()
+    ultra = UltraPatientData(ore_spitalizare=300, cateter_venos_central=True, zile_cateter_venos=6,
+                             pct=4, crp=150, cultura_pozitiva=True, bacterie="Acinetobacter baumannii",
+                             rezistente=["CRE"])
+    custom = {"Fără cultură pozitivă": {"cultura_pozitiva": False}, "Îndepărtare CVC": {"cateter_venos_central": False}}
+    result = calculator.sensitivity(ultra, custom)
+    assert [item["interventie"] for item in result["interventii"]][0] == "Fără cultură pozitivă"
+    for item in result["interventii"]:
+        expected = calculator.calculate_risk(replace(ultra, **item["modificari"]))["scor_total"]
+        assert abs(item["scor"] - expected) < 0.06
+    
+    print(f"✅ Cea mai eficientă intervenție: {result['interventii'][0]['interventie']} ({result['interventii'][0]['delta']})")
+
+def test_uncertainty_intervals():
+    """Testează intervalele Monte Carlo ale probabilității IAAM"""
+    print("\n🧪 Testez intervalele de incertitudine Monte Carlo...")
+    
+    import numpy as np
+    from epimind_ai_final_professional import PatientData as UltraPatientData, UltraAdvancedIAAMCalculator
+    from risk_uncertainty import UncertaintyModel
+    
+    calculator = UltraAdvancedIAAMCalculator()
+    patient = UltraPatientData(ore_spitalizare=300, cateter_venos_central=True, zile_cateter_venos=6,
+                               crp=150, pct=4, leucocite=19000, creatinina=1.1, albumina=3.8, hemoglobina=12)
+    
+    result = calculator.calculate_risk(patient)
+    lower, upper = result["interval_confidenta"]
+    assert 0 <= lower <= result["probabilitate"] <= upper <= 1
+    # rezultat determinist pentru aceeași sămânță
+    assert calculator.calculate_risk(patient)["interval_confidenta"] == (lower, upper)
+    
+    # toate analizele măsurate: intervalul cu date lipsă este cel de măsurare
+    assert result["interval_date_lipsa"] == result["interval_confidenta"]
+    # simulările (score_only) nu rulează Monte Carlo
+    assert "interval_confidenta" not in calculator.calculate_risk(patient, score_only=True)
+    
+    # fără erori de măsurare și fără priori intervalul se reduce la estimarea punctuală
+    exact = UltraAdvancedIAAMCalculator(uncertainty=UncertaintyModel(erori={}, priori={}, n_draws=10))
+    lower, upper = exact.calculate_risk(patient)["interval_confidenta"]
+    assert abs(lower - upper) < 1e-12 and abs(lower - result["probabilitate"]) < 1e-3
+    
+    cohort = [patient, UltraPatientData(ore_spitalizare=20), UltraPatientData(ore_spitalizare=100)]
+    intervals = calculator.calculate_confidence_intervals(cohort)
+    assert intervals.shape == (3, 2) and tuple(intervals[1]) == (0.0, 0.0)
+    # analizele lipsă, eșantionate din priori, lărgesc doar intervalul raportat separat
+    with_priors = calculator.calculate_confidence_intervals(cohort, priori=True)
+    assert intervals[2, 1] - intervals[2, 0] < 1e-12 and with_priors[2, 1] - with_priors[2, 0] > 0.01
+    assert np.allclose(with_priors[0], intervals[0])
+    missing = calculator.calculate_risk(cohort[2])
+    assert missing["interval_date_lipsa"] == calculator.uncertainty.interval(calculator, cohort[2], priori=True)
+    assert missing["interval_confidenta"][0] <= missing["probabilitate"] <= missing["interval_confidenta"][1]
+    
+    # intervalul conține întotdeauna probabilitatea afișată, inclusiv cu analize lipsă (0)
+    # și valori la pragurile de scor
+    random.seed(9)
+    cohort = [UltraPatientData(ore_spitalizare=random.choice([60, 200]), cateter_venos_central=random.random() < 0.5,
+                               crp=random.choice([0, 50, 100, 150]), pct=random.choice([0, 0.5, 2, 10]),
+                               leucocite=random.choice([0, 4000, 12000, 20000]), creatinina=random.choice([0, 1.2, 2]),
+                               albumina=random.choice([0, 2.5, 3.5]), hemoglobina=random.choice([0, 7, 12]))
+              for _ in range(200)]
+    intervals = calculator.calculate_confidence_intervals(cohort)
+    for candidate, (lower, upper) in zip(cohort, intervals):
+        assert lower - 1e-9 <= calculator.calculate_risk(candidate)["probabilitate"] <= upper + 1e-9
+    
+    print(f"✅ Interval 95%: {result['interval_confidenta'][0]:.1%} - {result['interval_confidenta'][1]:.1%}")
+
+def test_probability_calibration():
+    """Testează calibrarea sigmoidei scor -> probabilitate"""
+    print("\n🧪 Testez calibrarea probabilității IAAM...")
+    
+    import os
+    import tempfile
+    import numpy as np
+    from epimind_ai_final_professional import UltraAdvancedIAAMCalculator
+    from risk_calibration import ProbabilityCalibration, brier_score, fit_calibration, load_calibration
+    
+    # artefactul livrat reproduce sigmoida inițială (scor - 60) / 20
+    calculator = UltraAdvancedIAAMCalculator()
+    assert abs(calculator._calculate_probability(80.0) - 1 / (1 + np.exp(-1))) < 1e-12
+    
+    rng = np.random.default_rng(7)
+    scores = rng.uniform(0, 200, 50000).round(1)
+    outcomes = (rng.random(len(scores)) < 1 / (1 + np.exp(-(-4 + 0.04 * scores)))).astype(float)
+    
+    calibration = fit_calibration(scores, outcomes, version="test")
+    assert abs(calibration.intercept + 4) < 0.2 and abs(calibration.panta - 0.04) < 0.003
+    assert calibration.metrici["brier"] < calibration.metrici["brier_necalibrat"]
+    assert sum(calibration.metrici["fiabilitate"]["numar"]) == len(scores)
+    
+    isotonic = fit_calibration(scores, outcomes, isotonic=True, version="test-izotonic")
+    assert np.all(np.diff(isotonic.izotonic[1]) >= 0)
+    assert brier_score(isotonic.predict(scores), outcomes) <= calibration.metrici["brier"] + 1e-3
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "calibrare.json")
+        isotonic.save(path)
+        loaded = load_calibration(path)
+        assert loaded.version == "test-izotonic"
+        assert np.allclose(loaded.predict(scores[:100]), isotonic.predict(scores[:100]))
+    
+    print(f"✅ Calibrare: intercept {calibration.intercept:.2f}, pantă {calibration.panta:.4f}, "
+          f"Brier {calibration.metrici['brier']:.4f}")
+
+def test_ward_stream():
+    """Testează scorarea în flux a evenimentelor de secție"""
+    print("\n🧪 Testez ward_stream (flux JSONL de observații)...")
+    
+    from dataclasses import replace
+    from ward_stream import WardRiskStream, stream_ward
+    
+    hour = 3600
+    lines = [
+        json.dumps({"patient_id": "P1", "timestamp": 0, "values": {"ore_spitalizare": 40}}),
+        "",
+        json.dumps({"patient_id": "P1", "timestamp": 1 * hour, "field": "crp", "value": 30}),
+        json.dumps({"patient_id": "P1", "timestamp": 9 * hour, "field": "cateter_central", "value": True}),
+        json.dumps({"patient_id": "P1", "timestamp": 10 * hour, "field": "frecventa_cardiaca", "value": 85}),
+        json.dumps({"patient_id": "P2", "timestamp": 10 * hour, "values": {"ore_spitalizare": 100, "crp": 150}}),
+        json.dumps({"patient_id": "P1", "timestamp": 130 * hour, "field": "temperatura", "value": 36.6}),
+    ]
+    changes = list(stream_ward(lines))
+    
+    # P1: NU IAAM la admitere, apoi schimbare la 48h (cu cateterul inserat), apoi vechimea cateterului
+    assert [change["patient_id"] for change in changes] == ["P1", "P1", "P2", "P1"]
+    assert changes[0]["level"] == "NU IAAM" and changes[0]["previous_score"] is None
+    assert changes[1]["previous_level"] == "NU IAAM" and changes[1]["score"] > 0
+    assert changes[3]["previous_score"] == changes[1]["score"] and changes[3]["score"] > changes[1]["score"]
+    
+    stream = WardRiskStream(max_patients=2)
+    list(stream.run([{"patient_id": f"P{i}", "timestamp": 0, "field": "crp", "value": 80} for i in range(5)]))
+    assert list(stream.patients) == ["P3", "P4"]
+    stream.process({"patient_id": "P4", "timestamp": 0, "type": "discharge"})
+    assert list(stream.patients) == ["P3"]
+    
+    # starea incrementală coincide cu evaluarea completă
+    stream = WardRiskStream()
+    list(stream.run(json.loads(line) for line in lines if line))
+    for state in stream.patients.values():
+        expected = stream.predictor.predict_iaam_risk(replace(state.data), score_only=True)
+        assert expected["score"] == state.score and expected["level"] == state.level
+    assert stream.patients["P1"].data.cateter_central_days == 5
+
+    # valorile se validează după tipul câmpului; cele respinse se numără, fără să strice fluxul
+    stream = WardRiskStream()
+    stream.process({"patient_id": "P9", "timestamp": 0, "values": {
+        "crp": "150", "cateter_central": "da", "rezistente": "KPC", "ore_spitalizare": "mult",
+        "cateter_central_days": None, "patient_id": "X", "camp_inexistent": 1, "leucocite": 14}})
+    data = stream.patients["P9"].data
+    assert stream.ignored_fields == 7
+    assert data.crp == PatientData().crp and data.cateter_central is False and data.rezistente == [] and data.patient_id == "P9"
+    assert data.leucocite == 14.0 and isinstance(data.leucocite, float)
+    stream.process({"patient_id": "P9", "timestamp": 3600, "values": {"rezistente": ("KPC",), "ore_spitalizare": 72}})
+    assert data.rezistente == ["KPC"] and data.ore_spitalizare == 72 and stream.ignored_fields == 7
+
+    print(f"✅ {len(changes)} schimbări de risc din {len(lines) - 1} evenimente")
+
+def test_cohort_score():
+    """Testează scorarea în lot a cohortelor (ordine păstrată, toate calculatoarele)"""
+    print("\n🧪 Testez cohort_score (ProcessPoolExecutor)...")
+    
+    import os
+    import tempfile
+    import pandas as pd
+    from cohort_score import score_cohort
+    
+    predictor = EnhancedIAAMPredictor()
+    patients = [
+        PatientData(patient_id=f"C{i:03d}", ore_spitalizare=24 + i * 7, cateter_central=i % 2 == 0,
+                    cateter_central_days=i % 9, crp=5 + i * 3, cultura_pozitiva=i % 3 == 0,
+                    bacterie="Klebsiella pneumoniae" if i % 3 == 0 else "", rezistente=["KPC"] if i % 6 == 0 else [])
+        for i in range(60)
+    ]
+    
+    with tempfile.TemporaryDirectory() as folder:
+        jsonl_path = os.path.join(folder, "cohorta.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for patient in patients:
+                f.write(json.dumps(vars(patient), default=str) + "\n")
+        csv_path = os.path.join(folder, "cohorta.csv")
+        frame = patients_to_frame(patients)
+        frame["rezistente"] = frame["rezistente"].map(";".join)
+        frame.to_csv(csv_path, index=False)
+        
+        results = [json.loads(line) for _, lines in score_cohort(jsonl_path, "enhanced", workers=2, chunk_size=7)
+                   for line in lines.splitlines()]
+        assert [result["patient_id"] for result in results] == [patient.patient_id for patient in patients]
+        for patient, result in zip(patients, results):
+            assert result["score"] == predictor.predict_iaam_risk(patient)["score"]
+        
+        from_csv = [json.loads(line) for _, lines in score_cohort(csv_path, "enhanced", workers=1, chunk_size=25)
+                    for line in lines.splitlines()]
+        assert from_csv == results
+        
+        for calculator in ("final", "professional"):
+            counts = [count for count, _ in score_cohort(jsonl_path, calculator, workers=2, chunk_size=25)]
+            assert counts == [25, 25, 10]
+        
+        # recomandările în lot cu câmpuri absente (JSONL) sau celule goale (CSV) = calea scalară
+        from epimind_ai_final_professional import PatientData as UltraPatientData, UltraAdvancedIAAMCalculator
+        calculator = UltraAdvancedIAAMCalculator()
+        rows = [{"ore_spitalizare": 120, "crp": 80},
+                {"ore_spitalizare": 120, "cateter_urinar": True, "cultura_urina_pozitiva": True, "bacterii_urina": 100000}]
+        expected = [list(calculator.calculate_risk(UltraPatientData(**row))["recomandari"]) for row in rows]
+        final_jsonl = os.path.join(folder, "final.jsonl")
+        with open(final_jsonl, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        final_csv = os.path.join(folder, "final.csv")
+        pd.DataFrame(rows).to_csv(final_csv, index=False)
+        for path in (final_jsonl, final_csv):
+            scored = [json.loads(line) for _, lines in score_cohort(path, "final", workers=1, recommendations=True)
+                      for line in lines.splitlines()]
+            assert [result["recomandari"] for result in scored] == expected
+    
+    print(f"✅ {len(results)} pacienți scorați în ordine (JSONL și CSV)")
+
+def test_note_extraction():
+    """Testează extracția în lot din note (procese paralele, ordine păstrată, JSONL PatientData)"""
+    print("\n🧪 Testez note_extraction (extract_many, ProcessPoolExecutor)...")
+    
+    import os
+    import tempfile
+    from note_extraction import iter_chunks, run_chunks
+    
+    extractor = EnhancedMedicalDataExtractor()
+    texts = [f"Internat de {i} zile, CRP {10 + i}, CVC de {i % 5 + 1} zile" + (", E. coli ESBL" if i % 4 == 0 else "")
+             for i in range(1, 41)]
+    expected = [extractor.extract_from_text(text) for text in texts]
+    assert list(extractor.extract_many(texts, workers=2, chunk_size=7)) == expected
+    assert list(extractor.extract_many(iter(texts), workers=1, chunk_size=100)) == expected
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "note.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i, text in enumerate(texts):
+                f.write(json.dumps({"patient_id": f"N{i:03d}", "text": text, "timestamp": "2024-03-12T08:00:00"}) + "\n")
+        results = [json.loads(line) for _, lines, _ in run_chunks(iter_chunks(path, 9), "enhanced", workers=2)
+                   for line in lines.splitlines()]
+    assert [record["patient_id"] for record in results] == [f"N{i:03d}" for i in range(40)]
+    assert results[0]["crp"] == 11 and results[0]["cateter_central_days"] == 2 and results[0]["bacterie"] == ""
+    assert results[3]["rezistente"] == ["ESBL"] and results[3]["timestamp"].startswith("2024-03-12")
+    assert set(results[0]) == set(PatientData.__dataclass_fields__)
+    
+    # o notă invalidă devine o înregistrare de eroare; restul lotului continuă
+    notes = ['{"id": 0, "text": "CRP 40"}\n', '{"id": 7, "text": "CRP 50"\n', "\n",
+             '{"id": 8, "text": "CRP 60", "timestamp": "12.03.2024"}\n', '{"patient_id": "P9", "text": "CRP 70"}\n']
+    for workers in (1, 2):
+        chunks = run_chunks([("jsonl", notes[:3]), ("jsonl", notes[3:])], "enhanced", workers=workers)
+        counts, errors, records = 0, 0, []
+        for count, output, failed in chunks:
+            counts, errors = counts + count, errors + failed
+            records.extend(json.loads(line) for line in output.splitlines())
+        assert (counts, errors) == (4, 2)
+        assert [record.get("patient_id") for record in records] == ["0", None, None, "P9"]
+        assert [record.get("nota") for record in records] == [None, 2, 4, None] and "eroare" in records[1]
+        assert records[3]["crp"] == 70
+    
+    print(f"✅ {len(results)} note extrase în ordine, înregistrări PatientData complete")
+
+def test_risk_index():
+    """Testează indexul incremental top-K și contoarele pe niveluri"""
+    print("\n🧪 Testez RiskIndex (top-K pacienți cu risc maxim)...")
+    
+    import random
+    from risk_index import RiskIndex
+    
+    levels = EnhancedIAAMPredictor.LEVEL_NAMES + ("NU IAAM",)
+    index = RiskIndex(levels, k=5)
+    reference = {}
+    rng = random.Random(11)
+    for step in range(3000):
+        patient_id = f"P{rng.randrange(200)}"
+        if rng.random() < 0.1:
+            assert index.remove(patient_id) == (patient_id in reference)
+            reference.pop(patient_id, None)
+        else:
+            score = rng.randrange(0, 250)
+            level = levels[sum(score >= threshold for threshold in EnhancedIAAMPredictor.LEVEL_THRESHOLDS)]
+            index.update(patient_id, score, level, step=step)
+            reference[patient_id] = (score, level, step)
+        
+        if step % 100 == 0:
+            expected = sorted(reference.items(), key=lambda item: (-item[1][0], item[1][2]))[:5]
+            assert [(entry["patient_id"], entry["score"]) for entry in index.top()] == \
+                [(patient_id, value[0]) for patient_id, value in expected]
+            counts = index.level_counts()
+            assert list(counts) == list(levels) and sum(counts.values()) == len(reference) == len(index)
+            for level in levels:
+                assert counts[level] == sum(value[1] == level for value in reference.values())
+    
+    # heap-ul nu crește nelimitat cu evaluările expirate
+    assert len(index._heap) <= RiskIndex.COMPACT_RATIO * max(len(index), 16) + 1
+    
+    print(f"✅ {len(index)} pacienți activi, top: {index.top(1)[0]['score']}")
+
+def test_alert_engine():
+    """Testează alertele la traversarea pragurilor (histerezis și debounce)"""
+    print("\n🧪 Testez AlertEngine (alerte la schimbarea nivelului)...")
+    
+    from risk_alerts import AlertEngine, alerts_from_changes
+    from ward_stream import WardRiskStream
+    
+    engine = AlertEngine(EnhancedIAAMPredictor.LEVEL_THRESHOLDS, EnhancedIAAMPredictor.LEVEL_NAMES,
+                         hysteresis=5, debounce_seconds=600)
+    
+    # prima evaluare peste SCĂZUT alertează
+    alert = engine.observe("P1", 85, 0)
+    assert alert.nivel == "ÎNALT" and alert.nivel_anterior == "SCĂZUT" and alert.escaladare
+    # oscilații în banda de histerezis sub pragul 80: fără alertă
+    assert engine.observe("P1", 77, 60) is None and engine.current_level("P1") == "ÎNALT"
+    assert engine.observe("P1", 81, 120) is None
+    # escaladarea nu este amânată de debounce
+    alert = engine.observe("P1", 145, 180)
+    assert alert.nivel == "CRITIC" and alert.escaladare
+    # de-escaladarea din fereastra de debounce se amână, apoi se emite
+    assert engine.observe("P1", 100, 300) is None
+    alert = engine.observe("P1", 100, 900)
+    assert alert.nivel == "ÎNALT" and alert.nivel_anterior == "CRITIC" and not alert.escaladare
+    assert engine.observe("P1", 40, 2000).nivel == "SCĂZUT"
+    
+    # scădere din CRITIC, apoi niciun eveniment: flush emite de-escaladarea la expirarea ferestrei
+    engine.observe("P3", 150, 0)
+    assert engine.observe("P3", 90, 100) is None and engine.due(500) == []
+    assert engine.observe("P3", 88, 200) is None  # același nivel amânat, termenul nu se mută
+    assert engine.due(600) == ["P3"]
+    (alert,) = engine.flush(700)
+    assert (alert.nivel, alert.nivel_anterior, alert.timestamp, alert.scor) == ("ÎNALT", "CRITIC", 600, 88)
+    assert engine.flush(5000) == [] and engine.observe("P3", 88, 5000) is None
+    # revenirea la nivelul alertat anulează de-escaladarea amânată
+    engine.observe("P4", 150, 0)
+    engine.observe("P4", 90, 100)
+    assert engine.observe("P4", 150, 200) is None and engine.flush(5000) == []
+    
+    # alertele pornind din fluxul de evenimente al secției
+    events = [
+        {"patient_id": "P2", "timestamp": 0, "values": {"ore_spitalizare": 60}},
+        {"patient_id": "P2", "timestamp": 3600, "values": {"procalcitonina": 12, "crp": 250, "cateter_central": True}},
+        {"patient_id": "P2", "timestamp": 7200, "values": {"cultura_pozitiva": True, "bacterie": "Acinetobacter baumannii",
+                                                           "rezistente": ["NDM", "XDR"]}},
+    ]
+    engine = AlertEngine(EnhancedIAAMPredictor.LEVEL_THRESHOLDS, EnhancedIAAMPredictor.LEVEL_NAMES)
+    alerts = list(alerts_from_changes(WardRiskStream().run(events), engine))
+    assert [alert.nivel for alert in alerts] == ["ÎNALT", "CRITIC"]
+    # după ultimul eveniment, de-escaladarea amânată se emite cu ceasul apelantului
+    changes = [{"patient_id": "P5", "timestamp": 0, "score": 150, "level": "CRITIC"},
+               {"patient_id": "P5", "timestamp": 60, "score": 60, "level": "MODERAT"}]
+    engine = AlertEngine(EnhancedIAAMPredictor.LEVEL_THRESHOLDS, EnhancedIAAMPredictor.LEVEL_NAMES)
+    assert [alert.nivel for alert in alerts_from_changes(changes, engine)] == ["CRITIC"]
+    engine = AlertEngine(EnhancedIAAMPredictor.LEVEL_THRESHOLDS, EnhancedIAAMPredictor.LEVEL_NAMES)
+    assert [alert.nivel for alert in alerts_from_changes(changes, engine, now=3600)] == ["CRITIC", "MODERAT"]
+    
+    print(f"✅ {len(alerts)} alerte din flux: {' → '.join(alert.nivel for alert in alerts)}")
+
+def test_recommendation_rules():
+    """Testează motorul compilat de recomandări (măști de condiții, grupuri, lot)"""
+    print("\n🧪 Testez RecommendationEngine (recomandări per mască)...")
+    
+    import numpy as np
+    from recommendation_rules import RecommendationEngine, RecommendationRule
+    from epimind_ai_final_professional import UltraAdvancedIAAMCalculator, PatientData as UltraPatientData
+    
+    engine = RecommendationEngine((
+        RecommendationRule(("baza",)),
+        RecommendationRule(("crp",), ((("crp", ">", 100), ("pct", ">", 2)),)),
+        RecommendationRule(("pseudomonas",), ((("bacterie", "contine", "Pseudomonas"),),), grup="germen"),
+        RecommendationRule(("germen",), ((("bacterie", "true", None),),), grup="germen"),
+        RecommendationRule(("critic",), ((("nivel_risc", "in", ("CRITIC",)),),)),
+    ))
+    patients = [
+        UltraPatientData(crp=150, bacterie="Pseudomonas aeruginosa"),
+        UltraPatientData(pct=5, bacterie="E. coli"),
+        UltraPatientData(),
+    ]
+    levels = ["CRITIC", "SCĂZUT", "SCĂZUT"]
+    expected = [["baza", "crp", "pseudomonas", "critic"], ["baza", "crp", "germen"], ["baza"]]
+    assert [engine.recommend(p, nivel_risc=l) for p, l in zip(patients, levels)] == expected
+    # aceeași mască -> același tuplu memorat
+    assert engine.texts(engine.mask(patients[2], nivel_risc="SCĂZUT")) is engine.texts(1)
+    
+    columns = {name: np.array([getattr(p, name) for p in patients], dtype=object) for name in engine.fields()}
+    columns["nivel_risc"] = np.array(levels, dtype=object)
+    assert [list(texts) for texts in engine.recommend_batch(columns, len(patients))] == expected
+    
+    # lotul calculatorului final coincide cu calculate_risk
+    calculator = UltraAdvancedIAAMCalculator()
+    rng = np.random.default_rng(15)
+    cohort = [UltraPatientData(ore_spitalizare=float(rng.integers(0, 400)), crp=float(rng.uniform(0, 300)),
+                               pct=float(rng.uniform(0, 10)), creatinina=float(rng.uniform(0.5, 4)),
+                               sofa_score=int(rng.integers(0, 15)), cateter_venos_central=bool(rng.integers(2)),
+                               ventilatie_mecanica=bool(rng.integers(2)),
+                               bacterie=str(rng.choice(["", "Pseudomonas aeruginosa", "Acinetobacter baumannii",
+                                                        "Staphylococcus aureus"])),
+                               rezistente=[[], ["MRSA"], ["Carbapenem"]][rng.integers(3)])
+              for _ in range(200)]
+    fields = {name: np.array([getattr(p, name) for p in cohort], dtype=object)
+              for name in calculator.recommendations.fields()}
+    risks = [calculator.calculate_risk(p) for p in cohort]
+    batch = calculator.recommend_batch(fields, np.array([risk["nivel_risc"] for risk in risks], dtype=object))
+    assert [list(texts) for texts in batch] == [risk["recomandari"] for risk in risks]
+
+    # măștile per pacient și cele din lot coincid pentru toate regulile calculatorului
+    masks = calculator.recommendations.masks(dict(fields, nivel_risc=[risk["nivel_risc"] for risk in risks]), len(cohort))
+    assert [calculator.recommendations.mask(p, nivel_risc=r["nivel_risc"]) for p, r in zip(cohort, risks)] == list(masks)
+
+    # măștile lotului sunt int64: cel mult 63 de reguli, iar ultimul bit rămâne pozitiv
+    rules = [RecommendationRule((f"r{i}",), ((("crp", ">", i),),)) for i in range(63)]
+    wide = RecommendationEngine(rules)
+    assert wide.mask(UltraPatientData(crp=100)) == (1 << 63) - 1
+    assert wide.masks({"crp": np.array([100.0, 62.5])}, 2).tolist() == [(1 << 63) - 1, (1 << 63) - 1]
+    for invalid in (rules + [RecommendationRule(("prea multe",))],
+                    [RecommendationRule(("x",), ((("crp", "~", 1),),))]):
+        try:
+            RecommendationEngine(invalid)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("regulile invalide trebuie respinse la construcție")
+
+    print(f"✅ {len(cohort)} pacienți, {len(set(map(id, batch)))} seturi distincte de recomandări")
+
+def test_scoring_kernel():
+    """Testează nucleul comun de scorare (toate profilurile într-o trecere) față de motoare"""
+    print("\n🧪 Testez ScoringKernel (profiluri declarative)...")
+    
+    import random
+    import numpy as np
+    from dataclasses import asdict, fields
+    from demo_data_generator import DemoDataGenerator
+    from scoring_kernel import (ENHANCED_PROFILE, FINAL_PROFILE, ORIGINAL_PROFILE, PROFESSIONAL_PROFILE,
+                                Bins, Microbiology, ScoringKernel)
+    from epimind_ai_original import IAMPredictor
+    from epimind_ai_professional import AdvancedIAAMCalculator, PatientData as ProfessionalPatientData
+    from epimind_ai_final_professional import UltraAdvancedIAAMCalculator, PatientData as UltraPatientData
+    
+    # profilurile folosesc tabelele motoarelor, nu copii ale lor
+    def terms(profile, kind):
+        return [term for group in profile.grupuri for term in group.termeni if isinstance(term, kind)]
+    def defaults(cls):
+        return {item.name: item.default for item in fields(cls) if isinstance(item.default, (int, float, str))}
+    for profile, engine in ((ORIGINAL_PROFILE, IAMPredictor()), (ENHANCED_PROFILE, EnhancedIAAMPredictor())):
+        devices = {term.camp[:-len("_days")]: term.points[0] for term in terms(profile, Bins) if term.conditii}
+        assert devices == engine.device_weights
+        assert terms(profile, Microbiology)[0].rezistente == engine.resistance_weights
+    enhanced = EnhancedIAAMPredictor()
+    assert terms(ENHANCED_PROFILE, Microbiology)[0].bacterii == enhanced.bacteria_risk
+    assert (ENHANCED_PROFILE.praguri, ENHANCED_PROFILE.niveluri) == (enhanced.LEVEL_THRESHOLDS, enhanced.LEVEL_NAMES)
+    assert terms(PROFESSIONAL_PROFILE, Microbiology)[0].bacterii == AdvancedIAAMCalculator.PATHOGEN_SCORES
+    assert terms(FINAL_PROFILE, Microbiology)[0].bacterii == UltraAdvancedIAAMCalculator.PATHOGEN_SCORES
+    assert {group.nume: group.pondere for group in FINAL_PROFILE.grupuri} == UltraAdvancedIAAMCalculator().risk_weights
+    assert (FINAL_PROFILE.praguri, FINAL_PROFILE.niveluri) == \
+        (UltraAdvancedIAAMCalculator.LEVEL_THRESHOLDS, UltraAdvancedIAAMCalculator.LEVEL_NAMES)
+    for profile, cls in ((ENHANCED_PROFILE, PatientData), (PROFESSIONAL_PROFILE, ProfessionalPatientData),
+                         (FINAL_PROFILE, UltraPatientData)):
+        assert defaults(cls).items() <= dict(profile.implicite).items()
+    
+    kernel = ScoringKernel()
+    random.seed(16)
+    generator = DemoDataGenerator()
+    patients = [generator.generate_low_risk_patient() for _ in range(10)] + \
+               [generator.generate_critical_risk_patient() for _ in range(10)] + [PatientData(ore_spitalizare=24)]
+    result = kernel.evaluate(patients)
+    
+    # profilurile original și enhanced coincid cu motoarele pe aceleași date
+    predictor = EnhancedIAAMPredictor()
+    enhanced = [predictor.predict_iaam_risk(patient, score_only=True) for patient in patients]
+    assert list(result["enhanced"][0]) == [risk["score"] for risk in enhanced]
+    assert list(result["enhanced"][1]) == [risk["level"] for risk in enhanced]
+    original = [IAMPredictor().predict_iaam_risk(asdict(patient)) for patient in patients]
+    assert list(result["original"][0]) == [risk["score"] for risk in original]
+    assert list(result["original"][1]) == [risk["level"] for risk in original]
+    
+    # profilurile professional și final, pe date în forma PatientData a acestora
+    rng = np.random.default_rng(16)
+    cohort = [dict(ore_spitalizare=float(rng.integers(0, 2000)), cateter_venos_central=bool(rng.integers(2)),
+                   zile_cateter_venos=int(rng.integers(0, 15)), ventilatie_mecanica=bool(rng.integers(2)),
+                   zile_ventilatie=int(rng.integers(0, 15)), cultura_pozitiva=bool(rng.integers(2)),
+                   bacterie=str(rng.choice(["", "Pseudomonas aeruginosa", "Candida auris", "Serratia"])),
+                   rezistente=[[], ["MRSA"], ["KPC", "XDR"]][rng.integers(3)], crp=float(rng.uniform(0, 300)),
+                   pct=float(rng.uniform(0, 15)), leucocite=int(rng.integers(0, 25000)),
+                   creatinina=float(rng.uniform(0.5, 3)), bacterii_urina=int(rng.integers(0, 30)),
+                   nitriti=bool(rng.integers(2)), leucocit_esteraza=str(rng.choice(["", "+"])),
+                   sofa_score=int(rng.integers(0, 12)))
+              for _ in range(50)]
+    result = kernel.evaluate(cohort)
+    professional = [AdvancedIAAMCalculator().calculate_risk(ProfessionalPatientData(**values)) for values in cohort]
+    assert list(result["professional"][0]) == [risk["scor_total"] for risk in professional]
+    assert list(result["professional"][1]) == [risk["nivel_risc"] for risk in professional]
+    calculator = UltraAdvancedIAAMCalculator()
+    final = [calculator.calculate_risk(UltraPatientData(**values), score_only=True) for values in cohort]
+    table = kernel.score_batch(cohort)
+    assert list(table["final_scor"]) == [risk["scor_total"] for risk in final]
+    assert list(table["final_nivel"]) == [risk["nivel_risc"] for risk in final]
+    
+    # un pacient: toate profilurile, cu alias-urile dintre formele PatientData
+    single = kernel.score({"ore_spitalizare": 100, "pct": 3})
+    assert single["enhanced"]["scor"] == 15 + 25 and single["professional"]["scor"] == 15 + 15
+    
+    scores = ", ".join(f"{name} {risk['scor']}" for name, risk in single.items())
+    print(f"✅ {len(kernel.profiles)} profiluri: {scores}")
+
+def test_benchmark_suite():
+    """Testează micro-benchmark-ul (măsurători și detectarea regresiilor)"""
+    print("\n🧪 Testez benchmark_scoring (ops/s, p50/p99, memorie per apel)...")
+    
+    from benchmark_scoring import find_regressions, generate_mix, measure, run_benchmarks
+    
+    # amestecurile sunt reproductibile
+    first, second = generate_mix("high_risk", 5, seed=3), generate_mix("high_risk", 5, seed=3)
+    assert [vars(p)["crp"] for p in first] == [vars(p)["crp"] for p in second]
+    
+    stats = measure(EnhancedIAAMPredictor().calculate_sofa, first, min_time=0.0, min_calls=20, warmup=2)
+    assert stats["apeluri"] >= 20 and stats["ops_per_sec"] > 0 and stats["p99_us"] >= stats["p50_us"] > 0
+    
+    results = run_benchmarks(mixes=("low_risk",), patients=5, min_time=0.0,
+                             case_names=("enhanced.evaluate_lab_markers",))
+    assert list(results) == ["enhanced.evaluate_lab_markers/low_risk"]
+    
+    current = {"f/low_risk": {"p50_us": 30.0, "bytes_per_apel": 1000}}
+    faster = {"rezultate": {"f/low_risk": {"p50_us": 10.0, "bytes_per_apel": 1000}}}
+    same = {"rezultate": {"f/low_risk": {"p50_us": 28.0, "bytes_per_apel": 1000}}}
+    assert len(find_regressions(current, faster)) == 1 and not find_regressions(current, same)
+    assert len(find_regressions({"f/low_risk": {"p50_us": 28.0, "bytes_per_apel": 4000}}, same)) == 1
+    
+    print(f"✅ calculate_sofa: {stats['ops_per_sec']:.0f} ops/s, p50 {stats['p50_us']:.1f}µs, "
+          f"{stats['bytes_per_apel']} B/apel")
+
+def test_pattern_registry():
+    """Testează registrul de pattern-uri compilate partajat de extractoare"""
+    print("\n🧪 Testez medical_patterns (pattern-uri compilate o singură dată)...")
+    
+    import re
+    from medical_patterns import PatternRegistry
+    from epimind_ai_final_professional import UltraAdvancedNLP
+    from epimind_ai_professional import ProfessionalAI
+    
+    # același text și aceleași flags → același obiect compilat
+    size = PatternRegistry.size()
+    assert PatternRegistry.compile(r"crp[\s:]*(\d+)") is PatternRegistry.compile(r"crp[\s:]*(\d+)")
+    assert PatternRegistry.compile(r"crp[\s:]*(\d+)", re.IGNORECASE) is not PatternRegistry.compile(r"crp[\s:]*(\d+)")
+    durations = PatternRegistry.keyword_patterns((r"{keyword}.*?(\d+)\s*zile",), ["cateter central", "c.v.c"])
+    assert durations["c.v.c"][0].search("c.v.c de 4 zile").group(1) == "4"
+    assert not durations["c.v.c"][0].search("cxvxc de 4 zile")
+    
+    # tabelele sunt ale clasei, deci extracția nu mai compilează nimic
+    from epimind_ai_ultra_enhanced import UltraEnhancedMedicalDataExtractor
+    extractor = UltraEnhancedMedicalDataExtractor()
+    assert extractor.patterns is UltraEnhancedMedicalDataExtractor().patterns
+    before = PatternRegistry.size()
+    extracted = extractor.extract_from_text("CVC de 6 zile, CRP 120, E. coli ESBL, internare de 5 zile")
+    assert PatternRegistry.size() == before and before >= size
+    assert extracted["cateter_central_days"] == 6 and extracted["crp"] == 120 and extracted["rezistente"] == ["ESBL"]
+    
+    vitals = ProfessionalAI().extract_medical_data("TA 85/50, puls 120, internat de 30 ore")
+    assert vitals["tensiune_sistolica"] == 85 and vitals["frecventa_cardiaca"] == 120
+    assert vitals["ore_spitalizare"] == 30.0
+    
+    # câmpurile UltraAdvancedNLP sunt explicite (PTT nu mai suprascrie AST, "48 ore" rămân ore);
+    # extracția nu depinde de vectorizatorul TF-IDF, deci nu e nevoie de sklearn aici
+    nlp = object.__new__(UltraAdvancedNLP)
+    data = nlp.extract_comprehensive_data("ventilatie 48 ore. AST 80, PTT 45, bilirubina totala 2.5, sofa score 7")
+    assert data["ast"] == 80.0 and data["ptt"] == 45.0 and data["bilirubina_totala"] == 2.5
+    assert data["sofa_score"] == 7 and data["ore_spitalizare"] == 48
+    assert nlp.extract_comprehensive_data("ziua 6 de internare")["ore_spitalizare"] == 144
+    
+    print(f"✅ {PatternRegistry.size()} pattern-uri compilate, extracție fără recompilare")
+
+def test_clinical_scanner():
+    """Testează scannerul clinic într-o singură trecere și rezolvarea candidaților"""
+    print("\n🧪 Testez clinical_scanner (tokenizare unică, candidați cu poziții)...")
+    
+    from clinical_scanner import ClinicalScanner, ScanRule, tokenize
+    
+    assert tokenize("TA 85/50 mmHg, c-reactive 12,5".lower()) == ["ta", "85", "/", "50", "mmhg", ",", "c", "reactive", "12,5"]
+    
+    scanner = ClinicalScanner([
+        ScanRule("crp", 0, etichete=("crp", "proteina c reactiva")),
+        ScanRule("tas", 0, sufixe=("mmhg",), forma="sistolica"),
+        ScanRule("tad", 0, sufixe=("mmhg",), forma="diastolica"),
+        ScanRule("ore", 0, etichete=("internat de",), forma="durata"),
+        ScanRule("ore", 1, context=("internare",), forma="zile"),
+    ])
+    text = "internat de 36 ore. proteina c reactiva: 150, ta 85/50 mmhg, e.coli esbl+, 3 zile de internare"
+    fields = scanner.scan(text).by_field()
+    crp = fields["crp"][0]
+    assert crp.valoare == 150 and text[crp.start:crp.end] == "proteina c reactiva: 150"
+    assert fields["tas"][0].valoare == 85 and fields["tad"][0].valoare == 50
+    assert [c.valoare for c in fields["ore"]] == [36, 72]  # prioritatea regulii, apoi poziția
+    
+    # cuvinte întregi: "pct 2.5" nu mai este temperatură, "creatinina" nu mai este CRE
+    extractor = EnhancedMedicalDataExtractor()
+    extracted = extractor.extract_from_text("PCT 2.5, creatinina 1.8, leucocite 12,5, internare 30 ore, "
+                                            "sonda urinara de 2 zile, temperatura 38.2")
+    assert extracted["procalcitonina"] == 2.5 and extracted["temperatura"] == 38.2
+    assert extracted["leucocite"] == 12.5 and "rezistente" not in extracted
+    assert extracted["ore_spitalizare"] == 30 and extracted["sonda_urinara_days"] == 2
+    
+    # timpul crește liniar cu textul (fără căutări .* repetate pe tot textul)
+    import time
+    page = "Hemoleucograma 12 h: hematii 4.5, hemoglobina 12.1, hematocrit 38 d. " * 200
+    start = time.perf_counter()
+    extractor.extract_from_text(page)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0
+    
+    print(f"✅ {len(fields)} câmpuri candidate; pagină de {len(page)} caractere în {elapsed * 1000:.1f} ms")
+
+def test_keyword_automaton():
+    """Testează automatul Aho-Corasick al cuvintelor-cheie (limite de cuvânt, poziții, înlocuiri)"""
+    print("\n🧪 Testez keyword_automaton (o singură trecere pentru toate vocabularele)...")
+    
+    from epimind_ai_final_professional import AdvancedMedicalOCR
+    from keyword_automaton import KeywordAutomaton
+    
+    automaton = KeywordAutomaton({
+        "dispozitiv": {"port": "port", "dren": "dren", "cateter venos central": "cvc"},
+        "bacterie": {"e. coli": "Escherichia coli", "e.coli": "Escherichia coli", "e coli": "Escherichia coli"},
+        "rezistenta": {"esbl": "ESBL", "mrsa": "MRSA"}
+    })
+    assert len(automaton) == 8 and automaton.categorii == ("dispozitiv", "bacterie", "rezistenta")
+    
+    # limite de cuvânt: "important" nu conține "port", "noradrenalina" nu conține "dren"
+    assert automaton.find("important: noradrenalina") == []
+    
+    # pozițiile sunt în textul original, chiar cu spații multiple și majuscule
+    text = "Cateter  venos   central, E.  Coli ESBL+"
+    hits = automaton.find(text)
+    assert [(h.categorie, h.valoare) for h in hits] == [("dispozitiv", "cvc"), ("bacterie", "Escherichia coli"),
+                                                       ("rezistenta", "ESBL")]
+    assert [text[h.start:h.end] for h in hits] == ["Cateter  venos   central", "E.  Coli", "ESBL"]
+    assert [h.valoare for h in automaton.find(text, ["rezistenta"])] == ["ESBL"]
+    
+    # înlocuire: cea mai lungă potrivire, fără dubluri ("pseudomonas aeruginosa aeruginosa")
+    ocr = AdvancedMedicalOCR.CORRECTIONS
+    assert ocr.replace("Pseudomonas aeruginosa si pseudomonas, e.coli", "corectie") == \
+        "Pseudomonas aeruginosa si Pseudomonas aeruginosa, Escherichia coli"
+    assert ocr.replace("vremea e buna", "corectie") == "vremea e buna"
+    
+    # extractorul Enhanced: dispozitive, bacterii și rezistențe din același automat
+    extracted = EnhancedMedicalDataExtractor().extract_from_text(
+        "Pacient cu CVC de 3 zile, cultura: Klebsiella pneumoniae KPC si ESBL; important: noradrenalina")
+    assert extracted["cateter_central"] and extracted["cateter_central_days"] == 3 and "drenaj" not in extracted
+    assert extracted["bacterie"] == "Klebsiella pneumoniae" and extracted["rezistente"] == ["ESBL", "KPC"]
+    
+    print(f"✅ {len(EnhancedMedicalDataExtractor.KEYWORDS)} cuvinte-cheie într-un singur automat")
+
+def test_device_duration():
+    """Testează atribuirea duratelor dispozitivelor după proximitate (aceeași propoziție, vecini direcți)"""
+    print("\n🧪 Testez device_duration (perechi mențiune-durată, timp liniar)...")
+    
+    from device_duration import ANCHOR_KEY, DurationResolver, Mention
+    
+    def mentions(text, *keys):
+        return [Mention(key, text.index(word), text.index(word) + len(word)) for key, word in keys]
+    
+    resolver = DurationResolver(fereastra=4)
+    text = "internat de 5 zile, cvc de 3 zile. foley. control in 2 zile"
+    assert resolver.resolve(text, mentions(text, (ANCHOR_KEY, "internat"), ("cvc", "cvc"), ("foley", "foley"))) == \
+        {ANCHOR_KEY: 5, "cvc": 3}  # foley: durata e în altă propoziție
+    text = "48 ore de ventilatie, dren cu secretii purulente abundente observate zilnic 9 zile"
+    assert resolver.resolve(text, mentions(text, ("ventilatie", "ventilatie"), ("dren", "dren"))) == {"ventilatie": 2}
+    assert [d.camp for d in resolver.durations("1.5 zile, 36h, 2 d")] == ["ore", "zile"]
+    
+    # extractoarele: durata nu se mai ia din propoziții fără legătură sau de la internare
+    from epimind_ai_ultra_enhanced import UltraEnhancedMedicalDataExtractor
+    text = "CVC si peg, dren toracic, spitalizat de 12 zile. Foley. Control peste 7 zile."
+    for extractor in (EnhancedMedicalDataExtractor(), UltraEnhancedMedicalDataExtractor()):
+        extracted = extractor.extract_from_text(text)
+        assert extracted["peg"] and extracted["sonda_urinara"] and extracted["drenaj"]
+        assert not any(key.endswith("_days") for key in extracted)
+    
+    # scrisoare de externare lungă: fără backtracking, durata corectă la final
+    import time
+    letter = "Pacient internat de 5 zile pentru pneumonie. Evolutie favorabila, control in 2 zile. " * 1000
+    letter += "Sonda urinara foley de 3 zile."
+    start = time.perf_counter()
+    extracted = EnhancedMedicalDataExtractor().extract_from_text(letter)
+    elapsed = time.perf_counter() - start
+    assert extracted["sonda_urinara_days"] == 3 and elapsed < 2.0
+    
+    print(f"✅ Durate atribuite; scrisoare de {len(letter)} caractere în {elapsed * 1000:.1f} ms")
+
+def test_streaming_extraction():
+    """Testează extracția în flux (bucăți de text, context peste granițe, politici de combinare)"""
+    print("\n🧪 Testez streaming_extraction (memorie constantă, candidați cu poziții și date)...")
+    
+    from streaming_extraction import StreamingExtractor, merge, select
+    from epimind_ai_final_professional import UltraAdvancedNLP
+    
+    extractor = EnhancedMedicalDataExtractor()
+    nlp = object.__new__(UltraAdvancedNLP)
+    
+    # un singur bloc cu politica "specific" = extracția clasică
+    for text in ("Internat de 5 zile, CVC de 3 zile, CRP 150, E. coli ESBL+, MRSA",
+                 "ziua 6 de internare. PTT 45, AST 80, sofa score 7, nitriti pozitiv, klebsiella"):
+        assert extractor.extract_stream([text]) == extractor.extract_from_text(text)
+        assert merge(nlp._candidates(text.lower())) == nlp.extract_comprehensive_data(text)
+    
+    # propoziția tăiată între bucăți își păstrează contextul ("38." + "5" nu devine 38)
+    chunks = ["Pacient cu CR", "P 150 si temperatura 38.", "5 grade. Sonda urinara", " de 4 zile.\n"]
+    extracted = extractor.extract_stream(chunks)
+    assert extracted["crp"] == 150 and extracted["temperatura"] == 38.5 and extracted["sonda_urinara_days"] == 4
+    
+    # pozițiile sunt în documentul întreg
+    document = "".join(chunks).lower()
+    spans = {c.camp: document[c.start:c.end] for c in StreamingExtractor(extractor._candidates).stream(chunks)}
+    assert spans["crp"] == "crp 150" and spans["sonda_urinara_days"] == "sonda urinara de 4 zile"
+    
+    # politicile: cea mai recentă dată, cea mai specifică regulă, cea mai susținută valoare
+    chart = ["12.03.2024: CRP 80 mg/l.\n", "15.03.2024: CRP 150 mg/l.\n", "10.03.2024: CRP 40, reluat CRP 80.\n"]
+    candidates = StreamingExtractor(extractor._candidates).collect(chart)["crp"]
+    assert [c.data.day for c in candidates] == [12, 15, 10, 10]
+    assert select(candidates, "recent").valoare == 150
+    assert select(candidates, "specific").valoare == 80 and select(candidates, "incredere").valoare == 80
+    assert nlp.extract_stream(chart)["crp"] == 150
+    
+    # flux lung fără punctuație: restul reținut rămâne mărginit, valorile de la final se găsesc
+    lines = ("evolutie stationara fara modificari " for _ in range(20000))
+    streamer = StreamingExtractor(extractor._candidates, max_carry=1024)
+    found = merge(streamer.stream(itertools.chain(lines, ["crp 42"])))
+    assert found == {"crp": 42.0}
+    
+    print(f"✅ {len(candidates)} candidați CRP datați; politicile dau 150 / 80 / 80")
+
+def test_incremental_extraction():
+    """Testează re-extracția incrementală (doar regiunea editată, aceleași valori ca extracția completă)"""
+    print("\n🧪 Testez incremental_extraction (rescanare doar în jurul editării)...")
+    
+    from incremental_extraction import IncrementalExtractor, common_prefix, common_suffix
+    from epimind_ai_final_professional import UltraAdvancedNLP
+    
+    assert common_prefix("crp 120 mg", "crp 150 mg") == 5 and common_suffix("crp 120 mg", "crp 150 mg", 5) == 4
+    
+    nlp = object.__new__(UltraAdvancedNLP)
+    incremental = nlp.incremental()
+    
+    # versiuni succesive ale aceleiași note: după fiecare editare, aceleași valori ca extracția completă
+    note = "Pacient internat de 5 zile, CRP 120 mg/l, leucocite 14000, temperatura 38.2. " \
+           "CVC de 3 zile, cultura pozitiva klebsiella ESBL+. "
+    versions = [note,
+                note.replace("CRP 120", "CRP 150"),
+                note.replace("CRP 120", "CRP 150").replace("38.2", "39.1"),
+                note.replace("CRP 120", "CRP 150") + "Glasgow 11, sofa score 9. ",
+                note.replace("CRP 120", "CRP 150").replace("CRP", "PCR"),
+                "", "Leucocite 9000. " + note]
+    for text in versions:
+        assert incremental.update(text) == nlp.extract_comprehensive_data(text), text
+    
+    # editări aleatoare (inserări, ștergeri, înlocuiri) într-un document lung
+    random.seed(7)
+    words = ["crp", "120", "leucocite", "14000", "temperatura", "38.5", "glasgow", "11", "zile", "cvc", "de",
+             "3", "ESBL+", "pacient", "evolutie", "favorabila", ",", "."]
+    text = " ".join(random.choice(words) for _ in range(3000))
+    incremental.update(text)
+    for _ in range(50):
+        start = random.randrange(len(text))
+        end = min(len(text), start + random.randrange(20))
+        text = text[:start] + " ".join(random.choice(words) for _ in range(random.randrange(4))) + text[end:]
+        assert incremental.update(text) == nlp.extract_comprehensive_data(text)
+        window_start, window_end = incremental.rescanat
+        assert window_end - window_start < len(text) // 10
+    document_length = len(text)
+    
+    # candidați suprapuși la marginea ferestrei ("crp 7" și "7 zile"): extinderea pentru unul nu
+    # lasă pe celălalt tăiat, indiferent de poziția editării față de ei
+    for pad in range(120):
+        before = "Pacient cu E. coli ESBL, evolutie " + "lenta " * (pad // 6) + "x" * (pad % 6) + " CRP 7 zile de la internare."
+        after = before.replace("E. coli", "EE. coli coli")
+        incremental.reset()
+        incremental.update(before)
+        assert incremental.update(after) == nlp.extract_comprehensive_data(after)
+        assert incremental.values()["ore_spitalizare"] == 168
+    
+    # sursa fiecărei valori (poziții în textul curent) și resetarea
+    incremental.reset()
+    text = "Leucocite 14000, CRP 140, PCT 3.2, internat de 5 zile"
+    incremental.update(text)
+    sources = {camp: text[start:end] for camp, (start, end) in incremental.sources().items()}
+    assert sources == {"leucocite": "Leucocite 14000", "crp": "CRP 140", "pct": "PCT 3.2",
+                       "ore_spitalizare": "internat de 5 zile"}
+    
+    print(f"✅ {len(versions)} versiuni și 50 de editări aleatoare identice cu extracția completă; "
+          f"ultima fereastră {window_end - window_start} din {document_length} caractere")
+
 def test_ai_fallback():
     """Testează funcționalitatea AI cu fallback"""
     print("\n🧪 Testez EnhancedOllamaAI...")
@@ -189,6 +1240,31 @@ def main():
         test_patient_data()
         test_data_extractor()
         test_iaam_predictor()
+        test_iaam_predictor_batch()
+        test_score_only()
+        test_risk_cache()
+        test_severity_table()
+        test_ultra_risk_components()
+        test_risk_trajectory()
+        test_sensitivity()
+        test_uncertainty_intervals()
+        test_probability_calibration()
+        test_ward_stream()
+        test_cohort_score()
+        test_note_extraction()
+        test_risk_index()
+        test_alert_engine()
+        test_recommendation_rules()
+        test_scoring_kernel()
+        test_benchmark_suite()
+        test_pattern_registry()
+        test_clinical_scanner()
+        test_keyword_automaton()
+        test_device_duration()
+        test_streaming_extraction()
+        test_incremental_extraction()
+        test_incremental_rescore()
+        test_patient_patch()
         test_ai_fallback()
         test_complete_workflow()
         generate_test_report()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Scorare IAAM în flux pentru o secție întreagă
+Consumă un flux JSONL de observații cu marcaj temporal (analize, semne
+vitale, inserții/scoateri de dispozitive, culturi), păstrează o stare
+compactă per pacient și emite un eveniment doar când scorul sau nivelul
+de risc se schimbă
+
+Format eveniment (o linie JSON):
+    {"patient_id": "P1", "timestamp": "2024-05-01T08:00:00", "field": "crp", "value": 120}
+    {"patient_id": "P1", "timestamp": 1714550400, "values": {"cateter_central": true, "leucocite": 14.2}}
+    {"patient_id": "P1", "timestamp": "...", "type": "discharge"}
+"""
+
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+
+from epimind_ai_enhanced import EnhancedIAAMPredictor, PatientData
+from patient_patch import PROTECTED_FIELDS, coerce, field_types
+
+SECONDS_PER_HOUR = 3600.0
+SECONDS_PER_DAY = 86400.0
+
+def parse_timestamp(value: Any) -> float:
+    """Convertește marcajul temporal (epoch sau ISO 8601) în secunde"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+class PatientState:
+    """Starea compactă a unui pacient din flux"""
+    __slots__ = ("data", "components", "admission", "device_start", "score", "level")
+
+    def __init__(self, data: PatientData, admission: float):
+        self.data = data
+        self.components: Dict[str, Any] = {}
+        self.admission = admission
+        self.device_start: Dict[str, float] = {}
+        self.score: Optional[int] = None
+        self.level: Optional[str] = None
+
+class WardRiskStream:
+    """Scorare incrementală a evenimentelor de secție cu EnhancedIAAMPredictor"""
+
+    def __init__(self, predictor: Optional[EnhancedIAAMPredictor] = None, max_patients: int = 10000):
+        self.predictor = predictor or EnhancedIAAMPredictor()
+        self.max_patients = max_patients
+        self.devices = tuple(self.predictor.device_weights)
+        self.device_days = {f"{device}_days": device for device in self.devices}
+        self.types = field_types(PatientData)
+        self.patients: "OrderedDict[str, PatientState]" = OrderedDict()
+        self.events_processed = 0
+        self.ignored_fields = 0
+
+    def _new_state(self, patient_id: str, timestamp: float) -> PatientState:
+        """Creează starea unui pacient nou (internarea = primul eveniment, dacă nu se dau orele)"""
+        state = PatientState(PatientData(patient_id=patient_id, timestamp=datetime.fromtimestamp(timestamp)), timestamp)
+        self.patients[patient_id] = state
+        while len(self.patients) > self.max_patients:
+            self.patients.popitem(last=False)
+        return state
+
+    def _apply(self, state: PatientState, timestamp: float, updates: Mapping[str, Any], changed: set):
+        """Aplică valorile unui eveniment pe starea pacientului (validate după tipul câmpului)"""
+        data = state.data
+        for name, value in updates.items():
+            tip = self.types.get(name) if name not in PROTECTED_FIELDS else None
+            if name == "ore_spitalizare" or name in self.device_days:
+                tip = float  # orele și zilele sunt relative la momentul evenimentului
+            if tip is None:
+                self.ignored_fields += 1
+                continue
+            try:
+                value = coerce(tip, value)
+            except (TypeError, ValueError):
+                self.ignored_fields += 1
+                continue
+            if name == "ore_spitalizare":
+                state.admission = timestamp - value * SECONDS_PER_HOUR
+                continue
+            if name in self.device_days:
+                state.device_start[self.device_days[name]] = timestamp - value * SECONDS_PER_DAY
+                continue
+            if name in self.devices:
+                if value and not getattr(data, name):
+                    state.device_start.setdefault(name, timestamp)
+                elif not value:
+                    state.device_start.pop(name, None)
+                    if getattr(data, f"{name}_days"):
+                        setattr(data, f"{name}_days", 0)
+                        changed.add(f"{name}_days")
+            if getattr(data, name) != value:
+                setattr(data, name, value)
+                changed.add(name)
+
+    def _advance_time(self, state: PatientState, timestamp: float, changed: set):
+        """Actualizează orele de spitalizare și zilele dispozitivelor active"""
+        data = state.data
+        hours = (timestamp - state.admission) / SECONDS_PER_HOUR
+        if hours != data.ore_spitalizare:
+            data.ore_spitalizare = hours
+            changed.add("ore_spitalizare")
+        for device, start in state.device_start.items():
+            if not getattr(data, device):
+                continue
+            days = int((timestamp - start) // SECONDS_PER_DAY)
+            if days != getattr(data, f"{device}_days"):
+                setattr(data, f"{device}_days", days)
+                changed.add(f"{device}_days")
+
+    def process(self, event: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Aplică un eveniment; returnează evenimentul de schimbare a riscului sau None"""
+        self.events_processed += 1
+        patient_id = str(event["patient_id"])
+        timestamp = parse_timestamp(event["timestamp"])
+
+        if event.get("type") == "discharge":
+            self.patients.pop(patient_id, None)
+            return None
+
+        state = self.patients.get(patient_id)
+        if state is None:
+            state = self._new_state(patient_id, timestamp)
+        else:
+            self.patients.move_to_end(patient_id)
+
+        updates = event.get("values")
+        if updates is None:
+            updates = {event["field"]: event["value"]} if "field" in event else {}
+
+        changed: set = set()
+        self._apply(state, timestamp, updates, changed)
+        self._advance_time(state, timestamp, changed)
+
+        result = self.predictor.rescore_components(state.data, state.components, changed, score_only=True)
+        if result["score"] == state.score and result["level"] == state.level:
+            return None
+
+        change = {
+            "patient_id": patient_id,
+            "timestamp": event["timestamp"],
+            "score": result["score"],
+            "level": result["level"],
+            "previous_score": state.score,
+            "previous_level": state.level
+        }
+        state.score, state.level = result["score"], result["level"]
+        return change
+
+    def run(self, events: Iterable[Mapping[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Generator: consumă evenimentele și produce doar schimbările de risc"""
+        process = self.process
+        for event in events:
+            change = process(event)
+            if change is not None:
+                yield change
+
+def read_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Generator: decodează liniile JSONL (liniile goale sunt ignorate)"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def stream_ward(lines: Iterable[str], predictor: Optional[EnhancedIAAMPredictor] = None,
+                max_patients: int = 10000) -> Iterator[Dict[str, Any]]:
+    """Pipeline complet: linii JSONL -> evenimente de schimbare a riscului"""
+    return WardRiskStream(predictor, max_patients).run(read_events(lines))
+
+def main():
+    """Citește observații JSONL (fișier sau stdin) și scrie schimbările de risc ca JSONL"""
+    source = open(sys.argv[1], "r", encoding="utf-8") if len(sys.argv) > 1 else sys.stdin
+    with source:
+        for change in stream_ward(source):
+            sys.stdout.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()